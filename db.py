@@ -1,228 +1,475 @@
-# db.py
-# MySQL + bcrypt password management
-# Auto-creates and synchronizes `clinic_management` database schema
-
-import mysql.connector
-from mysql.connector import errorcode
-import bcrypt
-import sys
-import traceback
-from datetime import datetime
-
-# === Configure your MySQL connection ===
-DB_HOST = "localhost"
-DB_USER = "root"
-DB_PASSWORD = ""   # change if you set a MySQL password
-DB_NAME = "clinic_management"
-
-
-# ---------------- Database Connection ----------------
-def get_conn(database=None):
-    """Return a live MySQL connection."""
-    args = dict(host=DB_HOST, user=DB_USER, password=DB_PASSWORD)
-    if database:
-        args["database"] = database
-    return mysql.connector.connect(**args)
-
-
-# ---------------- Password Hashing Helpers ----------------
-def hash_password(plain: str) -> str:
-    """Hash a plaintext password with bcrypt."""
-    return bcrypt.hashpw(plain.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
-
-
-def check_password(plain: str, hashed: str) -> bool:
-    """Verify a bcrypt-hashed password."""
-    try:
-        return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
-    except Exception:
-        return False
-
-
-# ---------------- Simple DB Wrapper ----------------
-class DB:
-    """Simple MySQL wrapper with automatic reconnect and query helpers."""
-    def __init__(self, use_db=True):
-        try:
-            if use_db:
-                self.conn = get_conn(DB_NAME)
-            else:
-                self.conn = get_conn()
-            self.cur = self.conn.cursor(dictionary=True)
-        except mysql.connector.Error as err:
-            if err.errno == errorcode.ER_BAD_DB_ERROR:
-                self._create_db()
-                self.conn = get_conn(DB_NAME)
-                self.cur = self.conn.cursor(dictionary=True)
-            else:
-                raise
-
-    def _create_db(self):
-        tmp = get_conn()
-        c = tmp.cursor()
-        c.execute(f"CREATE DATABASE IF NOT EXISTS {DB_NAME} DEFAULT CHARACTER SET 'utf8mb4'")
-        tmp.commit()
-        c.close()
-        tmp.close()
-
-    def query(self, sql, params=None, commit=False):
-        """Execute SQL query and optionally commit changes."""
-        self.cur.execute(sql, params or ())
-        if sql.strip().lower().startswith("select"):
-            return self.cur.fetchall()
-        if commit:
-            self.conn.commit()
-        return True
-
-    def close(self):
-        """Safely close connection and cursor."""
-        try:
-            self.cur.close()
-            self.conn.close()
-        except Exception:
-            pass
-
-
-# ---------------- Schema Creation ----------------
-def create_tables():
-    """Create or sync all tables used by the clinic system."""
-    db = DB(use_db=False)
-    db._create_db()
-    db.close()
-
-    db = DB()
-
-    # --- Staff ---
-    db.query("""
-        CREATE TABLE IF NOT EXISTS staff (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            name VARCHAR(150),
-            email VARCHAR(200) UNIQUE,
-            password VARCHAR(255),
-            role VARCHAR(50),
-            phone VARCHAR(30),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """, commit=True)
-
-    # --- Patients ---
-    db.query("""
-        CREATE TABLE IF NOT EXISTS patients (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            name VARCHAR(150),
-            age INT,
-            sex ENUM('Male','Female','Other'),
-            email VARCHAR(200) UNIQUE,
-            password VARCHAR(255),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """, commit=True)
-
-    # --- Services ---
-    db.query("""
-        CREATE TABLE IF NOT EXISTS services (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            code VARCHAR(64) UNIQUE,
-            name VARCHAR(150),
-            description TEXT,
-            price DECIMAL(10,2),
-            active TINYINT(1) DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """, commit=True)
-
-    # --- Appointments ---
-    db.query("""
-        CREATE TABLE IF NOT EXISTS appointments (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            patient_id INT,
-            service_id INT,
-            date DATE,
-            time TIME,
-            notes TEXT,
-            status ENUM('Pending','Confirmed','Completed','Cancelled') DEFAULT 'Pending',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (patient_id) REFERENCES patients(id),
-            FOREIGN KEY (service_id) REFERENCES services(id)
-        )
-    """, commit=True)
-
-    # --- Transactions ---
-    db.query("""
-        CREATE TABLE IF NOT EXISTS transactions (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            patient_id INT,
-            service_id INT,
-            amount DECIMAL(10,2),
-            paid_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (patient_id) REFERENCES patients(id),
-            FOREIGN KEY (service_id) REFERENCES services(id)
-        )
-    """, commit=True)
-
-    db.close()
-
-
-# ---------------- Seeder ----------------
-def seed_defaults():
-    """Insert default data: staff, patient, and 15 dental services."""
-    create_tables()
-    db = DB()
-
-    # ✅ Seed Staff
-    if not db.query("SELECT id FROM staff"):
-        staff_members = [
-            ("Dr. Maria Santos", "Dentist", "maria.santos@clinic.local", hash_password("staff123"), "09171234567"),
-            ("Dr. John Reyes", "Dentist", "john.reyes@clinic.local", hash_password("staff123"), "09181234567"),
-            ("Ana Cruz", "Assistant", "ana.cruz@clinic.local", hash_password("staff123"), "09281234567"),
-            ("Carla Dizon", "Receptionist", "carla.dizon@clinic.local", hash_password("staff123"), "09391234567"),
-        ]
-        for s in staff_members:
-            db.query(
-                "INSERT INTO staff (name, role, email, password, phone) VALUES (%s,%s,%s,%s,%s)",
-                s,
-                commit=True,
-            )
-
-    # ✅ Seed Sample Patient
-    if not db.query("SELECT id FROM patients"):
-        db.query(
-            "INSERT INTO patients (name, age, sex, email, password) VALUES (%s,%s,%s,%s,%s)",
-            ("Juan Dela Cruz", 35, "Male", "patient1@clinic.local", hash_password("patient123")),
-            commit=True,
-        )
-
-    # ✅ Seed 15 Services
-    if not db.query("SELECT id FROM services"):
-        services = [
-            ("CM-OPH", "Oral Prophylaxis", "Cleaning & polishing", 1200.00),
-            ("CM-FILL", "Dental Filling", "Composite filling for cavities", 2500.00),
-            ("CM-EXT", "Tooth Extraction", "Simple extraction", 1800.00),
-            ("CM-RCT", "Root Canal", "Therapy for infected tooth", 4500.00),
-            ("CM-WHT", "Teeth Whitening", "In-office bleaching", 3500.00),
-            ("CM-IMP", "Dental Implant", "Implant placement", 20000.00),
-            ("CM-BRAC", "Orthodontic Braces", "Braces installation", 25000.00),
-            ("CM-RTN", "Retainer Adjustment", "Adjustment or fitting", 2000.00),
-            ("CM-WIS", "Wisdom Tooth Removal", "Surgical extraction", 6500.00),
-            ("CM-GUM", "Gum Treatment", "Scaling & root planing", 3200.00),
-            ("CM-XRAY", "Dental X-Ray", "Panoramic imaging", 800.00),
-            ("CM-PED", "Pediatric Check-Up", "Child dental exam", 1000.00),
-            ("CM-DEN", "Dentures Fitting", "Removable dentures", 12000.00),
-            ("CM-EMR", "Emergency Visit", "Urgent dental care", 900.00),
-            ("CM-VEN", "Veneers", "Porcelain veneer restoration", 8000.00)
-        ]
-        for s in services:
-            db.query("INSERT INTO services (code, name, description, price) VALUES (%s,%s,%s,%s)", s, commit=True)
-
-    db.close()
-
-
-# ---------------- Run Directly ----------------
-if __name__ == "__main__":
-    try:
-        seed_defaults()
-        print("✅ Database initialized and synced successfully.")
-    except Exception as e:
-        print("❌ Database initialization error:", e)
-        traceback.print_exc()
-        sys.exit(1)
+# db.py
+# MySQL + Argon2id (libsodium) password management
+# Auto-creates and synchronizes `clinic_management` database schema
+
+import mysql.connector
+import mysql.connector.pooling
+from mysql.connector import errorcode
+import bcrypt
+from nacl import pwhash
+from nacl.exceptions import InvalidkeyError
+import os
+import re
+import sys
+import traceback
+from datetime import datetime
+
+# === Configure your MySQL connection ===
+DB_HOST = "localhost"
+DB_USER = "root"
+DB_PASSWORD = ""   # change if you set a MySQL password
+DB_NAME = "clinic_management"
+DB_POOL_SIZE = min(32, (os.cpu_count() or 4) * 2 + 1)   # mysql-connector caps pools at 32
+
+_POOL = None
+
+# Errors meaning the server side of a long-held connection is gone (timeout, restart); callers
+# holding a DB for a long time catch these, open a fresh DB() and retry once.
+ConnectionLost = (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError)
+
+def is_duplicate_key(err):
+    """True when a UNIQUE index rejected the write, so callers can insert first instead of checking."""
+    return isinstance(err, mysql.connector.errors.IntegrityError) and err.errno == errorcode.ER_DUP_ENTRY
+
+
+# ---------------- Database Connection ----------------
+def _conn_args(database=None):
+    # use_pure=False selects the C extension (libmysqlclient) so rows are decoded in C
+    # autocommit keeps a pooled connection from carrying a stale read snapshot into its next use
+    args = dict(host=DB_HOST, user=DB_USER, password=DB_PASSWORD, allow_local_infile=False,
+                use_pure=False, autocommit=True, connection_timeout=5)
+    if database:
+        args["database"] = database
+    return args
+
+
+def _get_pool():
+    """Build the shared connection pool on first use (the database must already exist)."""
+    global _POOL
+    if _POOL is None:
+        _POOL = mysql.connector.pooling.MySQLConnectionPool(
+            pool_name="clinic",
+            pool_size=DB_POOL_SIZE,
+            pool_reset_session=False,   # skip the COM_RESET_CONNECTION round trip on every checkout
+            **_conn_args(DB_NAME),
+        )
+    return _POOL
+
+
+def get_conn(database=None):
+    """Return a live MySQL connection (pooled when connecting to the clinic database)."""
+    if database == DB_NAME:
+        return _get_pool().get_connection()
+    return mysql.connector.connect(**_conn_args(database))
+
+
+# ---------------- Password Hashing Helpers ----------------
+def hash_password(plain: str,
+                  opslimit=pwhash.argon2id.OPSLIMIT_INTERACTIVE,
+                  memlimit=pwhash.argon2id.MEMLIMIT_INTERACTIVE) -> str:
+    """Hash a plaintext password with Argon2id (libsodium)."""
+    return pwhash.argon2id.str(plain.encode("utf-8"), opslimit=opslimit, memlimit=memlimit).decode("utf-8")
+
+
+def _seed_hash(plain: str) -> str:
+    """Hash a public seed password at libsodium's minimum cost (override via SEED_HASH_OPSLIMIT/MEMLIMIT)."""
+    return hash_password(
+        plain,
+        opslimit=int(os.environ.get("SEED_HASH_OPSLIMIT", pwhash.argon2id.OPSLIMIT_MIN)),
+        memlimit=int(os.environ.get("SEED_HASH_MEMLIMIT", pwhash.argon2id.MEMLIMIT_MIN)),
+    )
+
+
+# A complete bcrypt hash: version, two-digit cost, 22-char salt + 31-char digest (bcrypt base64)
+_BCRYPT_RE = re.compile(r"\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}")
+
+
+def check_password(plain: str, hashed: str) -> bool:
+    """Verify an Argon2id hash; older bcrypt hashes ($2a$/$2b$/$2y$) are still accepted."""
+    if not hashed:
+        return False
+    if hashed.startswith("$argon2id$"):
+        try:
+            return pwhash.verify(hashed.encode("utf-8"), plain.encode("utf-8"))
+        except (InvalidkeyError, ValueError):   # ValueError: hash too long or malformed
+            return False
+    if _BCRYPT_RE.fullmatch(hashed):
+        try:
+            return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
+        except ValueError:   # well-formed but unusable salt (e.g. cost out of range)
+            return False
+    # Not a hash format we issue: reject without running a KDF
+    return False
+
+
+# ---------------- Simple DB Wrapper ----------------
+class DB:
+    """Simple MySQL wrapper with automatic reconnect and query helpers."""
+    def __init__(self, use_db=True):
+        try:
+            if use_db:
+                self.conn = get_conn(DB_NAME)
+            else:
+                self.conn = get_conn()
+            self.cur = self.conn.cursor()
+        except mysql.connector.Error as err:
+            if err.errno == errorcode.ER_BAD_DB_ERROR:
+                self._create_db()
+                self.conn = get_conn(DB_NAME)
+                self.cur = self.conn.cursor()
+            else:
+                raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # a failed block must not hand the pool a connection mid-transaction: the pool skips the
+        # session reset on checkout, so the next user would inherit it
+        if exc_type is not None:
+            try:
+                self.conn.rollback()
+            except Exception:
+                pass
+        self.close()
+        return False
+
+    def _create_db(self):
+        tmp = get_conn()
+        c = tmp.cursor()
+        c.execute(f"CREATE DATABASE IF NOT EXISTS {DB_NAME} DEFAULT CHARACTER SET 'utf8mb4'")
+        tmp.commit()
+        c.close()
+        tmp.close()
+
+    def query(self, sql, params=None, fetch=False, commit=False):
+        """Execute SQL; with fetch=True return the rows as dicts, otherwise optionally commit."""
+        if fetch:
+            return self.query_dict(sql, params)
+        self.cur.execute(sql, params or ())
+        if commit:
+            self.conn.commit()
+        return True
+
+    def query_dict(self, sql, params=None):
+        """Run a SELECT on a short-lived dictionary cursor and return every row."""
+        cur = self.conn.cursor(dictionary=True)
+        try:
+            cur.execute(sql, params or ())
+            return cur.fetchall()
+        finally:
+            cur.close()
+
+    def query_tuples(self, sql, params=None):
+        """Like query_dict but rows are plain tuples in SELECT order, for hot loops that unpack by position."""
+        self.cur.execute(sql, params or ())
+        return self.cur.fetchall()
+
+    def iter_rows(self, sql, params=None, size=1024):
+        """Yield a SELECT's rows as tuples, fetched `size` at a time rather than all at once."""
+        cur = self.conn.cursor()
+        try:
+            cur.execute(sql, params or ())
+            while rows := cur.fetchmany(size):
+                yield from rows
+        finally:
+            cur.close()
+
+    def query_many(self, statements, dictionary=True):
+        """Run several SELECTs in one round trip; returns one list of rows per (sql, params).
+        Rows are dicts, or tuples in SELECT order with dictionary=False."""
+        sql = ";\n".join(stmt for stmt, _ in statements)
+        params = tuple(p for _, stmt_params in statements for p in (stmt_params or ()))
+        cur = self.conn.cursor(dictionary=dictionary)
+        try:
+            # Connector/Python >= 9.2 runs multi-statement SQL directly; nextset() steps the results
+            cur.execute(sql, params)
+            results = []
+            while True:
+                if cur.description is not None:
+                    results.append(cur.fetchall())
+                if not cur.nextset():
+                    return results
+        finally:
+            cur.close()
+
+    def query_prepared(self, sql, params=()):
+        """Like query_dict, through a statement prepared once per pooled connection (see
+        execute_prepared): after the first call only the parameters travel."""
+        cur = self._run_prepared(sql, params, dictionary=True)
+        return cur.fetchall()
+
+    def execute_prepared(self, sql, params=(), commit=False):
+        """Execute a write through a server-side prepared statement that is prepared once per pooled
+        connection and reused by every later DB() that checks the same connection out."""
+        self._run_prepared(sql, params)
+        if commit:
+            self.conn.commit()
+        return True
+
+    def _run_prepared(self, sql, params, dictionary=False):
+        key = (sql, dictionary)
+        try:
+            cur = self._prepared_cursor(key)
+            cur.execute(sql, params)
+        except mysql.connector.Error as err:
+            if err.errno != errorcode.ER_UNKNOWN_STMT_HANDLER:
+                raise
+            # the pool reconnected and the server forgot the handle; prepare afresh once
+            self._stmt_cache().pop(key, None)
+            cur = self._prepared_cursor(key)
+            cur.execute(sql, params)
+        return cur
+
+    def _stmt_cache(self):
+        # Lives on the physical connection, not on this short-lived wrapper. A pooled connection is
+        # checked out by one thread at a time, so the cache needs no lock of its own.
+        raw = getattr(self.conn, "_cnx", self.conn)
+        cache = getattr(raw, "_clinic_stmt_cache", None)
+        if cache is None:
+            cache = raw._clinic_stmt_cache = {}
+        return cache
+
+    def _prepared_cursor(self, key):
+        # key is (sql, dictionary): reads get dict rows, writes a plain cursor
+        cache = self._stmt_cache()
+        cur = cache.get(key)
+        if cur is None:
+            cur = cache[key] = self.conn.cursor(prepared=True, dictionary=key[1])
+        return cur
+
+    def many(self, sql, seq_of_params, commit=True):
+        """Execute one statement for every parameter tuple in a single batch."""
+        self.cur.executemany(sql, list(seq_of_params))
+        if commit:
+            self.conn.commit()
+        return True
+
+    def begin(self):
+        """Start an explicit transaction so a batch of writes shares one commit."""
+        self.conn.start_transaction()
+
+    def commit(self):
+        self.conn.commit()
+
+    def exists(self, table):
+        """Return True if the table has at least one row (stops after the first one)."""
+        self.cur.execute(f"SELECT 1 FROM {table} LIMIT 1")
+        return self.cur.fetchone() is not None
+
+    def close(self):
+        """Safely close the cursor and hand the connection back to the pool."""
+        try:
+            self.cur.close()
+            self.conn.close()
+        except Exception:
+            pass
+
+
+# ---------------- Schema Creation ----------------
+def _ensure_index(db, table, name, columns):
+    """CREATE INDEX only when missing (MySQL has no CREATE INDEX IF NOT EXISTS)."""
+    db.cur.execute(
+        "SELECT 1 FROM information_schema.statistics "
+        "WHERE table_schema=%s AND table_name=%s AND index_name=%s LIMIT 1",
+        (DB_NAME, table, name),
+    )
+    if db.cur.fetchone() is None:
+        db.query(f"CREATE INDEX {name} ON {table} ({columns})")
+
+
+def _ensure_ascii_email(db, table):
+    """Convert an existing table's email column to ascii (CREATE TABLE IF NOT EXISTS leaves it alone)."""
+    db.cur.execute(
+        "SELECT character_set_name FROM information_schema.columns "
+        "WHERE table_schema=%s AND table_name=%s AND column_name='email'",
+        (DB_NAME, table),
+    )
+    row = db.cur.fetchone()
+    if row is not None and row[0] != "ascii":
+        db.query(f"ALTER TABLE {table} MODIFY email VARCHAR(200) CHARACTER SET ascii COLLATE ascii_general_ci")
+
+
+def create_tables():
+    """Create or sync all tables used by the clinic system."""
+    db = DB(use_db=False)
+    db._create_db()
+    db.close()
+
+    db = DB()
+
+    # One execute per CREATE TABLE: Connector/Python 9.2 dropped execute(multi=True)
+    ddl = (
+        # --- Staff ---
+        """
+            CREATE TABLE IF NOT EXISTS staff (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                name VARCHAR(150),
+                email VARCHAR(200) CHARACTER SET ascii COLLATE ascii_general_ci UNIQUE,
+                password VARCHAR(255),
+                role VARCHAR(50),
+                phone VARCHAR(30),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """,
+        # --- Patients ---
+        """
+            CREATE TABLE IF NOT EXISTS patients (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                name VARCHAR(150),
+                age INT,
+                sex ENUM('Male','Female','Other'),
+                email VARCHAR(200) CHARACTER SET ascii COLLATE ascii_general_ci UNIQUE,
+                password VARCHAR(255),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """,
+        # --- Services ---
+        """
+            CREATE TABLE IF NOT EXISTS services (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                code VARCHAR(64) UNIQUE,
+                name VARCHAR(150),
+                description TEXT,
+                price DECIMAL(10,2),
+                active TINYINT(1) DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """,
+        # --- Appointments ---
+        """
+            CREATE TABLE IF NOT EXISTS appointments (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                patient_id INT,
+                service_id INT,
+                date DATE,
+                time TIME,
+                notes TEXT,
+                status ENUM('Pending','Confirmed','Completed','Cancelled') DEFAULT 'Pending',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (patient_id) REFERENCES patients(id),
+                FOREIGN KEY (service_id) REFERENCES services(id),
+                INDEX idx_patient_date (patient_id, date),
+                INDEX idx_date_status (date, status),
+                INDEX idx_appt_patient_status_date (patient_id, status, date, time),
+                INDEX idx_appt_status_service (status, service_id),
+                INDEX idx_appt_upcoming (date, time, status, patient_id, service_id)
+            )
+        """,
+        # --- Transactions ---
+        """
+            CREATE TABLE IF NOT EXISTS transactions (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                patient_id INT,
+                service_id INT,
+                amount DECIMAL(10,2),
+                paid_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (patient_id) REFERENCES patients(id),
+                FOREIGN KEY (service_id) REFERENCES services(id),
+                INDEX idx_patient_paid (patient_id, paid_at),
+                INDEX idx_tx_service_amount (service_id, amount)
+            )
+        """,
+    )
+    for stmt in ddl:
+        db.cur.execute(stmt)
+    db.commit()
+
+    # --- Migrations: columns and indexes changed after the tables may already exist ---
+    # MODIFY keeps the UNIQUE index; it fails if a stored address is not ASCII
+    _ensure_ascii_email(db, "staff")
+    _ensure_ascii_email(db, "patients")
+    _ensure_index(db, "appointments", "idx_patient_date", "patient_id, date")
+    _ensure_index(db, "appointments", "idx_date_status", "date, status")
+    _ensure_index(db, "transactions", "idx_patient_paid", "patient_id, paid_at")
+    _ensure_index(db, "appointments", "idx_appt_patient_status_date", "patient_id, status, date, time")
+    # staff home/reports: status breakdown, completed-per-service and revenue-per-service read
+    # these without touching the table rows
+    _ensure_index(db, "appointments", "idx_appt_status_service", "status, service_id")
+    _ensure_index(db, "transactions", "idx_tx_service_amount", "service_id, amount")
+    # upcoming feed: walks (date, time) in order and filters on status from the index alone
+    _ensure_index(db, "appointments", "idx_appt_upcoming", "date, time, status, patient_id, service_id")
+
+    db.close()
+
+
+# ---------------- Seeder ----------------
+# (name, role, email, phone) -- every seeded staff account shares the "staff123" password
+_STAFF_SEED = (
+    ("Dr. Maria Santos", "Dentist", "maria.santos@clinic.local", "09171234567"),
+    ("Dr. John Reyes", "Dentist", "john.reyes@clinic.local", "09181234567"),
+    ("Ana Cruz", "Assistant", "ana.cruz@clinic.local", "09281234567"),
+    ("Carla Dizon", "Receptionist", "carla.dizon@clinic.local", "09391234567"),
+)
+
+# (code, name, description, price)
+_SERVICES_SEED = (
+    ("CM-OPH", "Oral Prophylaxis", "Cleaning & polishing", 1200.00),
+    ("CM-FILL", "Dental Filling", "Composite filling for cavities", 2500.00),
+    ("CM-EXT", "Tooth Extraction", "Simple extraction", 1800.00),
+    ("CM-RCT", "Root Canal", "Therapy for infected tooth", 4500.00),
+    ("CM-WHT", "Teeth Whitening", "In-office bleaching", 3500.00),
+    ("CM-IMP", "Dental Implant", "Implant placement", 20000.00),
+    ("CM-BRAC", "Orthodontic Braces", "Braces installation", 25000.00),
+    ("CM-RTN", "Retainer Adjustment", "Adjustment or fitting", 2000.00),
+    ("CM-WIS", "Wisdom Tooth Removal", "Surgical extraction", 6500.00),
+    ("CM-GUM", "Gum Treatment", "Scaling & root planing", 3200.00),
+    ("CM-XRAY", "Dental X-Ray", "Panoramic imaging", 800.00),
+    ("CM-PED", "Pediatric Check-Up", "Child dental exam", 1000.00),
+    ("CM-DEN", "Dentures Fitting", "Removable dentures", 12000.00),
+    ("CM-EMR", "Emergency Visit", "Urgent dental care", 900.00),
+    ("CM-VEN", "Veneers", "Porcelain veneer restoration", 8000.00),
+)
+
+
+def _multi_insert(prefix, width, count):
+    """Render one INSERT carrying `count` rows of `width` placeholders each."""
+    row = "(" + ",".join(["%s"] * width) + ")"
+    return prefix + " VALUES " + ",".join([row] * count)
+
+
+# Rendered once at import; seeding binds a single flat parameter tuple per table
+_STAFF_INSERT = _multi_insert("INSERT IGNORE INTO staff (name, role, email, password, phone)", 5, len(_STAFF_SEED))
+_SERVICES_INSERT = _multi_insert("INSERT IGNORE INTO services (code, name, description, price)", 4, len(_SERVICES_SEED))
+_SERVICES_PARAMS = tuple(v for row in _SERVICES_SEED for v in row)
+
+
+def seed_defaults():
+    """Insert default data: staff, patient, and 15 dental services."""
+    create_tables()
+    with DB() as db:
+        db.begin()
+
+        # ✅ Seed Staff (INSERT IGNORE skips rows whose UNIQUE email already exists)
+        if not db.exists("staff"):
+            # Hash once (and only on a cold DB); every staff row shares the same password
+            staff_hash = _seed_hash("staff123")
+            params = []
+            for name, role, email, phone in _STAFF_SEED:
+                params += (name, role, email, staff_hash, phone)
+            db.query(_STAFF_INSERT, tuple(params))
+
+        # ✅ Seed Sample Patient
+        if not db.exists("patients"):
+            patient_hash = _seed_hash("patient123")
+            db.query(
+                "INSERT IGNORE INTO patients (name, age, sex, email, password) VALUES (%s,%s,%s,%s,%s)",
+                ("Juan Dela Cruz", 35, "Male", "patient1@clinic.local", patient_hash),
+            )
+
+        # ✅ Seed 15 Services (deduped on UNIQUE code)
+        if not db.exists("services"):
+            db.query(_SERVICES_INSERT, _SERVICES_PARAMS)
+
+        db.commit()
+
+
+# ---------------- Run Directly ----------------
+if __name__ == "__main__":
+    try:
+        seed_defaults()
+        print("✅ Database initialized and synced successfully.")
+    except Exception as e:
+        print("❌ Database initialization error:", e)
+        traceback.print_exc()
+        sys.exit(1)
@@ -1,18 +1,55 @@
 import sys, traceback
 from PyQt6.QtWidgets import QApplication, QMessageBox
-from ui.portal_ui import ClinicPortal
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
 from db import seed_defaults
 
 print("Starting application...")
 
-try:
-    seed_defaults()
+
+class SeedSignals(QObject):
+    seeded = pyqtSignal()
+    failed = pyqtSignal(str)
+
+
+class SeedRunnable(QRunnable):
+    """Create/seed the database on a pool thread so the window can paint first."""
+    def __init__(self):
+        super().__init__()
+        self.signals = SeedSignals()
+
+    def run(self):
+        try:
+            seed_defaults()
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.seeded.emit()
+
+
+def on_seeded(win):
     print("Database check done.")
- 
+    win.set_db_ready(True)
+
+
+def on_seed_failed(win, err):
+    QMessageBox.critical(win, "Error", f"Database initialization failed:\n{err}")
+
+
+try:
     app = QApplication(sys.argv)
     print("QApplication created.")
 
+    # Start the DB handshake/seed first so it overlaps importing and building the portal.
+    # The handlers only run from the event loop, by which point `win` exists.
+    seeder = SeedRunnable()
+    seeder.signals.seeded.connect(lambda: on_seeded(win))
+    seeder.signals.failed.connect(lambda err: on_seed_failed(win, err))
+    QThreadPool.globalInstance().start(seeder)
+
+    from ui.portal_ui import ClinicPortal
     win = ClinicPortal()
+    win.set_db_ready(False)
     print("Portal UI initialized.")
 
     win.show()
@@ -21,6 +58,6 @@ try:
     sys.exit(app.exec())
 except Exception as e:
     traceback.print_exc()   
-    app = QApplication(sys.argv)
+    app = QApplication.instance() or QApplication(sys.argv)
     QMessageBox.critical(None, "Error", str(e))
     sys.exit(1)
@@ -1,1054 +1,1593 @@
-from PyQt6.QtWidgets import (
-    QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QFrame, QLineEdit, QFormLayout,
-    QTableWidget, QTableWidgetItem, QHeaderView, QComboBox, QTextEdit, QMessageBox, QDialog,
-    QGridLayout, QScrollArea, QCalendarWidget, QDateEdit, QSpinBox, QApplication, QGraphicsDropShadowEffect
-)
-from PyQt6.QtGui import QFont, QColor, QPixmap, QIcon, QPainter
-from PyQt6.QtCore import Qt, QDate
-from db import DB
-from functools import partial
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-import os
-import re
-
-# --- Booking Dialog ---
-class BookingDialog(QDialog):
-    def __init__(self, patient_id, service=None, parent=None):
-        super().__init__(parent)
-        self.patient_id = patient_id
-        self.service = service
-        self.setWindowTitle("Book Appointment")
-        self.setFixedSize(520, 380)
-        self.setStyleSheet("""
-            QDialog { background: #fff; border-radius: 12px; }
-            QLabel {
-                color: black; font-size: 14px; background: transparent; border: none;
-            }
-            QLineEdit, QTextEdit, QComboBox, QDateEdit, QSpinBox {
-                color: black; font-size: 14px; padding: 8px; border: 1px solid #d8eafd; border-radius: 8px; background: #f8fbfd;
-                selection-background-color: #02afd2; selection-color: white;
-            }
-            QLineEdit::placeholder { color: #222; }
-            QComboBox QAbstractItemView {
-                color: black; background: white; selection-background-color: #02afd2; selection-color: white;
-            }
-            QPushButton {
-                background: #02afd2; color: white; padding: 10px 16px; border-radius: 8px;
-                font-weight: bold; font-size: 15px; min-width: 120px;
-            }
-            QPushButton:hover { background: #0177c2; }
-            QMessageBox { color: black; }
-        """)
-        self.init_ui()
-
-    def showEvent(self, ev):
-        parent = self.parentWidget()
-        if parent:
-            parent_center = parent.frameGeometry().center()
-        else:
-            parent_center = QApplication.primaryScreen().availableGeometry().center()
-        final_geo = self.frameGeometry()
-        final_geo.moveCenter(parent_center)
-        self.setGeometry(final_geo)
-        super().showEvent(ev)
-
-    def init_ui(self):
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(28, 28, 28, 28)
-        layout.setSpacing(16)
-
-        title = QLabel("Book a New Appointment")
-        title.setFont(QFont("Segoe UI", 17, QFont.Weight.Bold))
-        title.setStyleSheet("color: #0177c2; border: none;")
-        layout.addWidget(title)
-
-        form = QFormLayout()
-        form.setSpacing(12)
-        form.setLabelAlignment(Qt.AlignmentFlag.AlignRight)
-
-        self.service_cb = QComboBox()
-        db = DB()
-        services = db.query("SELECT id, name, price FROM services ORDER BY name ASC")
-        db.close()
-        self.service_map = {}
-        for s in services:
-            self.service_cb.addItem(f"{s['name']} (₱{float(s.get('price') or 0):,.2f})", s['id'])
-            self.service_map[s['id']] = s
-        if self.service:
-            idx = self.service_cb.findData(self.service.get('id'))
-            if idx >= 0:
-                self.service_cb.setCurrentIndex(idx)
-            self.service_cb.setDisabled(True)
-
-        self.date_edit = QDateEdit()
-        self.date_edit.setCalendarPopup(True)
-        self.date_edit.setDate(QDate.currentDate())
-        self.time_input = QLineEdit()
-        self.time_input.setPlaceholderText("e.g. 14:30 (24-hour format)")
-        self.notes = QTextEdit()
-        self.notes.setFixedHeight(60)
-
-        form.addRow("Service:", self.service_cb)
-        form.addRow("Date:", self.date_edit)
-        form.addRow("Time (HH:MM):", self.time_input)
-        form.addRow("Notes:", self.notes)
-        layout.addLayout(form)
-
-        btn_row = QHBoxLayout()
-        btn_row.addStretch(1)
-
-        book_btn = QPushButton("Book")
-        book_btn.setIcon(QIcon("icons/book.png"))  # Assume you have an icon file
-        book_btn.clicked.connect(self.book)
-        btn_row.addWidget(book_btn)
-
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.setIcon(QIcon("icons/cancel.png"))  # Assume you have an icon file
-        cancel_btn.setStyleSheet("background: #999; color: white; border-radius:8px; padding:10px;")
-        cancel_btn.clicked.connect(self.reject)
-        btn_row.addWidget(cancel_btn)
-        layout.addLayout(btn_row)
-
-    def book(self):
-        svc_id = self.service_cb.currentData()
-        dt = self.date_edit.date().toString("yyyy-MM-dd")
-        tm = self.time_input.text().strip()
-        notes = self.notes.toPlainText().strip()
-        if not tm:
-            QMessageBox.warning(self, "Validation", "Please enter a time for the appointment.")
-            return
-        if not re.match(r'^([01]\d|2[0-3]):([0-5]\d)$', tm):
-            QMessageBox.warning(self, "Validation", "Invalid time format. Use HH:MM (00:00 to 23:59).")
-            return
-        db = DB()
-        try:
-            db.query(
-                "INSERT INTO appointments (patient_id, service_id, date, time, notes, status) VALUES (%s,%s,%s,%s,%s,'Pending')",
-                (self.patient_id, svc_id, dt, tm, notes),
-                commit=True
-            )
-            QMessageBox.information(self, "Booked", "Appointment booked successfully (Pending).")
-            self.accept()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to book appointment: {e}")
-        finally:
-            db.close()
-
-# --- Profile Dialog ---
-class ProfileDialog(QDialog):
-    def __init__(self, patient_id, parent=None):
-        super().__init__(parent)
-        self.patient_id = patient_id
-        self.setWindowTitle("Edit Profile")
-        self.setFixedSize(480, 340)
-        self.setStyleSheet("""
-            QDialog { background: #fff; border-radius: 12px; }
-            QLabel {
-                color: black; font-size: 14px; background: transparent; border: none;
-            }
-            QLineEdit, QComboBox, QSpinBox {
-                color: black; font-size: 14px; padding: 8px; border: 1px solid #d8eafd; border-radius: 8px; background: #f8fbfd;
-                selection-background-color: #02afd2; selection-color: white;
-            }
-            QComboBox QAbstractItemView {
-                color: black; background: white; selection-background-color: #02afd2; selection-color: white;
-            }
-            QLineEdit::placeholder { color: #222; }
-            QPushButton {
-                background: #02afd2; color: white; padding: 10px 16px; border-radius: 8px;
-                font-weight: bold; min-width: 100px;
-            }
-            QPushButton:hover { background: #0177c2; }
-            QPushButton.cancel { background: #999; }
-            QPushButton.cancel:hover { background: #777; }
-            QMessageBox { color: black; }
-        """)
-        self.init_ui()
-
-    def showEvent(self, ev):
-        parent = self.parentWidget()
-        if parent:
-            parent_center = parent.frameGeometry().center()
-        else:
-            parent_center = QApplication.primaryScreen().availableGeometry().center()
-        final_geo = self.frameGeometry()
-        final_geo.moveCenter(parent_center)
-        self.setGeometry(final_geo)
-        super().showEvent(ev)
-
-    def init_ui(self):
-        db = DB()
-        try:
-            rows = db.query("SELECT * FROM patients WHERE id=%s", (self.patient_id,))
-            if not rows:
-                raise ValueError("Profile not found.")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Profile DB error: {e}")
-            db.close()
-            self.setDisabled(True)
-            return
-        finally:
-            db.close()
-
-        p = rows[0]
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(28, 28, 28, 28)
-        layout.setSpacing(18)
-
-        title = QLabel("Edit My Profile")
-        title.setFont(QFont("Segoe UI", 17, QFont.Weight.Bold))
-        title.setStyleSheet("color: #0177c2; margin-bottom: 6px; border: none;")
-        layout.addWidget(title)
-
-        form_layout = QFormLayout()
-        form_layout.setContentsMargins(0, 0, 0, 0)
-        form_layout.setSpacing(14)
-        form_layout.setLabelAlignment(Qt.AlignmentFlag.AlignRight)
-
-        self.name = QLineEdit(p.get('name') or "")
-        self.age = QSpinBox()
-        self.age.setRange(0, 150)
-        self.age.setValue(int(p.get('age') or 0))
-
-        self.sex = QComboBox()
-        self.sex.addItems(["Male", "Female", "Other"])
-        self.sex.setCurrentText(p.get('sex') or "Other")
-
-        self.email = QLineEdit(p.get('email') or "")
-
-        self.name.setMinimumWidth(280)
-        self.email.setMinimumWidth(280)
-        self.age.setFixedWidth(80)
-        self.sex.setFixedWidth(140)
-
-        form_layout.addRow("Full Name:", self.name)
-        form_layout.addRow("Email:", self.email)
-
-        subrow_grid = QGridLayout()
-        subrow_grid.setContentsMargins(0, 0, 0, 0)
-        subrow_grid.setSpacing(10)
-        subrow_grid.addWidget(self.age, 0, 0)
-        subrow_grid.addWidget(QLabel("Sex:"), 0, 1)
-        subrow_grid.addWidget(self.sex, 0, 2)
-        subrow_grid.setColumnStretch(3, 1)
-
-        form_layout.addRow("Age / Sex:", subrow_grid)
-        layout.addLayout(form_layout)
-
-        btn_row = QHBoxLayout()
-        btn_row.addStretch(1)
-
-        save_btn = QPushButton("Save")
-        save_btn.setIcon(QIcon("icons/save.png"))  # Assume icon
-        save_btn.clicked.connect(self.save)
-        btn_row.addWidget(save_btn)
-
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.setObjectName("cancel")
-        cancel_btn.setIcon(QIcon("icons/cancel.png"))  # Assume icon
-        cancel_btn.setStyleSheet("background: #999;")
-        cancel_btn.clicked.connect(self.reject)
-        btn_row.addWidget(cancel_btn)
-
-        layout.addLayout(btn_row)
-
-    def save(self):
-        nm = self.name.text().strip()
-        em = self.email.text().strip()
-        ag = self.age.value()
-        sx = self.sex.currentText()
-        if not all([nm, em]):
-            QMessageBox.warning(self, "Validation", "Name and Email are required.")
-            return
-        db = DB()
-        try:
-            db.query("UPDATE patients SET name=%s, age=%s, sex=%s, email=%s WHERE id=%s",
-                     (nm, ag or None, sx, em, self.patient_id), commit=True)
-            QMessageBox.information(self, "Saved", "Profile saved successfully.")
-            self.accept()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save profile: {e}")
-        finally:
-            db.close()
-
-# --- Custom Calendar for Appointments ---
-class AppointmentCalendar(QCalendarWidget):
-    def __init__(self, patient_id, parent=None):
-        super().__init__(parent)
-        self.patient_id = patient_id
-        self.appointment_dates = self.get_appointment_dates()
-        self.setGridVisible(False)
-        self.setVerticalHeaderFormat(QCalendarWidget.VerticalHeaderFormat.NoVerticalHeader)
-        self.setHorizontalHeaderFormat(QCalendarWidget.HorizontalHeaderFormat.ShortDayNames)
-        self.setStyleSheet("""
-            QCalendarWidget { 
-                background-color: #2b3440; color: white; border: none; 
-                selection-background-color: #475569; selection-color: white; 
-            }
-            QCalendarWidget QWidget#qt_calendar_navigationbar { background-color: transparent; border: none; }
-            QCalendarWidget QToolButton { background-color: transparent; color: white; font-size: 15px; font-weight: bold; border: none; margin: 6px; }
-            QCalendarWidget QToolButton:hover { color: #00bcd4; }
-            QCalendarWidget QAbstractItemView { outline: 0; background-color: #2b3440; color: white; 
-                selection-background-color: #475569; selection-color: white; gridline-color: #3b4758; border: none; }
-            QCalendarWidget QAbstractItemView::item:selected { background-color: #475569; }
-            QCalendarWidget QAbstractItemView::item:hover { background-color: #3b4758; }
-        """)
-
-    def get_appointment_dates(self):
-        db = DB()
-        try:
-            res = db.query("SELECT date FROM appointments WHERE patient_id=%s AND status != 'Cancelled'", (self.patient_id,))
-            dates = set(QDate.fromString(str(r['date']), "yyyy-MM-dd") for r in res)
-            return dates
-        except Exception as e:
-            print(f"Error fetching appointment dates: {e}")
-            return set()
-        finally:
-            db.close()
-
-    def paintCell(self, painter, rect, date):
-        super().paintCell(painter, rect, date)
-        if date in self.appointment_dates:
-            painter.setBrush(QColor(0, 255, 0, 100))  # Green highlight for appointments
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawEllipse(rect.adjusted(2, 2, -2, -2))
-
-# --- Main Patient Dashboard ---
-class PatientDashboard(QWidget):
-    def __init__(self, patient_id, patient_name, portal_parent=None):
-        super().__init__()
-        self.patient_id = patient_id
-        self.patient_name = patient_name
-        self.portal_parent = portal_parent
-        self.setWindowTitle("🦷 PureDent Clinic — Patient Dashboard")
-        self.resize(1200, 700)
-        self.setMinimumSize(1000, 600)
-        self.setStyleSheet("""
-            QWidget { background-color: #e3f2fd; }
-            QMessageBox { color: black; }
-        """)
-        self.init_ui()
-
-    def init_ui(self):
-        outer = QHBoxLayout(self)
-        outer.setContentsMargins(0, 0, 0, 0)
-        outer.setSpacing(0)
-
-        sidebar = QFrame()
-        sidebar.setFixedWidth(220)
-        sidebar.setStyleSheet("""
-            QFrame { background: qlineargradient(x1:0,y1:0,x2:1,y2:1, stop:0 #02afd2, stop:1 #01777f); }
-            QLabel#brand { color: white; font-weight: 800; border: none; }
-            QPushButton { background: transparent; border: none; color: white; text-align: left; padding: 10px 18px; font-weight: 600; }
-            QPushButton:hover { background: rgba(255,255,255,0.06); }
-            QPushButton[selected="true"] { background: rgba(255,255,255,0.08); }
-        """)
-        s_layout = QVBoxLayout(sidebar)
-        s_layout.setContentsMargins(16, 28, 16, 16)
-        s_layout.setSpacing(10)
-
-        brand_lbl = QLabel("🦷 PureDent\n       Clinic")
-        brand_lbl.setObjectName("brand")
-        brand_lbl.setFont(QFont("Segoe UI", 16, QFont.Weight.ExtraBold))
-        brand_lbl.setStyleSheet("color:white; margin-bottom: 6px; border: none;")
-        s_layout.addWidget(brand_lbl, alignment=Qt.AlignmentFlag.AlignCenter)
-        s_layout.addSpacing(6)
-
-        self.nav_buttons = {}
-        nav_items = [
-            ("Dashboard", "home", "icons/home.png"),
-            ("My Appointments", "my_appointments", "icons/appointments.png"),
-            ("Book Appointment", "book_appointments", "icons/book.png"),
-            ("Services", "services", "icons/services.png"),
-            ("Transactions", "transactions", "icons/transactions.png"),
-            ("Profile", "profile", "icons/profile.png"),
-            ("Logout", "logout", "icons/logout.png")
-        ]
-        for label, key, icon_path in nav_items:
-            btn = QPushButton(label)
-            btn.setIcon(QIcon(icon_path))  # Assume icon files exist
-            btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            btn.clicked.connect(partial(self.switch_section, key))
-            btn.setProperty("selected", False)
-            s_layout.addWidget(btn)
-            self.nav_buttons[key] = btn
-        s_layout.addStretch(1)
-        outer.addWidget(sidebar)
-
-        self.content_frame = QFrame()
-        self.content_frame.setStyleSheet("""
-            QFrame { background: transparent; }
-            QLabel { color: black; font-size: 14px; border: none; }
-            QLineEdit, QTableWidget, QHeaderView::section, QComboBox, QTextEdit, QDateEdit, QSpinBox, QPushButton {
-                color: black; font-size: 14px;
-            }
-            QTableWidget, QHeaderView::section, QComboBox QAbstractItemView {
-                color: black; background: white; selection-background-color: #02afd2; selection-color: white;
-            }
-        """)
-        self.content_layout = QVBoxLayout(self.content_frame)
-        self.content_layout.setContentsMargins(28, 24, 28, 24)
-        self.content_layout.setSpacing(18)
-        outer.addWidget(self.content_frame, 1)
-
-        self.switch_section("home")
-
-    def set_active_nav(self, active_key):
-        for key, btn in self.nav_buttons.items():
-            btn.setProperty("selected", key == active_key)
-            btn.setStyle(btn.style())
-
-    def clear_content(self):
-        while self.content_layout.count():
-            it = self.content_layout.takeAt(0)
-            w = it.widget()
-            if w:
-                w.deleteLater()
-
-    def switch_section(self, section):
-        try:
-            self.set_active_nav(section)
-            if section not in ("book_appointments", "profile"):
-                self.clear_content()
-
-            if section == "home":
-                self.render_home()
-            elif section == "my_appointments":
-                self.show_my_appointments()
-            elif section == "book_appointments":
-                dlg = BookingDialog(self.patient_id, parent=self)
-                if dlg.exec():
-                    self.switch_section("my_appointments")
-                return
-            elif section == "services":
-                self.show_services()
-            elif section == "transactions":
-                self.show_transaction()
-            elif section == "profile":
-                self.show_profile_dialog()
-                return
-            elif section == "logout":
-                self.logout()
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            QMessageBox.critical(self, "Error", str(e))
-
-    def show_profile_dialog(self):
-        dlg = ProfileDialog(self.patient_id, parent=self)
-        dlg.exec()
-
-    def render_home(self):
-        card_colors = ["#e3f2fd", "#fffde7", "#e8f5e9"]
-
-        header_card = QFrame()
-        header_card.setStyleSheet("QFrame { background:white; border-radius:10px; border:1px solid #d8eafd; }")
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setOffset(0, 4)
-        shadow.setColor(QColor(0, 0, 0, 50))
-        header_card.setGraphicsEffect(shadow)
-        h_layout = QHBoxLayout(header_card)
-        h_layout.setContentsMargins(20, 18, 20, 18)
-        title = QLabel("Dashboard")
-        title.setFont(QFont("Segoe UI", 20, QFont.Weight.Bold))
-        title.setStyleSheet("border: none;")
-        h_layout.addWidget(title)
-        h_layout.addStretch(1)
-        welcome = QLabel(f"Hi, {self.patient_name.split()[0]}! Remember to brush twice a day! 🪥")
-        welcome.setFont(QFont("Segoe UI", 10))
-        welcome.setStyleSheet("border: none;")
-        h_layout.addWidget(welcome)
-        self.content_layout.addWidget(header_card)
-
-        stats_card = QFrame()
-        stats_card.setStyleSheet("QFrame { background:white; border-radius:10px; border:1px solid #d8eafd; }")
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setOffset(0, 4)
-        shadow.setColor(QColor(0, 0, 0, 50))
-        stats_card.setGraphicsEffect(shadow)
-        cards_row = QHBoxLayout(stats_card)
-        cards_row.setContentsMargins(22, 18, 22, 18)
-        cards_row.setSpacing(22)
-
-        upcoming = self.get_next_appointment()
-        upcoming_value = upcoming['service'] if upcoming else "None"
-        upcoming_details = upcoming.get('when', "") if upcoming else ""
-        card_up = self._make_card_rightvalue("Upcoming Appointment", upcoming_value, details=upcoming_details, bg_color=card_colors[0])
-        cards_row.addWidget(card_up)
-
-        # Improved Recent Appointment as notification style
-        recent_list = self.get_recent_completed(limit=1)
-        recent_value = f"{recent_list[0]['service']}" if recent_list else "None"
-        recent_details = f"{recent_list[0]['date']} {str(recent_list[0]['time'])}" if recent_list else ""
-        card_recent = self._make_notification_card("Recent Appointment", recent_value, details=recent_details, bg_color=card_colors[1])
-        cards_row.addWidget(card_recent)
-
-        conf_count = self.get_confirmed_count()
-        card_conf = self._make_card_rightvalue("Confirmed Appointments", str(conf_count), bg_color=card_colors[2])
-        cards_row.addWidget(card_conf)
-
-        self.content_layout.addWidget(stats_card)
-
-        cards_side_by_side = QHBoxLayout()
-
-        completed_card = QFrame()
-        completed_card.setStyleSheet("QFrame { background: white; border: 1px solid #d8eafd; border-radius: 10px; }")
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setOffset(0, 4)
-        shadow.setColor(QColor(0, 0, 0, 50))
-        completed_card.setGraphicsEffect(shadow)
-        completed_layout = QVBoxLayout(completed_card)
-        completed_layout.setContentsMargins(18, 12, 18, 12)
-        completed_layout.setSpacing(8)
-
-        lbl = QLabel("Completed Appointments")
-        lbl.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
-        lbl.setStyleSheet("color: #333333; margin-bottom: 6px; border: none;")
-        completed_layout.addWidget(lbl)
-
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("QScrollArea { background: transparent; border: none; }")
-
-        container = QWidget()
-        container_layout = QVBoxLayout(container)
-        container_layout.setContentsMargins(0, 0, 0, 0)
-        container_layout.setSpacing(0)
-
-        completed_rows = self.get_recent_completed(limit=50)
-        row_colors = ["#f7faf9", "#eef5f2"]
-
-        for idx, r in enumerate(completed_rows):
-            row = QFrame()
-            row.setFixedHeight(42)
-            row.setStyleSheet(f"QFrame {{ background-color: {row_colors[idx % 2]}; border: none; }}")
-            row_layout = QHBoxLayout(row)
-            row_layout.setContentsMargins(14, 0, 14, 0)
-            row_layout.setSpacing(0)
-
-            svc = QLabel(r.get('service', '—'))
-            svc.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
-            svc.setStyleSheet("color: #1f2937; border: none;")
-            svc.setFixedWidth(150)
-            row_layout.addWidget(svc, alignment=Qt.AlignmentFlag.AlignVCenter)
-
-            dt = QLabel(str(r.get('date', '')))
-            dt.setFont(QFont("Segoe UI", 8))
-            dt.setStyleSheet("color: #6b7280; border: none;")
-            dt.setFixedWidth(100)
-            row_layout.addWidget(dt, alignment=Qt.AlignmentFlag.AlignVCenter)
-
-            t = str(r.get('time', ''))
-            if ":" in t:
-                try:
-                    parts = t.split(":")
-                    h, m = int(parts[0]), parts[1]
-                    ampm = "AM" if h < 12 else "PM"
-                    h = h if 1 <= h <= 12 else abs(h - 12) or 12
-                    t = f"{h}:{m} {ampm}"
-                except Exception:
-                    pass
-            tm = QLabel(t)
-            tm.setFont(QFont("Segoe UI", 8))
-            tm.setStyleSheet("color: #9ca3af; border: none;")
-            tm.setFixedWidth(80)
-            row_layout.addWidget(tm, alignment=Qt.AlignmentFlag.AlignVCenter)
-
-            tag = QLabel("Completed")
-            tag.setFont(QFont("Segoe UI", 8, QFont.Weight.Bold))
-            tag.setStyleSheet("QLabel { background-color: #b8e9c1; color: #166534; padding: 2px 6px; border-radius: 4px; border: none; }")
-            row_layout.addStretch()
-            row_layout.addWidget(tag, alignment=Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-
-            container_layout.addWidget(row)
-
-        container_layout.addStretch()
-        scroll.setWidget(container)
-        completed_layout.addWidget(scroll)
-
-        cal_card = QFrame()
-        cal_card.setStyleSheet("QFrame { background-color: #2b3440; border-radius: 10px; border: none; }")
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setOffset(0, 4)
-        shadow.setColor(QColor(0, 0, 0, 50))
-        cal_card.setGraphicsEffect(shadow)
-        cal_layout = QVBoxLayout(cal_card)
-        cal_layout.setContentsMargins(20, 18, 20, 18)
-        cal_layout.setSpacing(10)
-
-        cal_lbl = QLabel("Calendar")
-        cal_lbl.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
-        cal_lbl.setStyleSheet("color: white; margin-bottom: 4px; border: none;")
-        cal_layout.addWidget(cal_lbl)
-
-        self.calendar = AppointmentCalendar(self.patient_id)
-        cal_layout.addWidget(self.calendar)
-
-        cards_side_by_side.addWidget(completed_card, 2)
-        cards_side_by_side.addWidget(cal_card, 1)
-        self.content_layout.addLayout(cards_side_by_side)
-
-        # Add Oral Health Tips section for more dental clinic feel
-        tips_card = QFrame()
-        tips_card.setStyleSheet("QFrame { background: white; border: 1px solid #d8eafd; border-radius: 10px; }")
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setOffset(0, 4)
-        shadow.setColor(QColor(0, 0, 0, 50))
-        tips_card.setGraphicsEffect(shadow)
-        tips_layout = QVBoxLayout(tips_card)
-        tips_layout.setContentsMargins(18, 12, 18, 12)
-        tips_layout.setSpacing(8)
-
-        tips_lbl = QLabel("Oral Health Tips")
-        tips_lbl.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
-        tips_lbl.setStyleSheet("color: #0177c2; margin-bottom: 6px; border: none;")
-        tips_layout.addWidget(tips_lbl)
-
-        tips_list = [
-            "🪥 Brush your teeth twice a day for two minutes each time.",
-            "🧵 Floss daily to remove plaque between teeth.",
-            "🍎 Eat a balanced diet and limit sugary snacks.",
-            "💧 Drink plenty of water to keep your mouth hydrated.",
-            "🦷 Visit your dentist every six months for checkups."
-        ]
-
-        for tip in tips_list:
-            tip_label = QLabel(tip)
-            tip_label.setFont(QFont("Segoe UI", 9))
-            tip_label.setStyleSheet("color: #333; border: none;")
-            tip_label.setWordWrap(True)
-            tips_layout.addWidget(tip_label)
-
-        self.content_layout.addWidget(tips_card)
-
-    def _make_card_rightvalue(self, title, value, details=None, bg_color="#f5f7fb"):
-        card = QFrame()
-        card.setMinimumWidth(260)
-        card.setStyleSheet(f"QFrame {{ background: {bg_color}; border-radius: 12px; border: none; color: #111; }}")
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setOffset(0, 4)
-        shadow.setColor(QColor(0, 0, 0, 50))
-        card.setGraphicsEffect(shadow)
-        layout = QVBoxLayout(card)
-        layout.setContentsMargins(16, 12, 16, 12)
-        layout.setSpacing(6)
-
-        title_lbl = QLabel(title)
-        title_lbl.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
-        title_lbl.setStyleSheet("color: #0177c2; border: none;")
-        layout.addWidget(title_lbl, alignment=Qt.AlignmentFlag.AlignLeft)
-
-        value_lbl = QLabel(value)
-        value_lbl.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
-        value_lbl.setStyleSheet("color: #111; border: none;")
-        layout.addWidget(value_lbl, alignment=Qt.AlignmentFlag.AlignLeft)
-
-        if details:
-            details_lbl = QLabel(details)
-            details_lbl.setFont(QFont("Segoe UI", 9))
-            details_lbl.setStyleSheet("color: #555; border: none;")
-            layout.addWidget(details_lbl, alignment=Qt.AlignmentFlag.AlignLeft)
-
-        return card
-
-    def _make_notification_card(self, title, value, details=None, bg_color="#f5f7fb"):
-        card = QFrame()
-        card.setMinimumWidth(260)
-        card.setStyleSheet(f"QFrame {{ background: {bg_color}; border-radius: 12px; border: 1px solid #ffd54f; color: #111; }}")
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setOffset(0, 4)
-        shadow.setColor(QColor(0, 0, 0, 50))
-        card.setGraphicsEffect(shadow)
-        layout = QHBoxLayout(card)
-        layout.setContentsMargins(16, 12, 16, 12)
-        layout.setSpacing(10)
-
-        # Add bell icon for notification style
-        icon_lbl = QLabel()
-        icon_lbl.setPixmap(QPixmap("icons/bell.png").scaled(32, 32, Qt.AspectRatioMode.KeepAspectRatio))  # Assume you have a bell icon
-        layout.addWidget(icon_lbl)
-
-        content_layout = QVBoxLayout()
-        content_layout.setSpacing(4)
-
-        title_lbl = QLabel(title)
-        title_lbl.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
-        title_lbl.setStyleSheet("color: #f57f17; border: none;")
-        content_layout.addWidget(title_lbl)
-
-        value_lbl = QLabel(value)
-        value_lbl.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
-        value_lbl.setStyleSheet("color: #111; border: none;")
-        content_layout.addWidget(value_lbl)
-
-        if details:
-            details_lbl = QLabel(details)
-            details_lbl.setFont(QFont("Segoe UI", 9))
-            details_lbl.setStyleSheet("color: #555; border: none;")
-            content_layout.addWidget(details_lbl)
-
-        layout.addLayout(content_layout)
-        return card
-
-    def show_my_appointments(self):
-        table_card = QFrame()
-        table_card.setStyleSheet("QFrame { background:white; border-radius:10px; border:1px solid #d8eafd; }")
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setOffset(0, 4)
-        shadow.setColor(QColor(0, 0, 0, 50))
-        table_card.setGraphicsEffect(shadow)
-        layout = QVBoxLayout(table_card)
-        layout.setContentsMargins(22, 18, 22, 18)
-        header = QLabel("My Appointments")
-        header.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
-        header.setStyleSheet("border: none;")
-        layout.addWidget(header)
-
-        search_layout = QHBoxLayout()
-        self.appointment_search = QLineEdit()
-        self.appointment_search.setPlaceholderText("Search...")
-        self.appointment_search.setFixedWidth(200)
-        self.appointment_search.textChanged.connect(self.filter_appointments)
-        search_layout.addWidget(QLabel("🔍"))
-        search_layout.addWidget(self.appointment_search)
-        search_layout.addStretch(1)
-        layout.addLayout(search_layout)
-
-        table = QTableWidget(0, 5)
-        table.setHorizontalHeaderLabels(["Service", "Date", "Time", "Status", "Action"])
-        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        table.setMinimumHeight(420)
-
-        db = DB()
-        try:
-            rows = db.query("""
-                SELECT a.id, s.name as service, a.date, a.time, a.status, a.notes
-                FROM appointments a
-                JOIN services s ON a.service_id = s.id
-                WHERE a.patient_id = %s
-                ORDER BY a.date DESC, a.time DESC
-            """, (self.patient_id,))
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load appointments: {e}")
-            db.close()
-            return
-        finally:
-            db.close()
-
-        table.setRowCount(len(rows))
-        for i, r in enumerate(rows):
-            table.setItem(i, 0, QTableWidgetItem(r['service']))
-            table.setItem(i, 1, QTableWidgetItem(str(r['date'])))
-            table.setItem(i, 2, QTableWidgetItem(str(r['time'])))
-            status_item = QTableWidgetItem(r['status'])
-            st = r['status'].lower()
-            if st == "confirmed":
-                status_item.setBackground(QColor("#43a047"))
-                status_item.setForeground(QColor("white"))
-            elif st == "cancelled":
-                status_item.setBackground(QColor("#e53935"))
-                status_item.setForeground(QColor("white"))
-            elif st == "completed":
-                status_item.setBackground(QColor("#2fb28a"))
-                status_item.setForeground(QColor("white"))
-            else:
-                status_item.setBackground(QColor("#ffb74d"))
-                status_item.setForeground(QColor("black"))
-            table.setItem(i, 3, status_item)
-            action_btn = QPushButton("Cancel")
-            action_btn.setIcon(QIcon("icons/cancel.png"))  # Add icon for beauty
-            action_btn.setStyleSheet("""
-                QPushButton { background: #e53935; color: white; border-radius: 6px; padding: 6px; font-weight: bold; }
-                QPushButton:hover { background: #c62828; }
-                QPushButton:disabled { background: #bdbdbd; }
-            """)
-            if st in ("completed", "cancelled"):
-                action_btn.setDisabled(True)
-            action_btn.clicked.connect(partial(self.cancel_appointment, r['id']))
-            table.setCellWidget(i, 4, action_btn)
-
-        table.setStyleSheet("""
-            QTableWidget { background: white; border: 1px solid #e6eefc; }
-            QHeaderView::section { background:#f7fdff; color: black; font-weight: bold; border: none; }
-        """)
-        layout.addWidget(table)
-        self.content_layout.addWidget(table_card)
-
-        self.table_appointments_ref = table
-
-    def filter_appointments(self, text):
-        query = text.lower()
-        table = self.table_appointments_ref
-        for row in range(table.rowCount()):
-            match = False
-            for col in range(table.columnCount() - 1):
-                item = table.item(row, col)
-                if item and query in item.text().lower():
-                    match = True
-                    break
-            table.setRowHidden(row, not match)
-
-    def cancel_appointment(self, appointment_id):
-        db = DB()
-        try:
-            reply = QMessageBox.question(
-                self, "Confirm", "Cancel this appointment?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-            )
-            if reply == QMessageBox.StandardButton.Yes:
-                db.query(
-                    "UPDATE appointments SET status='Cancelled' WHERE id=%s",
-                    (appointment_id,), commit=True
-                )
-                QMessageBox.information(self, "Cancelled", "Appointment cancelled.")
-                self.switch_section("my_appointments")  # Refresh
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to cancel appointment: {e}")
-        finally:
-            db.close()
-
-    def show_services(self):
-        services_card = QFrame()
-        services_card.setStyleSheet("QFrame { background:white; border-radius:10px; border:1px solid #d8eafd; }")
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setOffset(0, 4)
-        shadow.setColor(QColor(0, 0, 0, 50))
-        services_card.setGraphicsEffect(shadow)
-        layout = QVBoxLayout(services_card)
-        layout.setContentsMargins(22, 18, 22, 18)
-        header_layout = QHBoxLayout()
-        header = QLabel("Services Catalog")
-        header.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
-        header.setStyleSheet("border: none;")
-        header_layout.addWidget(header)
-        header_layout.addStretch(1)
-        search_bar = QLineEdit()
-        search_bar.setPlaceholderText("Search services...")
-        search_bar.setFixedWidth(150)
-        search_bar.setStyleSheet("""
-            QLineEdit { padding: 8px; border: 1px solid #d8eafd; border-radius: 8px; background: #f8fbfd; }
-        """)
-        search_bar.textChanged.connect(self.filter_services)
-        header_layout.addWidget(search_bar)
-        layout.addLayout(header_layout)
-
-        self.services_scroll = QScrollArea()
-        self.services_scroll.setWidgetResizable(True)
-        self.services_container = QWidget()
-        self.services_grid = QGridLayout(self.services_container)
-        self.services_grid.setSpacing(18)
-        layout.addWidget(self.services_scroll)
-        self.services_scroll.setWidget(self.services_container)
-        self.content_layout.addWidget(services_card)
-
-        self.populate_services("")
-
-    def populate_services(self, search_text):
-        while self.services_grid.count():
-            item = self.services_grid.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        db = DB()
-        try:
-            query = "SELECT id, name, description, price FROM services WHERE name LIKE %s ORDER BY name ASC"
-            rows = db.query(query, (f"%{search_text}%",))
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load services: {e}")
-            db.close()
-            return
-        finally:
-            db.close()
-
-        for idx, r in enumerate(rows):
-            card = QFrame()
-            card.setMinimumWidth(260)
-            card.setMaximumWidth(320)
-            card.setStyleSheet("QFrame { background: #ffffff; border-radius: 18px; border: none; }")
-            shadow = QGraphicsDropShadowEffect()
-            shadow.setBlurRadius(10)
-            shadow.setOffset(0, 4)
-            shadow.setColor(QColor(0, 0, 0, 50))
-            card.setGraphicsEffect(shadow)
-            v = QVBoxLayout(card)
-            v.setContentsMargins(14, 12, 14, 12)
-
-            name = QLabel(r['name'])
-            name.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
-            name.setStyleSheet("color: #111; border: none;")
-            v.addWidget(name)
-
-            price = QLabel(f"Price: ₱{float(r.get('price') or 0):,.2f}")
-            price.setFont(QFont("Segoe UI", 11, QFont.Weight.DemiBold))
-            price.setStyleSheet("color:#111; border: none;")
-            v.addWidget(price)
-
-            desc = QLabel(r.get('description') or "")
-            desc.setWordWrap(True)
-            desc.setStyleSheet("color:#111; border: none;")
-            v.addWidget(desc)
-            v.addStretch(1)
-
-            btn = QPushButton("Book Now")
-            btn.setIcon(QIcon("icons/book.png"))  # Add icon
-            btn.setStyleSheet("""
-                QPushButton { background:#02afd2; color:white; border-radius:8px; padding:8px; font-weight:bold; }
-                QPushButton:hover { background:#0177c2; }
-            """)
-            btn.clicked.connect(partial(self.on_service_book, r))
-            v.addWidget(btn)
-
-            self.services_grid.addWidget(card, idx // 3, idx % 3)
-
-    def filter_services(self, text):
-        self.populate_services(text.strip())
-
-    def on_service_book(self, service_row):
-        dlg = BookingDialog(self.patient_id, service=service_row, parent=self)
-        if dlg.exec():
-            self.switch_section("my_appointments")
-
-    def show_transaction(self):
-        trans_card = QFrame()
-        trans_card.setStyleSheet("QFrame { background:white; border-radius:10px; border:1px solid #d8eafd; }")
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setOffset(0, 4)
-        shadow.setColor(QColor(0, 0, 0, 50))
-        trans_card.setGraphicsEffect(shadow)
-        layout = QVBoxLayout(trans_card)
-        layout.setContentsMargins(22, 18, 22, 18)
-        header = QLabel("Transactions")
-        header.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
-        header.setStyleSheet("border: none;")
-        layout.addWidget(header)
-
-        table = QTableWidget(0, 4)
-        table.setHorizontalHeaderLabels(["Service", "Date Paid", "Amount", "Action"])
-        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        table.setMinimumHeight(420)
-
-        db = DB()
-        try:
-            rows = db.query("""
-                            SELECT s.name as service, t.paid_at as paid, t.amount, t.id
-                            FROM transactions t
-                            JOIN services s ON t.service_id = s.id
-                            WHERE t.patient_id = %s
-                            ORDER BY t.paid_at DESC
-                            """, (self.patient_id,))
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load transactions: {e}")
-            db.close()
-            return
-        finally:
-            db.close()
-
-        table.setRowCount(len(rows))
-        for i, r in enumerate(rows):
-            table.setItem(i, 0, QTableWidgetItem(r['service']))
-            table.setItem(i, 1, QTableWidgetItem(str(r['paid'])))
-            amt_item = QTableWidgetItem(f"₱{float(r['amount']):,.2f}")
-            amt_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            table.setItem(i, 2, amt_item)
-            receipt_btn = QPushButton("Print Receipt")
-            receipt_btn.setIcon(QIcon("icons/print.png"))  # Add icon
-            receipt_btn.setStyleSheet("""
-                QPushButton { background: #4caf50; color: white; border-radius: 6px; padding: 6px; font-weight: bold; }
-                QPushButton:hover { background: #388e3c; }
-            """)
-            receipt_btn.clicked.connect(partial(self.generate_receipt, r))
-            table.setCellWidget(i, 3, receipt_btn)
-
-        table.setStyleSheet("""
-            QTableWidget { background: white; border: 1px solid #e6eefc; }
-            QHeaderView::section { background:#f7fdff; color: black; font-weight: bold; border: none; }
-        """)
-        layout.addWidget(table)
-        self.content_layout.addWidget(trans_card)
-
-    def generate_receipt(self, transaction):
-        filename = f"receipt_{transaction['id']}.pdf"
-        try:
-            c = canvas.Canvas(filename, pagesize=letter)
-            width, height = letter
-            c.drawString(inch, height - inch, "PureDent Clinic Receipt")
-            c.drawString(inch, height - 1.5 * inch, f"Transaction ID: {transaction['id']}")
-            c.drawString(inch, height - 2 * inch, f"Service: {transaction['service']}")
-            c.drawString(inch, height - 2.5 * inch, f"Date Paid: {transaction['paid']}")
-            c.drawString(inch, height - 3 * inch, f"Amount: ₱{float(transaction['amount']):,.2f}")
-            c.drawString(inch, height - 3.5 * inch, f"Patient: {self.patient_name}")
-            c.save()
-            os.startfile(filename)
-            QMessageBox.information(self, "Receipt Generated", f"Receipt saved as {filename}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to generate receipt: {e}")
-
-    def get_next_appointment(self):
-        db = DB()
-        try:
-            res = db.query("""
-                           SELECT a.date, a.time, s.name as service
-                           FROM appointments a
-                           JOIN services s ON a.service_id = s.id
-                           WHERE a.patient_id = %s
-                           AND a.date >= CURDATE()
-                           ORDER BY a.date ASC, a.time ASC LIMIT 1
-                           """, (self.patient_id,))
-            if res:
-                r = res[0]
-                when = f"{r['date']} {str(r['time'])}"
-                return {"when": when, "service": r.get("service")}
-            return None
-        except Exception as e:
-            print(f"Error fetching next appointment: {e}")
-            return None
-        finally:
-            db.close()
-
-    def get_confirmed_count(self):
-        db = DB()
-        try:
-            res = db.query("SELECT COUNT(*) as count FROM appointments WHERE patient_id=%s AND status='Confirmed'",
-                           (self.patient_id,))
-            return res[0]['count'] if res else 0
-        except Exception as e:
-            print(f"Error fetching confirmed count: {e}")
-            return 0
-        finally:
-            db.close()
-
-    def get_recent_completed(self, limit=6):
-        db = DB()
-        try:
-            rows = db.query("""
-                            SELECT s.name as service, a.date, a.time
-                            FROM appointments a
-                            JOIN services s ON a.service_id = s.id
-                            WHERE a.patient_id = %s
-                            AND a.status = 'Completed'
-                            ORDER BY a.date DESC, a.time DESC
-                            LIMIT %s
-                            """, (self.patient_id, limit))
-            return rows
-        except Exception as e:
-            print(f"Error fetching recent completed: {e}")
-            return []
-        finally:
-            db.close()
-
-    def logout(self):
-        if self.portal_parent:
-            self.portal_parent.show()
+from PyQt6.QtWidgets import (
+    QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QFrame, QLineEdit, QFormLayout,
+    QHeaderView, QComboBox, QTextEdit, QMessageBox, QDialog,
+    QGridLayout, QCalendarWidget, QDateEdit, QSpinBox, QApplication,
+    QTableView, QStyledItemDelegate, QAbstractItemView, QStackedWidget, QStyle, QListView
+)
+from PyQt6.QtGui import QFont, QColor, QPixmap, QIcon, QPainter, QTextCharFormat, QStandardItemModel, QStandardItem, QDesktopServices
+from PyQt6.QtCore import (
+    Qt, QDate, QAbstractTableModel, QAbstractListModel, QModelIndex, QRect, QRectF, QSize, QEvent, pyqtSignal, QTimer,
+    QSortFilterProxyModel, QAbstractProxyModel, QUrl
+)
+from db import DB, ConnectionLost
+from ui.workers import submit, fetch, run_task
+from ui.styles import IMG_DIR, SHADOW_QSS, cached_font
+from functools import partial, lru_cache
+from collections import OrderedDict
+import os
+import time
+
+# --- Icon cache: each file is read and decoded once per process ---
+@lru_cache(maxsize=64)
+def _icon(path):
+    return QIcon(path)
+
+
+@lru_cache(maxsize=64)
+def _pixmap(path, w, h):
+    return QPixmap(path).scaled(w, h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+
+class _TTLCache:
+    """Tiny dict whose entries expire `ttl` seconds after they were stored."""
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._data = {}
+
+    def get(self, key):
+        hit = self._data.get(key)
+        if hit is None or time.monotonic() - hit[0] > self.ttl:
+            self._data.pop(key, None)
+            return None
+        return hit[1]
+
+    def put(self, key, value):
+        self._data[key] = (time.monotonic(), value)
+
+    def pop(self, key):
+        self._data.pop(key, None)
+
+
+# patient_id -> home bundle; revisiting home (or a profile edit's rebuild) within 30s skips the DB.
+# Anything that changes the patient's appointments drops the entry (appointments_changed, cancel_appointment).
+_HOME_CACHE = _TTLCache(ttl=30)
+
+
+# --- Shared stylesheets (parsed once per top-level widget, not per card) ---
+_BOOKING_QSS = """
+    QDialog { background: #fff; border-radius: 12px; }
+    QLabel {
+        color: black; font-size: 14px; background: transparent; border: none;
+    }
+    QLineEdit, QTextEdit, QComboBox, QDateEdit, QSpinBox {
+        color: black; font-size: 14px; padding: 8px; border: 1px solid #d8eafd; border-radius: 8px; background: #f8fbfd;
+        selection-background-color: #02afd2; selection-color: white;
+    }
+    QLineEdit::placeholder { color: #222; }
+    QComboBox QAbstractItemView {
+        color: black; background: white; selection-background-color: #02afd2; selection-color: white;
+    }
+    QPushButton {
+        background: #02afd2; color: white; padding: 10px 16px; border-radius: 8px;
+        font-weight: bold; font-size: 15px; min-width: 120px;
+    }
+    QPushButton:hover { background: #0177c2; }
+    QMessageBox { color: black; }
+"""
+
+_PROFILE_QSS = """
+    QDialog { background: #fff; border-radius: 12px; }
+    QLabel {
+        color: black; font-size: 14px; background: transparent; border: none;
+    }
+    QLineEdit, QComboBox, QSpinBox {
+        color: black; font-size: 14px; padding: 8px; border: 1px solid #d8eafd; border-radius: 8px; background: #f8fbfd;
+        selection-background-color: #02afd2; selection-color: white;
+    }
+    QComboBox QAbstractItemView {
+        color: black; background: white; selection-background-color: #02afd2; selection-color: white;
+    }
+    QLineEdit::placeholder { color: #222; }
+    QPushButton {
+        background: #02afd2; color: white; padding: 10px 16px; border-radius: 8px;
+        font-weight: bold; min-width: 100px;
+    }
+    QPushButton:hover { background: #0177c2; }
+    QPushButton.cancel { background: #999; }
+    QPushButton.cancel:hover { background: #777; }
+    QMessageBox { color: black; }
+"""
+
+_CONTENT_QSS = """
+    QFrame { background: transparent; }
+    QLabel { color: black; font-size: 14px; border: none; }
+    QLineEdit, QTableView, QHeaderView::section, QComboBox, QTextEdit, QDateEdit, QSpinBox, QPushButton {
+        color: black; font-size: 14px;
+    }
+    QTableView, QHeaderView::section, QComboBox QAbstractItemView {
+        color: black; background: white; selection-background-color: #02afd2; selection-color: white;
+    }
+"""
+
+# Card looks are selected by dynamic property, so cards never carry their own stylesheet
+_CARD_QSS = """
+    QFrame[panel="light"] { background: white; border-radius: 10px; border: 1px solid #d8eafd; }
+    QFrame[panel="dark"] { background-color: #2b3440; border-radius: 10px; border: none; }
+    QFrame[cardBg] { border-radius: 12px; border: none; color: #111; }
+    QFrame[cardBg="#e3f2fd"] { background: #e3f2fd; }
+    QFrame[cardBg="#fffde7"] { background: #fffde7; }
+    QFrame[cardBg="#e8f5e9"] { background: #e8f5e9; }
+    QFrame[cardBg="#f5f7fb"] { background: #f5f7fb; }
+    QFrame[notify="true"] { border: 1px solid #ffd54f; }
+"""
+
+
+def _valid_time(t):
+    """True for a 24-hour 'HH:MM' string (00:00-23:59) without going through the regex engine."""
+    return (len(t) == 5 and t.isascii() and t[2] == ":" and t[:2].isdigit() and t[3:].isdigit()
+            and int(t[:2]) <= 23 and int(t[3:]) <= 59)
+
+
+# --- Booking Dialog ---
+class BookingDialog(QDialog):
+    def __init__(self, patient_id, service=None, parent=None):
+        super().__init__(parent)
+        self.patient_id = patient_id
+        self.service = service
+        self.setWindowTitle("Book Appointment")
+        self.setFixedSize(520, 380)
+        self.setStyleSheet(_BOOKING_QSS)
+        self.init_ui()
+
+    def showEvent(self, ev):
+        parent = self.parentWidget()
+        if parent:
+            parent_center = parent.frameGeometry().center()
+        else:
+            parent_center = QApplication.primaryScreen().availableGeometry().center()
+        final_geo = self.frameGeometry()
+        final_geo.moveCenter(parent_center)
+        self.setGeometry(final_geo)
+        super().showEvent(ev)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(28, 28, 28, 28)
+        layout.setSpacing(16)
+
+        title = QLabel("Book a New Appointment")
+        title.setFont(cached_font("Segoe UI", 17, QFont.Weight.Bold))
+        title.setStyleSheet("color: #0177c2; border: none;")
+        layout.addWidget(title)
+
+        form = QFormLayout()
+        form.setSpacing(12)
+        form.setLabelAlignment(Qt.AlignmentFlag.AlignRight)
+
+        self.service_cb = QComboBox()
+        self.service_cb.addItem("Loading services...")
+        self.service_cb.setDisabled(True)
+        self.service_map = {}
+
+        self.date_edit = QDateEdit()
+        self.date_edit.setCalendarPopup(True)
+        self.date_edit.setDate(QDate.currentDate())
+        self.time_input = QLineEdit()
+        self.time_input.setPlaceholderText("e.g. 14:30 (24-hour format)")
+        self.notes = QTextEdit()
+        self.notes.setFixedHeight(60)
+
+        form.addRow("Service:", self.service_cb)
+        form.addRow("Date:", self.date_edit)
+        form.addRow("Time (HH:MM):", self.time_input)
+        form.addRow("Notes:", self.notes)
+        layout.addLayout(form)
+
+        btn_row = QHBoxLayout()
+        btn_row.addStretch(1)
+
+        self.book_btn = QPushButton("Book")
+        self.book_btn.setIcon(_icon("icons/book.png"))  # Assume you have an icon file
+        self.book_btn.setDisabled(True)  # enabled once the services arrive
+        self.book_btn.clicked.connect(self.book)
+        btn_row.addWidget(self.book_btn)
+
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.setIcon(_icon("icons/cancel.png"))  # Assume you have an icon file
+        cancel_btn.setStyleSheet("background: #999; color: white; border-radius:8px; padding:10px;")
+        cancel_btn.clicked.connect(self.reject)
+        btn_row.addWidget(cancel_btn)
+        layout.addLayout(btn_row)
+
+        submit(self._load_services, self._on_services, self._on_services_error)
+
+    @staticmethod
+    def _load_services(db):
+        # Runs on the worker thread: rows and their combo labels are ready before the GUI sees them
+        rows = db.query("SELECT id, name, price FROM services ORDER BY name ASC", fetch=True)
+        return [(s, f"{s['name']} (₱{float(s.get('price') or 0):,.2f})") for s in rows]
+
+    def _on_services(self, labelled):
+        # One setModel instead of an addItem (and view update) per service
+        model = QStandardItemModel(len(labelled), 1, self.service_cb)
+        for i, (s, label) in enumerate(labelled):
+            item = QStandardItem(label)
+            item.setData(s['id'], Qt.ItemDataRole.UserRole)
+            model.setItem(i, 0, item)
+        self.service_cb.setModel(model)
+        self.service_map = {s['id']: s for s, _ in labelled}
+        if self.service:
+            idx = self.service_cb.findData(self.service.get('id'))
+            if idx >= 0:
+                self.service_cb.setCurrentIndex(idx)
+        else:
+            self.service_cb.setDisabled(False)
+        self.book_btn.setDisabled(not labelled)
+
+    def _on_services_error(self, err):
+        self.service_cb.setItemText(0, "Services unavailable")
+        QMessageBox.critical(self, "Error", f"Failed to load services: {err}")
+
+    def book(self):
+        svc_id = self.service_cb.currentData()
+        dt = self.date_edit.date().toString("yyyy-MM-dd")
+        tm = self.time_input.text().strip()
+        notes = self.notes.toPlainText().strip()
+        if not tm:
+            QMessageBox.warning(self, "Validation", "Please enter a time for the appointment.")
+            return
+        if not _valid_time(tm):
+            QMessageBox.warning(self, "Validation", "Invalid time format. Use HH:MM (00:00 to 23:59).")
+            return
+        try:
+            with DB() as db:
+                db.execute_prepared(
+                    "INSERT INTO appointments (patient_id, service_id, date, time, notes, status) VALUES (%s,%s,%s,%s,%s,'Pending')",
+                    (self.patient_id, svc_id, dt, tm, notes),
+                    commit=True
+                )
+            QMessageBox.information(self, "Booked", "Appointment booked successfully (Pending).")
+            self.accept()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to book appointment: {e}")
+
+# --- Profile Dialog ---
+class ProfileDialog(QDialog):
+    def __init__(self, patient_id, parent=None):
+        super().__init__(parent)
+        self.patient_id = patient_id
+        self.setWindowTitle("Edit Profile")
+        self.setFixedSize(480, 340)
+        self.setStyleSheet(_PROFILE_QSS)
+        self.init_ui()
+
+    def showEvent(self, ev):
+        parent = self.parentWidget()
+        if parent:
+            parent_center = parent.frameGeometry().center()
+        else:
+            parent_center = QApplication.primaryScreen().availableGeometry().center()
+        final_geo = self.frameGeometry()
+        final_geo.moveCenter(parent_center)
+        self.setGeometry(final_geo)
+        super().showEvent(ev)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(28, 28, 28, 28)
+        layout.setSpacing(18)
+
+        title = QLabel("Edit My Profile")
+        title.setFont(cached_font("Segoe UI", 17, QFont.Weight.Bold))
+        title.setStyleSheet("color: #0177c2; margin-bottom: 6px; border: none;")
+        layout.addWidget(title)
+
+        form_layout = QFormLayout()
+        form_layout.setContentsMargins(0, 0, 0, 0)
+        form_layout.setSpacing(14)
+        form_layout.setLabelAlignment(Qt.AlignmentFlag.AlignRight)
+
+        self.name = QLineEdit()
+        self.name.setPlaceholderText("Loading...")
+        self.age = QSpinBox()
+        self.age.setRange(0, 150)
+
+        self.sex = QComboBox()
+        self.sex.addItems(["Male", "Female", "Other"])
+
+        self.email = QLineEdit()
+
+        self.name.setMinimumWidth(280)
+        self.email.setMinimumWidth(280)
+        self.age.setFixedWidth(80)
+        self.sex.setFixedWidth(140)
+
+        form_layout.addRow("Full Name:", self.name)
+        form_layout.addRow("Email:", self.email)
+
+        subrow_grid = QGridLayout()
+        subrow_grid.setContentsMargins(0, 0, 0, 0)
+        subrow_grid.setSpacing(10)
+        subrow_grid.addWidget(self.age, 0, 0)
+        subrow_grid.addWidget(QLabel("Sex:"), 0, 1)
+        subrow_grid.addWidget(self.sex, 0, 2)
+        subrow_grid.setColumnStretch(3, 1)
+
+        form_layout.addRow("Age / Sex:", subrow_grid)
+        layout.addLayout(form_layout)
+
+        btn_row = QHBoxLayout()
+        btn_row.addStretch(1)
+
+        self.save_btn = QPushButton("Save")
+        self.save_btn.setIcon(_icon("icons/save.png"))  # Assume icon
+        self.save_btn.clicked.connect(self.save)
+        btn_row.addWidget(self.save_btn)
+
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.setObjectName("cancel")
+        cancel_btn.setIcon(_icon("icons/cancel.png"))  # Assume icon
+        cancel_btn.setStyleSheet("background: #999;")
+        cancel_btn.clicked.connect(self.reject)
+        btn_row.addWidget(cancel_btn)
+
+        layout.addLayout(btn_row)
+
+        # Fields stay disabled until the profile row arrives from the worker thread
+        self._editable = (self.name, self.age, self.sex, self.email, self.save_btn)
+        for w in self._editable:
+            w.setDisabled(True)
+        fetch("SELECT * FROM patients WHERE id=%s", (self.patient_id,),
+              self._on_profile, self._on_profile_error)
+
+    def _on_profile(self, rows):
+        if not rows:
+            self._on_profile_error("Profile not found.")
+            return
+        p = rows[0]
+        self.name.setPlaceholderText("")
+        self.name.setText(p.get('name') or "")
+        self.age.setValue(int(p.get('age') or 0))
+        self.sex.setCurrentText(p.get('sex') or "Other")
+        self.email.setText(p.get('email') or "")
+        for w in self._editable:
+            w.setDisabled(False)
+
+    def _on_profile_error(self, err):
+        QMessageBox.warning(self, "Error", f"Profile DB error: {err}")
+        self.setDisabled(True)
+
+    def save(self):
+        nm = self.name.text().strip()
+        em = self.email.text().strip()
+        ag = self.age.value()
+        sx = self.sex.currentText()
+        if not all([nm, em]):
+            QMessageBox.warning(self, "Validation", "Name and Email are required.")
+            return
+        try:
+            with DB() as db:
+                db.execute_prepared("UPDATE patients SET name=%s, age=%s, sex=%s, email=%s WHERE id=%s",
+                                    (nm, ag or None, sx, em, self.patient_id), commit=True)
+            QMessageBox.information(self, "Saved", "Profile saved successfully.")
+            self.accept()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save profile: {e}")
+
+# --- Custom Calendar for Appointments ---
+class AppointmentCalendar(QCalendarWidget):
+    DATES_SQL = ("SELECT date FROM appointments WHERE patient_id=%s AND status != 'Cancelled' "
+                 "AND date BETWEEN %s AND %s")
+    MONTH_CACHE_SIZE = 12
+
+    def __init__(self, patient_id, dates=None, parent=None):
+        super().__init__(parent)
+        self.patient_id = patient_id
+        self.appointment_dates = set()
+        # (year, month) -> set[QDate], least recently shown first; paging back and forth hits this
+        self._month_cache = OrderedDict()
+        self._pending = set()
+        if dates is None:
+            self._reload_dates(self.yearShown(), self.monthShown())
+        else:
+            # a placeholder until the caller hands over the real month via set_month_dates(); not
+            # cached, so paging back before then fetches the month instead of showing it empty
+            self.set_dates(dates)
+            self._prefetch_neighbours(self.yearShown(), self.monthShown())
+        self.currentPageChanged.connect(self._reload_dates)
+        self.setGridVisible(False)
+        self.setVerticalHeaderFormat(QCalendarWidget.VerticalHeaderFormat.NoVerticalHeader)
+        self.setHorizontalHeaderFormat(QCalendarWidget.HorizontalHeaderFormat.ShortDayNames)
+        self.setStyleSheet("""
+            QCalendarWidget { 
+                background-color: #2b3440; color: white; border: none; 
+                selection-background-color: #475569; selection-color: white; 
+            }
+            QCalendarWidget QWidget#qt_calendar_navigationbar { background-color: transparent; border: none; }
+            QCalendarWidget QToolButton { background-color: transparent; color: white; font-size: 15px; font-weight: bold; border: none; margin: 6px; }
+            QCalendarWidget QToolButton:hover { color: #00bcd4; }
+            QCalendarWidget QAbstractItemView { outline: 0; background-color: #2b3440; color: white; 
+                selection-background-color: #475569; selection-color: white; gridline-color: #3b4758; border: none; }
+            QCalendarWidget QAbstractItemView::item:selected { background-color: #475569; }
+            QCalendarWidget QAbstractItemView::item:hover { background-color: #3b4758; }
+        """)
+
+    @staticmethod
+    def visible_range(year, month):
+        """Date span a month page can show, including the spill-over days of the 6-week grid."""
+        first = QDate(year, month, 1)
+        return (first.addDays(-7).toString("yyyy-MM-dd"),
+                first.addMonths(1).addDays(14).toString("yyyy-MM-dd"))
+
+    def _reload_dates(self, year, month):
+        """Show a month's dates from the cache, or fetch them off the GUI thread (the grid paints
+        unhighlighted meanwhile). Either way the neighbouring months are prefetched."""
+        key = (year, month)
+        if key in self._month_cache:
+            self._month_cache.move_to_end(key)
+            self.set_dates(self._month_cache[key])
+        else:
+            self._fetch_month(year, month)
+        self._prefetch_neighbours(year, month)
+
+    def _prefetch_neighbours(self, year, month):
+        current = QDate(year, month, 1)
+        for d in (current.addMonths(-1), current.addMonths(1)):
+            if (d.year(), d.month()) not in self._month_cache:
+                self._fetch_month(d.year(), d.month())
+
+    def _fetch_month(self, year, month):
+        if (year, month) in self._pending:
+            return
+        self._pending.add((year, month))
+        start, end = self.visible_range(year, month)
+        pid, sql = self.patient_id, self.DATES_SQL
+        submit(lambda db: (year, month, db.query_tuples(sql, (pid, start, end))),
+               self._on_dates, lambda err: print(f"Error fetching appointment dates: {err}"))
+
+    def _on_dates(self, payload):
+        year, month, res = payload
+        self._pending.discard((year, month))
+        self.set_month_dates(year, month, set(QDate.fromString(str(d), "yyyy-MM-dd") for d, in res))
+
+    def set_month_dates(self, year, month, dates):
+        """Cache a month's appointment dates and show them if that month is on screen (otherwise
+        it was a prefetch, or the user already paged elsewhere)."""
+        self._remember((year, month), dates)
+        if (year, month) == (self.yearShown(), self.monthShown()):
+            self.set_dates(dates)
+
+    def _remember(self, key, dates):
+        self._month_cache[key] = dates
+        self._month_cache.move_to_end(key)
+        while len(self._month_cache) > self.MONTH_CACHE_SIZE:
+            self._month_cache.popitem(last=False)
+
+    def set_dates(self, dates):
+        """Let Qt paint the appointment highlight natively instead of a Python paintCell override."""
+        self.setDateTextFormat(QDate(), QTextCharFormat())  # clears every highlight
+        self.appointment_dates = dates
+        fmt = QTextCharFormat()
+        fmt.setBackground(QColor(0, 255, 0, 100))  # Green highlight for appointments
+        for d in self.appointment_dates:
+            self.setDateTextFormat(d, fmt)
+
+# --- Completed Appointments (model/view) ---
+# hour (0-23) -> (12-hour clock hour, meridiem)
+_HOUR12 = [((h % 12) or 12, "AM" if h < 12 else "PM") for h in range(24)]
+
+
+def _time_12h(t):
+    """'14:30:00' -> '2:30 PM'; MySQL returns TIME as H:MM:SS, so pad single-digit hours first."""
+    if len(t) >= 4 and t[1] == ":":
+        t = "0" + t
+    if len(t) >= 5 and t[2] == ":" and t[:2].isdigit() and int(t[:2]) < 24:
+        h12, ampm = _HOUR12[int(t[:2])]
+        return f"{h12}:{t[3:5]} {ampm}"
+    return t
+
+
+class CompletedAppointmentsModel(QAbstractTableModel):
+    """Read-only (service, date, time) tuples for the home page's completed list, plus a status pill."""
+    _FONTS = None
+    _COLORS = (QColor("#1f2937"), QColor("#6b7280"), QColor("#9ca3af"))
+
+    def __init__(self, rows, parent=None):
+        super().__init__(parent)
+        self._rows = rows
+        if CompletedAppointmentsModel._FONTS is None:
+            CompletedAppointmentsModel._FONTS = (
+                cached_font("Segoe UI", 9, QFont.Weight.Bold), cached_font("Segoe UI", 8), cached_font("Segoe UI", 8)
+            )
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 4
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        col = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            svc, dt, tm = self._rows[index.row()]
+            if col == 0:
+                return svc or '—'
+            if col == 1:
+                return str(dt)
+            if col == 2:
+                return _time_12h(str(tm))
+            return "Completed"
+        if col == 3:
+            return None
+        if role == Qt.ItemDataRole.FontRole:
+            return self._FONTS[col]
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self._COLORS[col]
+        return None
+
+
+class CompletedPillDelegate(QStyledItemDelegate):
+    """Paints the green "Completed" tag directly instead of a styled QLabel per row."""
+    _BG = QColor("#b8e9c1")
+    _FG = QColor("#166534")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._font = cached_font("Segoe UI", 8, QFont.Weight.Bold)
+
+    def paint(self, painter, option, index):
+        text = index.data()
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(self._font)
+        fm = painter.fontMetrics()
+        w, h = fm.horizontalAdvance(text) + 12, fm.height() + 4
+        rect = QRectF(option.rect.right() - 14 - w, option.rect.center().y() - h / 2, w, h)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._BG)
+        painter.drawRoundedRect(rect, 4, 4)
+        painter.setPen(self._FG)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+
+
+# --- My Appointments / Transactions (model/view) ---
+class RowsModel(QAbstractTableModel):
+    """Read-only table over a list of row dicts; subclasses say what each column shows.
+
+    With a `loader(offset, limit)` the model is paged: `rows` is the first page fetched with
+    limit PAGE + 1 (the extra row only says whether more exist), and the view pulls further
+    pages through Qt's canFetchMore/fetchMore as it is scrolled to the bottom."""
+    HEADERS = ()
+    PAGE = 50
+
+    def __init__(self, rows, parent=None, loader=None):
+        super().__init__(parent)
+        self._loader = loader
+        self._take(rows)
+
+    def _take(self, rows):
+        self._has_more = self._loader is not None and len(rows) > self.PAGE
+        self._rows = rows[:self.PAGE] if self._loader is not None else rows
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        try:
+            batch = self._loader(len(self._rows), self.PAGE + 1)
+        except Exception as e:
+            self._has_more = False
+            print(f"Error fetching more rows: {e}")
+            return
+        self._has_more = len(batch) > self.PAGE
+        batch = batch[:self.PAGE]
+        if batch:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(batch) - 1)
+            self._rows.extend(batch)
+            self.endInsertRows()
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._take(rows)
+        self.endResetModel()
+
+    def row(self, i):
+        return self._rows[i]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+
+class AppointmentsModel(RowsModel):
+    HEADERS = ("Service", "Date", "Time", "Status", "Action")
+    # status -> (background, foreground) for the Status cell
+    _STATUS_COLORS = {
+        "confirmed": (QColor("#43a047"), QColor("white")),
+        "cancelled": (QColor("#e53935"), QColor("white")),
+        "completed": (QColor("#2fb28a"), QColor("white")),
+    }
+    _PENDING_COLORS = (QColor("#ffb74d"), QColor("black"))
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        r = self._rows[index.row()]
+        col = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return (r['service'], str(r['date']), str(r['time']), r['status'], None)[col]
+        if col == 3 and role in (Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ForegroundRole):
+            colors = self._STATUS_COLORS.get(r['status'].lower(), self._PENDING_COLORS)
+            return colors[0] if role == Qt.ItemDataRole.BackgroundRole else colors[1]
+        return None
+
+    def set_status(self, appointment_id, status):
+        """Update one row in place; only its Status and Action cells repaint."""
+        for i, r in enumerate(self._rows):
+            if r['id'] == appointment_id:
+                r['status'] = status
+                self.dataChanged.emit(self.index(i, 3), self.index(i, 4),
+                                      [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.BackgroundRole])
+                return
+
+    def flags(self, index):
+        # Completed and cancelled visits can't be cancelled again; the delegate paints them greyed out
+        if index.column() == 4 and self._rows[index.row()]['status'].lower() in ("completed", "cancelled"):
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled
+
+
+class TransactionsModel(RowsModel):
+    HEADERS = ("Service", "Date Paid", "Amount", "Action")
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        r = self._rows[index.row()]
+        col = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 2:
+                # formatted on first paint and kept, so rows never scrolled into view cost nothing
+                text = r.get('_amount_str')
+                if text is None:
+                    text = r['_amount_str'] = f"₱{float(r['amount']):,.2f}"
+                return text
+            return (r['service'], str(r['paid']), None, None)[col]
+        if role == Qt.ItemDataRole.TextAlignmentRole and col == 2:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """Paints a pill button in its column and reports clicks by source row, so the table needs
+    no QPushButton cell widget per row. Items without ItemIsEnabled are painted disabled.
+    The label is the delegate's own, which keeps the action column out of text filtering."""
+    clicked = pyqtSignal(int)
+    _DISABLED = QColor("#bdbdbd")
+
+    def __init__(self, text, color, hover_color, icon_path=None, parent=None):
+        super().__init__(parent)
+        self._text = text
+        self._bg, self._hover = QColor(color), QColor(hover_color)
+        self._icon_path = icon_path
+        self._font = cached_font("Segoe UI", 9, QFont.Weight.Bold)
+
+    def paint(self, painter, option, index):
+        enabled = bool(index.flags() & Qt.ItemFlag.ItemIsEnabled)
+        if not enabled:
+            bg = self._DISABLED
+        elif option.state & QStyle.StateFlag.State_MouseOver:
+            bg = self._hover
+        else:
+            bg = self._bg
+        rect = QRectF(option.rect).adjusted(6, 5, -6, -5)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(bg)
+        painter.drawRoundedRect(rect, 6, 6)
+        painter.setFont(self._font)
+        painter.setPen(QColor("white"))
+        text = self._text
+        if self._icon_path:
+            fm = painter.fontMetrics()
+            size = 16
+            x = rect.center().x() - (size + 6 + fm.horizontalAdvance(text)) / 2
+            icon_rect = QRectF(x, rect.center().y() - size / 2, size, size).toRect()
+            mode = QIcon.Mode.Normal if enabled else QIcon.Mode.Disabled
+            _icon(self._icon_path).paint(painter, icon_rect, Qt.AlignmentFlag.AlignCenter, mode)
+            rect.setLeft(x + size + 6)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+        else:
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton
+                and index.flags() & Qt.ItemFlag.ItemIsEnabled and option.rect.contains(event.position().toPoint())):
+            if isinstance(index.model(), QAbstractProxyModel):
+                index = index.model().mapToSource(index)
+            self.clicked.emit(index.row())
+            return True
+        return False
+
+
+def _records_view(model, button_col, delegate):
+    """Build a records table over `model`, with `delegate` drawing the action column.
+    The view takes ownership of both, so they go away with the page."""
+    view = QTableView()
+    model.setParent(view)
+    delegate.setParent(view)
+    view.setModel(model)
+    view.setItemDelegateForColumn(button_col, delegate)
+    view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+    view.verticalHeader().setDefaultSectionSize(40)
+    view.setMinimumHeight(420)
+    view.setMouseTracking(True)  # hover state for the painted buttons
+    view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+    view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    view.setStyleSheet("""
+        QTableView { background: white; border: 1px solid #e6eefc; }
+        QHeaderView::section { background:#f7fdff; color: black; font-weight: bold; border: none; }
+    """)
+    return view
+
+
+# --- Services catalog (model/view) ---
+class ServicesModel(QAbstractListModel):
+    """The (filtered) service rows behind the catalog grid; the delegate reads whole rows."""
+    def __init__(self, rows, parent=None):
+        super().__init__(parent)
+        self._rows = rows
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def row(self, i):
+        return self._rows[i]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()]['name']
+        if role == Qt.ItemDataRole.UserRole:
+            return self._rows[index.row()]
+        return None
+
+
+def _draw_nine_slice(painter, target, pixmap, m):
+    """Stretch `pixmap` over `target` keeping its `m`-px border slices unscaled (QSS border-image)."""
+    pw, ph = pixmap.width(), pixmap.height()
+    xs = ((0, target.left(), m), (m, target.left() + m, target.width() - 2 * m), (pw - m, target.right() - m + 1, m))
+    ys = ((0, target.top(), m), (m, target.top() + m, target.height() - 2 * m), (ph - m, target.bottom() - m + 1, m))
+    for sx, tx, tw in xs:
+        for sy, ty, th in ys:
+            sw = m if sx != m else pw - 2 * m
+            sh = m if sy != m else ph - 2 * m
+            painter.drawPixmap(QRect(tx, ty, tw, th), pixmap, QRect(sx, sy, sw, sh))
+
+
+class ServiceCardDelegate(QStyledItemDelegate):
+    """Paints a whole service card (shadow, name, price, description, Book Now button) and
+    emits book(row) when the painted button is clicked."""
+    book = pyqtSignal(int)
+    SIZE = QSize(300, 190)
+    _SHADOW = 8  # border slice of the shadow image, also the card's inset within its cell
+    _BTN_H = 36
+    _TEXT = QColor("#111")
+    _BTN, _BTN_HOVER = QColor("#02afd2"), QColor("#0177c2")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._shadow = QPixmap(f"{IMG_DIR}/shadow_card.png")
+        self._name_font = cached_font("Segoe UI", 12, QFont.Weight.Bold)
+        self._price_font = cached_font("Segoe UI", 11, QFont.Weight.DemiBold)
+        self._desc_font = cached_font("Segoe UI", 10)
+        self._btn_font = cached_font("Segoe UI", 10, QFont.Weight.Bold)
+
+    def sizeHint(self, option, index):
+        return self.SIZE
+
+    def _card_rect(self, option):
+        return option.rect.adjusted(self._SHADOW, self._SHADOW, -self._SHADOW, -self._SHADOW)
+
+    def _button_rect(self, option):
+        card = self._card_rect(option)
+        return QRect(card.left() + 14, card.bottom() - 12 - self._BTN_H, card.width() - 28, self._BTN_H)
+
+    def paint(self, painter, option, index):
+        r = index.data(Qt.ItemDataRole.UserRole)
+        card = self._card_rect(option)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        _draw_nine_slice(painter, option.rect, self._shadow, self._SHADOW)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("white"))
+        painter.drawRoundedRect(QRectF(card), 10, 10)
+
+        text = card.adjusted(14, 12, -14, 0)
+        painter.setPen(self._TEXT)
+        painter.setFont(self._name_font)
+        fm = painter.fontMetrics()
+        painter.drawText(text, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+                         fm.elidedText(r['name'], Qt.TextElideMode.ElideRight, text.width()))
+        text.setTop(text.top() + fm.height() + 4)
+        painter.setFont(self._price_font)
+        price = r.get('_price_str')
+        if price is None:  # cached on the row: a card repaints on every hover change
+            price = r['_price_str'] = f"Price: ₱{float(r.get('price') or 0):,.2f}"
+        painter.drawText(text, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, price)
+        text.setTop(text.top() + painter.fontMetrics().height() + 6)
+        btn = self._button_rect(option)
+        text.setBottom(btn.top() - 8)
+        painter.setFont(self._desc_font)
+        painter.drawText(text, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop | Qt.TextFlag.TextWordWrap,
+                         r.get('description') or "")
+
+        hovered = option.state & QStyle.StateFlag.State_MouseOver
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._BTN_HOVER if hovered else self._BTN)
+        painter.drawRoundedRect(QRectF(btn), 8, 8)
+        painter.setFont(self._btn_font)
+        label = "Book Now"
+        size = 16
+        x = btn.center().x() - (size + 6 + painter.fontMetrics().horizontalAdvance(label)) // 2
+        _icon("icons/book.png").paint(painter, QRect(x, btn.center().y() - size // 2, size, size))
+        painter.setPen(QColor("white"))
+        painter.drawText(QRect(x + size + 6, btn.top(), btn.right() - x, btn.height()),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, label)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton
+                and self._button_rect(option).contains(event.position().toPoint())):
+            self.book.emit(index.row())
+            return True
+        return False
+
+
+# --- Main Patient Dashboard ---
+class PatientDashboard(QWidget):
+    def __init__(self, patient_id, patient_name, portal_parent=None):
+        super().__init__()
+        self.patient_id = patient_id
+        self.patient_name = patient_name
+        self.portal_parent = portal_parent
+        self._services_cache = None  # service catalog rows, loaded on first use and filtered in memory
+        self._db = None  # GUI-thread connection, checked out on first query and held until logout
+        # first pages warmed up by _prefetch_sections, consumed by the page builders
+        self._appt_cache = None
+        self._tx_cache = None
+        self._prefetch_token = None  # set while a prefetch is in flight
+        self.setWindowTitle("🦷 PureDent Clinic — Patient Dashboard")
+        self.resize(1200, 700)
+        self.setMinimumSize(1000, 600)
+        self.setStyleSheet("""
+            QWidget { background-color: #e3f2fd; }
+            QMessageBox { color: black; }
+        """)
+        self.init_ui()
+
+    def init_ui(self):
+        outer = QHBoxLayout(self)
+        outer.setContentsMargins(0, 0, 0, 0)
+        outer.setSpacing(0)
+
+        sidebar = QFrame()
+        sidebar.setFixedWidth(220)
+        sidebar.setStyleSheet("""
+            QFrame { background: qlineargradient(x1:0,y1:0,x2:1,y2:1, stop:0 #02afd2, stop:1 #01777f); }
+            QLabel#brand { color: white; font-weight: 800; border: none; }
+            QPushButton { background: transparent; border: none; color: white; text-align: left; padding: 10px 18px; font-weight: 600; }
+            QPushButton:hover { background: rgba(255,255,255,0.06); }
+            QPushButton[selected="true"] { background: rgba(255,255,255,0.08); }
+        """)
+        s_layout = QVBoxLayout(sidebar)
+        s_layout.setContentsMargins(16, 28, 16, 16)
+        s_layout.setSpacing(10)
+
+        brand_lbl = QLabel("🦷 PureDent\n       Clinic")
+        brand_lbl.setObjectName("brand")
+        brand_lbl.setFont(cached_font("Segoe UI", 16, QFont.Weight.ExtraBold))
+        brand_lbl.setStyleSheet("color:white; margin-bottom: 6px; border: none;")
+        s_layout.addWidget(brand_lbl, alignment=Qt.AlignmentFlag.AlignCenter)
+        s_layout.addSpacing(6)
+
+        self.nav_buttons = {}
+        nav_items = [
+            ("Dashboard", "home", "icons/home.png"),
+            ("My Appointments", "my_appointments", "icons/appointments.png"),
+            ("Book Appointment", "book_appointments", "icons/book.png"),
+            ("Services", "services", "icons/services.png"),
+            ("Transactions", "transactions", "icons/transactions.png"),
+            ("Profile", "profile", "icons/profile.png"),
+            ("Logout", "logout", "icons/logout.png")
+        ]
+        for label, key, icon_path in nav_items:
+            btn = QPushButton(label)
+            btn.setIcon(_icon(icon_path))  # Assume icon files exist
+            btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn.clicked.connect(partial(self.switch_section, key))
+            btn.setProperty("selected", False)
+            s_layout.addWidget(btn)
+            self.nav_buttons[key] = btn
+        s_layout.addStretch(1)
+        outer.addWidget(sidebar)
+
+        # Each section is built once into its own page and kept until invalidate() drops it
+        self.stack = QStackedWidget()
+        self.stack.setStyleSheet(_CONTENT_QSS + _CARD_QSS + SHADOW_QSS)
+        self._sections = {}
+        outer.addWidget(self.stack, 1)
+
+        self.switch_section("home")
+
+    def set_active_nav(self, active_key):
+        for key, btn in self.nav_buttons.items():
+            btn.setProperty("selected", key == active_key)
+            btn.setStyle(btn.style())
+
+    # section key -> builder that fills a fresh page layout
+    _PAGE_BUILDERS = {
+        "home": "render_home",
+        "my_appointments": "show_my_appointments",
+        "services": "show_services",
+        "transactions": "show_transaction",
+    }
+
+    def _build_section(self, key):
+        page = QWidget()
+        page_layout = QVBoxLayout(page)
+        page_layout.setContentsMargins(28, 24, 28, 24)
+        page_layout.setSpacing(18)
+        getattr(self, self._PAGE_BUILDERS[key])(page_layout)
+        return page
+
+    def show_page(self, key):
+        if key not in self._sections:
+            self._sections[key] = self._build_section(key)
+            self.stack.addWidget(self._sections[key])
+        self.stack.setCurrentWidget(self._sections[key])
+
+    def invalidate(self, *keys):
+        """Drop cached pages whose data changed; the visible one is rebuilt right away."""
+        current = self.stack.currentWidget()
+        rebuild = None
+        for key in keys:
+            page = self._sections.pop(key, None)
+            if page is None:
+                continue
+            if page is current:
+                rebuild = key
+            self.stack.removeWidget(page)
+            page.deleteLater()
+        if rebuild:
+            self.show_page(rebuild)
+
+    def appointments_changed(self):
+        """After a booking or cancellation: drop the home stats cache and both pages that list appointments."""
+        _HOME_CACHE.pop(self.patient_id)
+        self._appt_cache = self._prefetch_token = None
+        self.invalidate("home", "my_appointments")
+
+    def switch_section(self, section):
+        try:
+            self.set_active_nav(section)
+
+            if section in self._PAGE_BUILDERS:
+                self.show_page(section)
+            elif section == "book_appointments":
+                dlg = BookingDialog(self.patient_id, parent=self)
+                if dlg.exec():
+                    self.appointments_changed()
+                    self.switch_section("my_appointments")
+                return
+            elif section == "profile":
+                self.show_profile_dialog()
+                return
+            elif section == "logout":
+                self.logout()
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            QMessageBox.critical(self, "Error", str(e))
+
+    def show_profile_dialog(self):
+        dlg = ProfileDialog(self.patient_id, parent=self)
+        if dlg.exec():
+            self.invalidate("home")
+
+    def render_home(self, page_layout):
+        card_colors = ["#e3f2fd", "#fffde7", "#e8f5e9"]
+
+        header_card = QFrame()
+        header_card.setProperty("panel", "light")
+        header_card.setProperty("shadow", "light")
+        h_layout = QHBoxLayout(header_card)
+        h_layout.setContentsMargins(20, 18, 20, 18)
+        title = QLabel("Dashboard")
+        title.setFont(cached_font("Segoe UI", 20, QFont.Weight.Bold))
+        title.setStyleSheet("border: none;")
+        h_layout.addWidget(title)
+        h_layout.addStretch(1)
+        welcome = QLabel(f"Hi, {self.patient_name.split()[0]}! Remember to brush twice a day! 🪥")
+        welcome.setFont(cached_font("Segoe UI", 10))
+        welcome.setStyleSheet("border: none;")
+        h_layout.addWidget(welcome)
+        page_layout.addWidget(header_card)
+
+        stats_card = QFrame()
+        stats_card.setProperty("panel", "light")
+        stats_card.setProperty("shadow", "light")
+        cards_row = QHBoxLayout(stats_card)
+        cards_row.setContentsMargins(22, 18, 22, 18)
+        cards_row.setSpacing(22)
+
+        # Cards start as placeholders; _apply_home_bundle fills them when the worker returns
+        self._card_up = self._make_card_rightvalue("Upcoming Appointment", "…", bg_color=card_colors[0])
+        cards_row.addWidget(self._card_up)
+
+        # Improved Recent Appointment as notification style
+        self._card_recent = self._make_notification_card("Recent Appointment", "…", bg_color=card_colors[1])
+        cards_row.addWidget(self._card_recent)
+
+        self._card_conf = self._make_card_rightvalue("Confirmed Appointments", "…", bg_color=card_colors[2])
+        cards_row.addWidget(self._card_conf)
+
+        page_layout.addWidget(stats_card)
+
+        cards_side_by_side = QHBoxLayout()
+
+        completed_card = QFrame()
+        completed_card.setProperty("panel", "light")
+        completed_card.setProperty("shadow", "light")
+        completed_layout = QVBoxLayout(completed_card)
+        completed_layout.setContentsMargins(18, 12, 18, 12)
+        completed_layout.setSpacing(8)
+
+        lbl = QLabel("Completed Appointments")
+        lbl.setFont(cached_font("Segoe UI", 11, QFont.Weight.Bold))
+        lbl.setStyleSheet("color: #333333; margin-bottom: 6px; border: none;")
+        completed_layout.addWidget(lbl)
+
+        completed_view = QTableView()
+        self._completed_model = CompletedAppointmentsModel([], completed_view)
+        completed_view.setModel(self._completed_model)
+        completed_view.setItemDelegateForColumn(3, CompletedPillDelegate(completed_view))
+        completed_view.horizontalHeader().hide()
+        completed_view.verticalHeader().hide()
+        completed_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        completed_view.verticalHeader().setDefaultSectionSize(42)
+        completed_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        for col, width in enumerate((164, 100, 80)):
+            completed_view.setColumnWidth(col, width)
+        completed_view.horizontalHeader().setStretchLastSection(True)
+        completed_view.setShowGrid(False)
+        completed_view.setAlternatingRowColors(True)
+        completed_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        completed_view.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        completed_view.setStyleSheet("""
+            QTableView { background-color: #f7faf9; alternate-background-color: #eef5f2; border: none; }
+            QTableView::item { padding-left: 14px; border: none; }
+        """)
+        completed_layout.addWidget(completed_view)
+
+        cal_card = QFrame()
+        cal_card.setProperty("panel", "dark")
+        cal_card.setProperty("shadow", "dark")
+        cal_layout = QVBoxLayout(cal_card)
+        cal_layout.setContentsMargins(20, 18, 20, 18)
+        cal_layout.setSpacing(10)
+
+        cal_lbl = QLabel("Calendar")
+        cal_lbl.setFont(cached_font("Segoe UI", 12, QFont.Weight.Bold))
+        cal_lbl.setStyleSheet("color: white; margin-bottom: 4px; border: none;")
+        cal_layout.addWidget(cal_lbl)
+
+        self.calendar = AppointmentCalendar(self.patient_id, dates=set())
+        cal_layout.addWidget(self.calendar)
+
+        cards_side_by_side.addWidget(completed_card, 2)
+        cards_side_by_side.addWidget(cal_card, 1)
+        page_layout.addLayout(cards_side_by_side)
+
+        # Add Oral Health Tips section for more dental clinic feel
+        tips_card = QFrame()
+        tips_card.setProperty("panel", "light")
+        tips_card.setProperty("shadow", "light")
+        tips_layout = QVBoxLayout(tips_card)
+        tips_layout.setContentsMargins(18, 12, 18, 12)
+        tips_layout.setSpacing(8)
+
+        tips_lbl = QLabel("Oral Health Tips")
+        tips_lbl.setFont(cached_font("Segoe UI", 11, QFont.Weight.Bold))
+        tips_lbl.setStyleSheet("color: #0177c2; margin-bottom: 6px; border: none;")
+        tips_layout.addWidget(tips_lbl)
+
+        tips_list = [
+            "🪥 Brush your teeth twice a day for two minutes each time.",
+            "🧵 Floss daily to remove plaque between teeth.",
+            "🍎 Eat a balanced diet and limit sugary snacks.",
+            "💧 Drink plenty of water to keep your mouth hydrated.",
+            "🦷 Visit your dentist every six months for checkups."
+        ]
+
+        for tip in tips_list:
+            tip_label = QLabel(tip)
+            tip_label.setFont(cached_font("Segoe UI", 9))
+            tip_label.setStyleSheet("color: #333; border: none;")
+            tip_label.setWordWrap(True)
+            tips_layout.addWidget(tip_label)
+
+        page_layout.addWidget(tips_card)
+
+        self._home_token = token = object()
+        pid = self.patient_id
+        cached = _HOME_CACHE.get(pid)
+        if cached is not None:
+            self._fill_home(cached)
+            return
+        submit(lambda db: (token, PatientDashboard._home_bundle(db, pid)), self._apply_home_bundle,
+               lambda err: print(f"Error fetching home data: {err}"))
+
+    def _apply_home_bundle(self, payload):
+        token, bundle = payload
+        if token is not self._home_token or "home" not in self._sections:
+            return  # the home page was rebuilt or dropped while this request was in flight
+        _HOME_CACHE.put(self.patient_id, bundle)
+        self._fill_home(bundle)
+
+    def _prefetch_sections(self):
+        """While the user reads the home page, load the first page of the sections they are likely
+        to open next in one background round trip; their builders then skip the DB."""
+        if self._prefetch_token is not None:
+            return  # one already in flight
+        pid, page = self.patient_id, RowsModel.PAGE + 1
+        wanted = {}
+        if self._appt_cache is None and "my_appointments" not in self._sections:
+            wanted["appointments"] = (self._APPT_PAGE_SQL, (pid, page, 0))
+        if self._tx_cache is None and "transactions" not in self._sections:
+            wanted["transactions"] = (self._TX_PAGE_SQL, (pid, page, 0))
+        if self._services_cache is None:
+            wanted["services"] = (self._SERVICES_SQL, None)
+        if not wanted:
+            return
+        self._prefetch_token = token = object()
+        keys = list(wanted)
+        submit(lambda db: (token, dict(zip(keys, db.query_many(list(wanted.values()))))),
+               self._on_prefetched, self._on_prefetch_error)
+
+    def _on_prefetched(self, payload):
+        token, results = payload
+        fresh = token is self._prefetch_token  # appointments_changed() clears the token
+        if fresh:
+            self._prefetch_token = None
+        # a page built meanwhile already has fresher data; leave it alone
+        if fresh and "appointments" in results and "my_appointments" not in self._sections:
+            self._appt_cache = results["appointments"]
+        if "transactions" in results and "transactions" not in self._sections:
+            self._tx_cache = results["transactions"]
+        if "services" in results and self._services_cache is None:
+            self._services_cache = results["services"]
+
+    def _on_prefetch_error(self, err):
+        self._prefetch_token = None
+        print(f"Error prefetching sections: {err}")
+
+    def _fill_home(self, bundle):
+        upcoming = bundle["next"]
+        self._set_card(self._card_up, upcoming['service'] if upcoming else "None",
+                       upcoming.get('when', "") if upcoming else "")
+        recent_list = bundle["completed"][:1]
+        if recent_list:
+            svc, dt, tm = recent_list[0]
+            self._set_card(self._card_recent, f"{svc}", f"{dt} {str(tm)}")
+        else:
+            self._set_card(self._card_recent, "None")
+        self._set_card(self._card_conf, str(bundle["confirmed"]))
+        self._completed_model.set_rows(bundle["completed"])
+        today = QDate.currentDate()  # the bundle's dates cover today's month page
+        self.calendar.set_month_dates(today.year(), today.month(), bundle["dates"])
+        QTimer.singleShot(0, self._prefetch_sections)
+
+    @staticmethod
+    def _set_card(card, value, details=""):
+        card.value_lbl.setText(value)
+        card.details_lbl.setText(details)
+        card.details_lbl.setVisible(bool(details))
+
+    def _make_card_rightvalue(self, title, value, details=None, bg_color="#f5f7fb"):
+        card = QFrame()
+        card.setMinimumWidth(260)
+        card.setProperty("cardBg", bg_color)
+        card.setProperty("shadow", "light")
+        layout = QVBoxLayout(card)
+        layout.setContentsMargins(16, 12, 16, 12)
+        layout.setSpacing(6)
+
+        title_lbl = QLabel(title)
+        title_lbl.setFont(cached_font("Segoe UI", 11, QFont.Weight.Bold))
+        title_lbl.setStyleSheet("color: #0177c2; border: none;")
+        layout.addWidget(title_lbl, alignment=Qt.AlignmentFlag.AlignLeft)
+
+        value_lbl = QLabel(value)
+        value_lbl.setFont(cached_font("Segoe UI", 16, QFont.Weight.Bold))
+        value_lbl.setStyleSheet("color: #111; border: none;")
+        layout.addWidget(value_lbl, alignment=Qt.AlignmentFlag.AlignLeft)
+
+        details_lbl = QLabel(details or "")
+        details_lbl.setFont(cached_font("Segoe UI", 9))
+        details_lbl.setStyleSheet("color: #555; border: none;")
+        details_lbl.setVisible(bool(details))
+        layout.addWidget(details_lbl, alignment=Qt.AlignmentFlag.AlignLeft)
+        card.value_lbl, card.details_lbl = value_lbl, details_lbl
+
+        return card
+
+    def _make_notification_card(self, title, value, details=None, bg_color="#f5f7fb"):
+        card = QFrame()
+        card.setMinimumWidth(260)
+        card.setProperty("cardBg", bg_color)
+        card.setProperty("notify", True)
+        card.setProperty("shadow", "light")
+        layout = QHBoxLayout(card)
+        layout.setContentsMargins(16, 12, 16, 12)
+        layout.setSpacing(10)
+
+        # Add bell icon for notification style
+        icon_lbl = QLabel()
+        icon_lbl.setPixmap(_pixmap("icons/bell.png", 32, 32))  # Assume you have a bell icon
+        layout.addWidget(icon_lbl)
+
+        content_layout = QVBoxLayout()
+        content_layout.setSpacing(4)
+
+        title_lbl = QLabel(title)
+        title_lbl.setFont(cached_font("Segoe UI", 11, QFont.Weight.Bold))
+        title_lbl.setStyleSheet("color: #f57f17; border: none;")
+        content_layout.addWidget(title_lbl)
+
+        value_lbl = QLabel(value)
+        value_lbl.setFont(cached_font("Segoe UI", 14, QFont.Weight.Bold))
+        value_lbl.setStyleSheet("color: #111; border: none;")
+        content_layout.addWidget(value_lbl)
+
+        details_lbl = QLabel(details or "")
+        details_lbl.setFont(cached_font("Segoe UI", 9))
+        details_lbl.setStyleSheet("color: #555; border: none;")
+        details_lbl.setVisible(bool(details))
+        content_layout.addWidget(details_lbl)
+        card.value_lbl, card.details_lbl = value_lbl, details_lbl
+
+        layout.addLayout(content_layout)
+        return card
+
+    def show_my_appointments(self, page_layout):
+        table_card = QFrame()
+        table_card.setStyleSheet("QFrame { background:white; border-radius:10px; border:1px solid #d8eafd; }" + SHADOW_QSS)
+        table_card.setProperty("shadow", "light")
+        layout = QVBoxLayout(table_card)
+        layout.setContentsMargins(22, 18, 22, 18)
+        header = QLabel("My Appointments")
+        header.setFont(cached_font("Segoe UI", 16, QFont.Weight.Bold))
+        header.setStyleSheet("border: none;")
+        layout.addWidget(header)
+
+        search_layout = QHBoxLayout()
+        self.appointment_search = QLineEdit()
+        self.appointment_search.setPlaceholderText("Search...")
+        self.appointment_search.setFixedWidth(200)
+        # Filter once typing pauses rather than on every keystroke
+        self._appt_filter_timer = QTimer(table_card)
+        self._appt_filter_timer.setSingleShot(True)
+        self._appt_filter_timer.setInterval(150)
+        self._appt_filter_timer.timeout.connect(self.filter_appointments)
+        self.appointment_search.textChanged.connect(self._appt_filter_timer.start)
+        search_layout.addWidget(QLabel("🔍"))
+        search_layout.addWidget(self.appointment_search)
+        search_layout.addStretch(1)
+        layout.addLayout(search_layout)
+
+        rows, self._appt_cache = self._appt_cache, None
+        self.appointments_model = AppointmentsModel(rows or [], loader=self._appointments_page)
+        # Search runs inside Qt: any column, case-insensitive, over the model's display strings
+        self.appointments_proxy = QSortFilterProxyModel()
+        self.appointments_proxy.setSourceModel(self.appointments_model)
+        self.appointments_model.setParent(self.appointments_proxy)
+        self.appointments_proxy.setFilterKeyColumn(-1)
+        self.appointments_proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        cancel_delegate = ButtonDelegate("Cancel", "#e53935", "#c62828", "icons/cancel.png")
+        cancel_delegate.clicked.connect(
+            lambda row: self.cancel_appointment(self.appointments_model.row(row)['id']))
+        layout.addWidget(_records_view(self.appointments_proxy, 4, cancel_delegate))
+        page_layout.addWidget(table_card)
+        if rows is None:
+            self._load_first_page(layout, self.appointments_model, self._APPT_PAGE_SQL, "appointments")
+
+    # id breaks ties so consecutive pages never overlap or skip a row
+    _APPT_PAGE_SQL = """
+        SELECT a.id, s.name as service, a.date, a.time, a.status, a.notes
+        FROM appointments a
+        JOIN services s ON a.service_id = s.id
+        WHERE a.patient_id = %s
+        ORDER BY a.date DESC, a.time DESC, a.id DESC
+        LIMIT %s OFFSET %s
+    """
+
+    def _appointments_page(self, offset, limit):
+        return self._query(self._APPT_PAGE_SQL, (self.patient_id, limit, offset), fetch=True)
+
+    def filter_appointments(self):
+        self.appointments_proxy.setFilterFixedString(self.appointment_search.text().strip())
+
+    def cancel_appointment(self, appointment_id):
+        try:
+            reply = QMessageBox.question(
+                self, "Confirm", "Cancel this appointment?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.Yes:
+                self._query(
+                    "UPDATE appointments SET status='Cancelled' WHERE id=%s",
+                    (appointment_id,), commit=True
+                )
+                QMessageBox.information(self, "Cancelled", "Appointment cancelled.")
+                # The list is patched in place instead of re-queried; only home needs a rebuild
+                self.appointments_model.set_status(appointment_id, "Cancelled")
+                _HOME_CACHE.pop(self.patient_id)
+                self.invalidate("home")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to cancel appointment: {e}")
+
+    def show_services(self, page_layout):
+        services_card = QFrame()
+        services_card.setStyleSheet("QFrame { background:white; border-radius:10px; border:1px solid #d8eafd; }" + SHADOW_QSS)
+        services_card.setProperty("shadow", "light")
+        layout = QVBoxLayout(services_card)
+        layout.setContentsMargins(22, 18, 22, 18)
+        header_layout = QHBoxLayout()
+        header = QLabel("Services Catalog")
+        header.setFont(cached_font("Segoe UI", 16, QFont.Weight.Bold))
+        header.setStyleSheet("border: none;")
+        header_layout.addWidget(header)
+        header_layout.addStretch(1)
+        search_bar = QLineEdit()
+        search_bar.setPlaceholderText("Search services...")
+        search_bar.setFixedWidth(150)
+        search_bar.setStyleSheet("""
+            QLineEdit { padding: 8px; border: 1px solid #d8eafd; border-radius: 8px; background: #f8fbfd; }
+        """)
+        # Coalesce a burst of keystrokes into one query/rebuild, fired 200 ms after the last one
+        self._svc_filter_timer = QTimer(services_card)
+        self._svc_filter_timer.setSingleShot(True)
+        self._svc_filter_timer.setInterval(200)
+        self._svc_filter_timer.timeout.connect(lambda: self.populate_services(self._pending_svc_text))
+        search_bar.textChanged.connect(self.filter_services)
+        header_layout.addWidget(search_bar)
+        layout.addLayout(header_layout)
+
+        self._services_loading = QLabel("Loading services…")  # until the catalog is cached
+        self._services_loading.setStyleSheet("color: #6b7280; border: none;")
+        layout.addWidget(self._services_loading)
+
+        # One painted card per model row: filtering swaps the model's rows, no widgets are built
+        self.services_model = ServicesModel([])
+        delegate = ServiceCardDelegate()
+        delegate.book.connect(lambda row: self.on_service_book(self.services_model.row(row)))
+        view = QListView()
+        self.services_model.setParent(view)
+        delegate.setParent(view)
+        view.setModel(self.services_model)
+        view.setItemDelegate(delegate)
+        view.setViewMode(QListView.ViewMode.IconMode)
+        view.setResizeMode(QListView.ResizeMode.Adjust)
+        view.setMovement(QListView.Movement.Static)
+        view.setSpacing(10)
+        view.setUniformItemSizes(True)
+        view.setMouseTracking(True)  # hover state for the painted Book Now buttons
+        view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        view.setStyleSheet("QListView { background: transparent; border: none; }")
+        layout.addWidget(view)
+        page_layout.addWidget(services_card)
+
+        self._pending_svc_text = ""
+        self.populate_services("")
+        if self._services_cache is None:
+            fetch(self._SERVICES_SQL, None, self._on_services_loaded,
+                  lambda err: QMessageBox.critical(self, "Error", f"Failed to load services: {err}"))
+
+    def _on_services_loaded(self, rows):
+        self._services_cache = rows
+        if "services" in self._sections:
+            self.populate_services(self._pending_svc_text)
+
+    def populate_services(self, search_text):
+        if self._services_cache is None:
+            return  # show_services has the catalog on its way
+        self._services_loading.hide()
+        q = search_text.lower()
+        self.services_model.set_rows([r for r in self._services_cache if q in r['name'].lower()])
+
+    _SERVICES_SQL = "SELECT id, name, description, price FROM services ORDER BY name ASC"
+
+    def invalidate_services_cache(self):
+        """Forget the catalog (e.g. after it was edited) so the services page reloads it."""
+        self._services_cache = None
+        self.invalidate("services")
+
+    def filter_services(self, text):
+        self._pending_svc_text = text.strip()
+        self._svc_filter_timer.start()
+
+    def on_service_book(self, service_row):
+        dlg = BookingDialog(self.patient_id, service=service_row, parent=self)
+        if dlg.exec():
+            self.appointments_changed()
+            self.switch_section("my_appointments")
+
+    def show_transaction(self, page_layout):
+        trans_card = QFrame()
+        trans_card.setStyleSheet("QFrame { background:white; border-radius:10px; border:1px solid #d8eafd; }" + SHADOW_QSS)
+        trans_card.setProperty("shadow", "light")
+        layout = QVBoxLayout(trans_card)
+        layout.setContentsMargins(22, 18, 22, 18)
+        header = QLabel("Transactions")
+        header.setFont(cached_font("Segoe UI", 16, QFont.Weight.Bold))
+        header.setStyleSheet("border: none;")
+        layout.addWidget(header)
+
+        rows, self._tx_cache = self._tx_cache, None
+        self.transactions_model = TransactionsModel(rows or [], loader=self._transactions_page)
+        receipt_delegate = ButtonDelegate("Print Receipt", "#4caf50", "#388e3c", "icons/print.png")
+        receipt_delegate.clicked.connect(
+            lambda row: self.generate_receipt(self.transactions_model.row(row)))
+        layout.addWidget(_records_view(self.transactions_model, 3, receipt_delegate))
+        page_layout.addWidget(trans_card)
+        if rows is None:
+            self._load_first_page(layout, self.transactions_model, self._TX_PAGE_SQL, "transactions")
+
+    _TX_PAGE_SQL = """
+        SELECT s.name as service, t.paid_at as paid, t.amount, t.id
+        FROM transactions t
+        JOIN services s ON t.service_id = s.id
+        WHERE t.patient_id = %s
+        ORDER BY t.paid_at DESC, t.id DESC
+        LIMIT %s OFFSET %s
+    """
+
+    def _transactions_page(self, offset, limit):
+        return self._query(self._TX_PAGE_SQL, (self.patient_id, limit, offset), fetch=True)
+
+    def _load_first_page(self, layout, model, sql, what):
+        """Fill `model` with its first page from a worker thread while the empty table is already on
+        screen. The result goes straight to the model's own slot, which Qt disconnects if the page
+        is dropped first; later pages are small enough to fetch inline as the table scrolls."""
+        loading = QLabel(f"Loading {what}…")
+        loading.setStyleSheet("color: #6b7280; border: none;")
+        layout.insertWidget(layout.count() - 1, loading)
+        model.modelReset.connect(loading.hide)
+        fetch(sql, (self.patient_id, model.PAGE + 1, 0), model.set_rows,
+              lambda err: QMessageBox.critical(self, "Error", f"Failed to load {what}: {err}"))
+
+    def generate_receipt(self, transaction):
+        filename = f"receipt_{transaction['id']}.pdf"
+        run_task(partial(self._write_receipt, transaction, self.patient_name, filename),
+                 self._on_receipt_written,
+                 lambda err: QMessageBox.critical(self, "Error", f"Failed to generate receipt: {err}"))
+
+    @staticmethod
+    def _write_receipt(transaction, patient_name, filename):
+        """Render the receipt PDF; runs on a worker thread so the dashboard stays responsive."""
+        # reportlab is only needed here, so it is not loaded until the first receipt is printed
+        from reportlab.pdfgen import canvas
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.units import inch
+
+        c = canvas.Canvas(filename, pagesize=letter)
+        width, height = letter
+        # one text object with a fixed leading instead of a positioned drawString per line
+        text = c.beginText(inch, height - inch)
+        text.setFont("Helvetica", 12, leading=0.5 * inch)
+        text.textLines([
+            "PureDent Clinic Receipt",
+            f"Transaction ID: {transaction['id']}",
+            f"Service: {transaction['service']}",
+            f"Date Paid: {transaction['paid']}",
+            f"Amount: ₱{float(transaction['amount']):,.2f}",
+            f"Patient: {patient_name}",
+        ])
+        c.drawText(text)
+        c.save()
+        return filename
+
+    def _on_receipt_written(self, filename):
+        # Hands the file to the platform viewer and returns straight away
+        if not QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.abspath(filename))):
+            QMessageBox.critical(self, "Error", f"Failed to open receipt: {filename}")
+            return
+        QMessageBox.information(self, "Receipt Generated", f"Receipt saved as {filename}")
+
+    @staticmethod
+    def _home_bundle(db, patient_id):
+        """Fetch everything the home page shows (next visit + confirmed count, completed list,
+        calendar dates) in a single multi-statement round trip. Runs on a worker thread.
+        Rows come back as tuples, so each column below is read by its SELECT position."""
+        pid = (patient_id,)
+        today = QDate.currentDate()
+        month_range = AppointmentCalendar.visible_range(today.year(), today.month())
+        # The confirmed count rides along as a scalar subquery on the next-visit row; the LEFT JOIN
+        # keeps that one row even when nothing is upcoming (date/time/service are then NULL)
+        summary, completed, dates = db.query_many([
+            ("""
+             SELECT (SELECT COUNT(*) FROM appointments WHERE patient_id=%s AND status='Confirmed') AS confirmed,
+                    n.date, n.time, n.service
+             FROM (SELECT 1) AS one
+             LEFT JOIN (
+                 SELECT a.date, a.time, s.name as service
+                 FROM appointments a
+                 JOIN services s ON a.service_id = s.id
+                 WHERE a.patient_id = %s
+                 AND a.date >= CURDATE()
+                 ORDER BY a.date ASC, a.time ASC LIMIT 1
+             ) AS n ON TRUE
+             """, pid + pid),
+            ("""
+             SELECT s.name as service, a.date, a.time
+             FROM appointments a
+             JOIN services s ON a.service_id = s.id
+             WHERE a.patient_id = %s
+             AND a.status = 'Completed'
+             ORDER BY a.date DESC, a.time DESC
+             LIMIT 50
+             """, pid),
+            (AppointmentCalendar.DATES_SQL, pid + month_range),
+        ], dictionary=False)
+
+        confirmed, nxt_date, nxt_time, nxt_service = summary[0]
+        return {
+            "next": {"when": f"{nxt_date} {str(nxt_time)}", "service": nxt_service} if nxt_date else None,
+            "completed": completed,  # (service, date, time)
+            "confirmed": confirmed,
+            "dates": set(QDate.fromString(str(d), "yyyy-MM-dd") for d, in dates),
+        }
+
+    def _query(self, sql, params=None, **kwargs):
+        """db.query on the dashboard's held connection (GUI thread only; workers use their own),
+        reopening it once if the server dropped it while the dashboard sat idle."""
+        if self._db is None:
+            self._db = DB()
+        try:
+            return self._db.query(sql, params, **kwargs)
+        except ConnectionLost:
+            self._db.close()
+            self._db = DB()
+            return self._db.query(sql, params, **kwargs)
+
+    def closeEvent(self, ev):
+        # logout() ends up here too; hand the held connection back to the pool
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        super().closeEvent(ev)
+
+    def logout(self):
+        if self.portal_parent:
+            self.portal_parent.show()
         self.close()
\ No newline at end of file
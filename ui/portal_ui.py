@@ -1,720 +1,626 @@
-# ------------------ LIBRARY IMPORTS ------------------
-from PyQt6.QtWidgets import (
-    QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout,
-    QFrame, QApplication, QGraphicsDropShadowEffect, QMessageBox, QComboBox
-)
-from PyQt6.QtGui import QFont, QColor, QIntValidator
-from PyQt6.QtCore import Qt
-import logging
-
-from db import DB, check_password, hash_password
-
-from ui.staff_dashboard import StaffDashboard
-from ui.patient_dashboard import PatientDashboard
-logging.basicConfig(level=logging.DEBUG, filename='app.log', format='%(asctime)s - %(levelname)s - %(message)s')
-
-class ClinicPortal(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("PureDent Clinic Portal")
-        self.setFixedSize(600, 680)
-        self.center_window()
-        self.setup_ui()
-
-    def center_window(self):
-        screen = QApplication.primaryScreen().availableGeometry()
-        size = self.geometry()
-        self.move(
-            (screen.width() - size.width()) // 2,
-            (screen.height() - size.height()) // 2
-        )
-
-    # ------------------------------------------------------
-    # Method: setup_ui()
-    def setup_ui(self):
-        self.setStyleSheet("background-color: #e6f0f5;")
-
-        self.main_layout = QHBoxLayout(self)
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
-        self.main_layout.setSpacing(0)
-
-        # ---------------- LEFT PANEL ----------------
-        self.left_panel = QFrame()
-        self.left_panel.setFixedWidth(200)
-        self.left_panel.setStyleSheet("""
-            QFrame {
-                background-color: qlineargradient(
-                    x1:0, y1:0, x1:0, y1:0,
-                    stop:0 #0288d1, stop:1 #01579b
-                );
-                border-top-left-radius: 25px;
-                border-bottom-left-radius: 25px;
-            }
-        """)
-
-        # Left side branding (logo and clinic name)
-        left_layout = QVBoxLayout(self.left_panel)
-        left_layout.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignHCenter)
-        left_layout.setContentsMargins(20, 20, 20, 20)
-
-        logo = QLabel("🦷")
-        logo.setFont(QFont("Segoe UI Emoji", 80))
-        logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        logo.setStyleSheet("color: white; margin-bottom: 15px;")
-        left_layout.addWidget(logo)
-
-        clinic_name = QLabel("PureDent")
-        clinic_name.setFont(QFont("Segoe UI", 28, QFont.Weight.Bold))
-        clinic_name.setStyleSheet("color: white;")
-        clinic_name.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        left_layout.addWidget(clinic_name)
-
-        sub = QLabel("Clinic Portal")
-        sub.setFont(QFont("Segoe UI", 16))
-        sub.setStyleSheet("color: rgba(255, 255, 255, 0.8); margin-top: -5px;")
-        sub.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        left_layout.addWidget(sub)
-
-        left_layout.addStretch()
-        self.main_layout.addWidget(self.left_panel)
-
-        # ---------------- RIGHT PANEL ----------------
-        self.right_panel = QFrame()
-        right_layout = QVBoxLayout(self.right_panel)
-        right_layout.setContentsMargins(50, 60, 50, 50)  # Increased margins
-        right_layout.setSpacing(20)
-        right_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        # Create all cards
-        self.login_card = self.create_login_card()
-        self.register_step1 = self.create_register_step1()
-        self.register_step2 = self.create_register_step2()
-        self.success_card = self.create_success_card()
-
-        # Show login by default
-        for c in [self.register_step1, self.register_step2, self.success_card]:
-            c.setVisible(False)
-
-        right_layout.addWidget(self.login_card)
-        right_layout.addWidget(self.register_step1)
-        right_layout.addWidget(self.register_step2)
-        right_layout.addWidget(self.success_card)
-        self.main_layout.addWidget(self.right_panel)
-
-    # LOGIN CARD
-    # Displays email/password fields and login buttons
-    # ------------------------------------------------------
-    def create_login_card(self):
-        card = self.create_card_frame()
-        layout = QVBoxLayout(card)
-        layout.setContentsMargins(30, 30, 30, 30)
-        layout.setSpacing(18)
-
-        title = QLabel("Welcome Back")
-        title.setFont(QFont("Segoe UI", 22, QFont.Weight.Bold))
-        title.setStyleSheet("color: #01579b;")  # Darker blue for title
-        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(title)
-
-        subtitle = QLabel("Sign in to access your account")
-        subtitle.setFont(QFont("Segoe UI", 12))
-        subtitle.setStyleSheet("color: #37474f;")  # Softer gray
-        subtitle.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(subtitle)
-
-        layout.addSpacing(10)
-
-        # --- Email Field ---
-        layout.addWidget(self.create_label("Email"))
-        self.login_email = self.create_input("Enter your email")
-        layout.addWidget(self.login_email)
-
-        # --- Password Field ---
-        layout.addWidget(self.create_label("Password"))
-        self.login_password = self.create_input("Enter your password", password=True)
-        layout.addWidget(self.login_password)
-
-        # --- Buttons ---
-        self.login_btn = QPushButton("Sign In")
-        self.login_btn.setMinimumHeight(45)
-        self.login_btn.setStyleSheet(self.button_style("#0288d1", "#01579b"))
-        self.login_btn.clicked.connect(self.login_action)
-        layout.addWidget(self.login_btn)
-
-        self.goto_register_btn = QPushButton("Create Account")
-        self.goto_register_btn.setMinimumHeight(45)
-        self.goto_register_btn.setStyleSheet(self.button_style("#4fc3f7", "#0288d1"))
-        self.goto_register_btn.clicked.connect(self.show_register_step1)
-        layout.addWidget(self.goto_register_btn)
-
-        return card
-
-    # REGISTRATION STEP 1
-    # Collects personal details (Name, Age, Sex, Email)
-    # ------------------------------------------------------
-    def create_register_step1(self):
-        card = self.create_card_frame()
-        layout = QVBoxLayout(card)
-        layout.setContentsMargins(30, 30, 30, 30)
-        layout.setSpacing(15)
-
-        title = QLabel("Create Account")
-        title.setFont(QFont("Segoe UI", 22, QFont.Weight.Bold))
-        title.setStyleSheet("color: #01579b;")
-        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(title)
-
-        subtitle = QLabel("Personal Details")
-        subtitle.setFont(QFont("Segoe UI", 12))
-        subtitle.setStyleSheet("color: #37474f;")
-        subtitle.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(subtitle)
-
-        # --- Full Name Field ---
-        layout.addWidget(self.create_label("Full Name"))
-        self.reg_name = self.create_input("Enter your full name")
-        layout.addWidget(self.reg_name)
-
-        # --- Age and Sex Fields (side by side) ---
-        row = QHBoxLayout()
-        row.setSpacing(15)
-
-        # AGE FIELD
-        age_layout = QVBoxLayout()
-        age_layout.addWidget(self.create_label("Age"))
-        self.reg_age = self.create_input("Enter age")
-        self.reg_age.setFixedWidth(120)
-        self.reg_age.setMaxLength(3)
-        self.reg_age.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.reg_age.setValidator(QIntValidator(1, 120))
-        age_layout.addWidget(self.reg_age)
-        row.addLayout(age_layout)
-
-        # SEX DROPDOWN
-        sex_layout = QVBoxLayout()
-        sex_layout.addWidget(self.create_label("Sex"))
-        self.reg_sex = QComboBox()
-        self.reg_sex.addItems(["Male", "Female", "Other"])
-        self.reg_sex.setFixedWidth(120)
-        self.reg_sex.setStyleSheet("""
-            QComboBox {
-                background-color: #ffffff;
-                border: 1px solid #bbdefb;
-                border-radius: 10px;
-                min-height: 40px;
-                padding-left: 12px;
-                color: #263238;
-                font-size: 12pt;
-                transition: all 0.2s ease;
-            }
-            QComboBox QAbstractItemView {
-                background-color: black;
-                selection-background-color: #4fc3f7;
-                selection-color: #ffffff;
-                border: none;
-            }
-            QComboBox:focus, QComboBox::drop-down {
-                border: 2px solid #0288d1;
-                background-color: #e3f2fd;
-            }
-        """)
-        sex_layout.addWidget(self.reg_sex)
-        row.addLayout(sex_layout)
-        layout.addLayout(row)
-
-        # --- Email Field ---
-        layout.addWidget(self.create_label("Email"))
-        self.reg_email = self.create_input("Enter your email")
-        layout.addWidget(self.reg_email)
-
-        # --- Buttons ---
-        next_btn = QPushButton("Next Step")
-        next_btn.setStyleSheet(self.button_style("#4fc3f7", "#0288d1"))
-        next_btn.setMinimumHeight(45)
-        next_btn.clicked.connect(self.show_register_step2)
-        layout.addWidget(next_btn)
-
-        back_btn = QPushButton("Back to Login")
-        back_btn.setStyleSheet(self.button_style("#0288d1", "#01579b"))
-        back_btn.setMinimumHeight(45)
-        back_btn.clicked.connect(self.show_login)
-        layout.addWidget(back_btn)
-
-        return card
-
-    # REGISTRATION STEP 2
-    # Sets up user password and confirmation
-    # ------------------------------------------------------
-    def create_register_step2(self):
-        card = self.create_card_frame()
-        layout = QVBoxLayout(card)
-        layout.setContentsMargins(30, 30, 30, 30)
-        layout.setSpacing(15)
-
-        title = QLabel("Set Password")
-        title.setFont(QFont("Segoe UI", 22, QFont.Weight.Bold))
-        title.setStyleSheet("color: #01579b;")
-        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(title)
-
-        subtitle = QLabel("Account Security")
-        subtitle.setFont(QFont("Segoe UI", 12))
-        subtitle.setStyleSheet("color: #37474f;")
-        subtitle.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(subtitle)
-
-        # Password Fields
-        layout.addWidget(self.create_label("Password"))
-        self.reg_password = self.create_input("Enter password", password=True)
-        layout.addWidget(self.reg_password)
-
-        layout.addWidget(self.create_label("Confirm Password"))
-        self.reg_confirm = self.create_input("Confirm password", password=True)
-        layout.addWidget(self.reg_confirm)
-
-        # Buttons
-        reg_btn = QPushButton("Complete Registration")
-        reg_btn.setStyleSheet(self.button_style("#0288d1", "#01579b"))
-        reg_btn.setMinimumHeight(45)
-        reg_btn.clicked.connect(self.register_action)
-        layout.addWidget(reg_btn)
-
-        back_btn = QPushButton("Back")
-        back_btn.setStyleSheet(self.button_style("#4fc3f7", "#0288d1"))
-        back_btn.setMinimumHeight(45)
-        back_btn.clicked.connect(self.show_register_step1)
-        layout.addWidget(back_btn)
-
-        return card
-
-    def create_success_card(self):
-        card = self.create_card_frame()
-        layout = QVBoxLayout(card)
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.setContentsMargins(30, 30, 30, 30)
-        layout.setSpacing(20)
-
-        check_icon = QLabel("✅")
-        check_icon.setFont(QFont("Segoe UI Emoji", 70))
-        check_icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(check_icon)
-
-        msg = QLabel("Registration Successful!")
-        msg.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
-        msg.setStyleSheet("color: #01579b;")
-        msg.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(msg)
-
-        sub_msg = QLabel("You can now sign in to your account")
-        sub_msg.setFont(QFont("Segoe UI", 12))
-        sub_msg.setStyleSheet("color: #37474f;")
-        sub_msg.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(sub_msg)
-
-        back_btn = QPushButton("Back to Login")
-        back_btn.setStyleSheet(self.button_style("#4fc3f7", "#0288d1"))
-        back_btn.setMinimumHeight(45)
-        back_btn.clicked.connect(self.show_login)
-        layout.addWidget(back_btn)
-
-        return card
-
-    # UI HELPER FUNCTIONS (Reusable elements)
-    # ------------------------------------------------------
-    def create_card_frame(self):
-        """Creates a white rounded card with shadow (used for all content panels)."""
-        card = QFrame()
-        card.setStyleSheet("""
-            QFrame {
-                background-color: #ffffff;
-                border-radius: 20px;
-                transition: all 0.3s ease;
-            }
-        """)
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(30)
-        shadow.setYOffset(5)
-        shadow.setXOffset(0)
-        shadow.setColor(QColor(0, 0, 0, 60))
-        card.setGraphicsEffect(shadow)
-        return card
-
-    def create_label(self, text):
-        """Creates a label for form field titles."""
-        lbl = QLabel(text)
-        lbl.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
-        lbl.setStyleSheet("color: #263238; margin-bottom: 5px;")
-        return lbl
-
-    def create_input(self, placeholder="", password=False):
-        """Creates a styled input box for text or password."""
-        field = QLineEdit()
-        field.setPlaceholderText(placeholder)
-        field.setMinimumHeight(42)
-        field.setStyleSheet("""
-            QLineEdit {
-                background-color: #ffffff;
-                border: 1px solid #bbdefb;
-                border-radius: 10px;
-                padding-left: 12px;
-                color: #263238;
-                font-size: 12pt;
-                transition: all 0.2s ease;
-            }
-            QLineEdit::placeholder {
-                color: #78909c;
-                font-weight: normal;
-            }
-            QLineEdit:focus {
-                border: 2px solid #0288d1;
-                background-color: #e3f2fd;
-            }
-        """)
-        if password:
-            field.setEchoMode(QLineEdit.EchoMode.Password)
-        return field
-
-    def button_style(self, bg, hover):
-        """Returns consistent button style (normal and hover colors)."""
-        return f"""
-            QPushButton {{
-                background-color: {bg};
-                color: white;
-                font-weight: bold;
-                border-radius: 12px;
-                font-size: 14px;
-                min-height: 45px;
-                transition: all 0.2s ease;
-            }}
-            QPushButton:hover {{
-                background-color: {hover};
-                transform: scale(1.02);
-            }}
-            QPushButton:pressed {{
-                background-color: {hover};
-                transform: scale(0.98);
-            }}
-        """
-
-    # CARD NAVIGATION (switch between screens)
-    # ------------------------------------------------------
-    def show_login(self):
-        for c in [self.register_step1, self.register_step2, self.success_card]:
-            c.setVisible(False)
-        self.login_card.setVisible(True)
-
-    def show_register_step1(self):
-        for c in [self.login_card, self.register_step2, self.success_card]:
-            c.setVisible(False)
-        self.register_step1.setVisible(True)
-
-    def show_register_step2(self):
-        if not all([self.reg_name.text(), self.reg_age.text(), self.reg_email.text()]):
-            msg = QMessageBox()
-            msg.setWindowTitle("Error")
-            msg.setText("Please fill all fields before proceeding.")
-            msg.setStyleSheet("""
-                QMessageBox { 
-                    background-color: #ffffff; 
-                } 
-                QLabel { 
-                    color: #263238; 
-                }
-                QPushButton {
-                    background-color: #0288d1;
-                    color: white;
-                    border-radius: 8px;
-                    padding: 8px 16px;
-                }
-                QPushButton:hover {
-                    background-color: #01579b;
-                }
-            """)
-            msg.exec()
-            return
-        self.register_step1.setVisible(False)
-        self.register_step2.setVisible(True)
-
-    def show_success(self):
-        """Display success confirmation card."""
-        for c in [self.login_card, self.register_step1, self.register_step2]:
-            c.setVisible(False)
-        self.success_card.setVisible(True)
-
-    # LOGIN AND REGISTRATION LOGIC
-    # --------------------------------------------
-    def login_action(self):
-        """
-        Handles login for both staff and patients.
-        Validates credentials and redirects to the correct dashboard.
-        """
-        email = self.login_email.text().strip()
-        pw = self.login_password.text().strip()
-
-        if not email or not pw:
-            msg = QMessageBox()
-            msg.setWindowTitle("Login")
-            msg.setText("Enter email and password.")
-            msg.setStyleSheet("""
-                QMessageBox { 
-                    background-color: #ffffff; 
-                } 
-                QLabel { 
-                    color: #263238; 
-                }
-                QPushButton {
-                    background-color: #0288d1;
-                    color: white;
-                    border-radius: 8px;
-                    padding: 8px 16px;
-                }
-                QPushButton:hover {
-                    background-color: #01579b;
-                }
-            """)
-            msg.exec()
-            return
-
-        db = DB()
-        try:
-            # --- Staff login ---
-            staff = db.query("SELECT * FROM staff WHERE email=%s", (email,))
-            if staff and check_password(pw, staff[0]["password"]):
-                db.close()
-                self.hide()
-                self.staff_win = StaffDashboard(staff[0]["id"], staff[0]["name"])
-                self.staff_win.show()
-                return
-
-            # --- Patient login ---
-            patient = db.query("SELECT * FROM patients WHERE email=%s", (email,))
-            if patient and check_password(pw, patient[0]["password"]):
-                db.close()
-                self.hide()
-                self.patient_win = PatientDashboard(patient[0]["id"], patient[0]["name"])
-                self.patient_win.show()
-                return
-
-            # --- Invalid credentials ---
-            msg = QMessageBox()
-            msg.setWindowTitle("Login")
-            msg.setText("Invalid credentials.")
-            msg.setStyleSheet("""
-                QMessageBox { 
-                    background-color: #ffffff; 
-                } 
-                QLabel { 
-                    color: #263238; 
-                }
-                QPushButton {
-                    background-color: #0288d1;
-                    color: white;
-                    border-radius: 8px;
-                    padding: 8px 16px;
-                }
-                QPushButton:hover {
-                    background-color: #01579b;
-                }
-            """)
-            msg.exec()
-        except Exception as e:
-            logging.error(f"Login failed: {str(e)}", exc_info=True)
-            msg = QMessageBox()
-            msg.setWindowTitle("Error")
-            msg.setText(f"Login failed: {str(e)}")
-            msg.setStyleSheet("""
-                QMessageBox { 
-                    background-color: #ffffff; 
-                } 
-                QLabel { 
-                    color: #263238; 
-                }
-                QPushButton {
-                    background-color: #0288d1;
-                    color: white;
-                    border-radius: 8px;
-                    padding: 8px 16px;
-                }
-                QPushButton:hover {
-                    background-color: #01579b;
-                }
-            """)
-            msg.exec()
-        finally:
-            db.close()
-
-    def register_action(self):
-        """
-        Handles patient registration.
-        1. Validates inputs.
-        2. Checks for existing email.
-        3. Hashes password and saves to database.
-        """
-        logging.debug("Starting registration process")
-        name = self.reg_name.text().strip()
-        age = self.reg_age.text().strip()
-        sex = self.reg_sex.currentText()
-        email = self.reg_email.text().strip()
-        pw = self.reg_password.text().strip()
-        confirm = self.reg_confirm.text().strip()
-
-        # Input validation
-        if not all([name, email, pw, confirm]):
-            logging.warning("Registration failed: Missing required fields")
-            msg = QMessageBox()
-            msg.setWindowTitle("Error")
-            msg.setText("Please fill all required fields.")
-            msg.setStyleSheet("""
-                QMessageBox { 
-                    background-color: #ffffff; 
-                } 
-                QLabel { 
-                    color: #263238; 
-                }
-                QPushButton {
-                    background-color: #0288d1;
-                    color: white;
-                    border-radius: 8px;
-                    padding: 8px 16px;
-                }
-                QPushButton:hover {
-                    background-color: #01579b;
-                }
-            """)
-            msg.exec()
-            return
-        if pw != confirm:
-            logging.warning("Registration failed: Passwords do not match")
-            msg = QMessageBox()
-            msg.setWindowTitle("Error")
-            msg.setText("Passwords do not match.")
-            msg.setStyleSheet("""
-                QMessageBox { 
-                    background-color: #ffffff; 
-                } 
-                QLabel { 
-                    color: #263238; 
-                }
-                QPushButton {
-                    background-color: #0288d1;
-                    color: white;
-                    border-radius: 8px;
-                    padding: 8px 16px;
-                }
-                QPushButton:hover {
-                    background-color: #01579b;
-                }
-            """)
-            msg.exec()
-            return
-        if not age.isdigit() or not (1 <= int(age) <= 120):
-            logging.warning("Registration failed: Invalid age")
-            msg = QMessageBox()
-            msg.setWindowTitle("Error")
-            msg.setText("Please enter a valid age between 1 and 120.")
-            msg.setStyleSheet("""
-                QMessageBox { 
-                    background-color: #ffffff; 
-                } 
-                QLabel { 
-                    color: #263238; 
-                }
-                QPushButton {
-                    background-color: #0288d1;
-                    color: white;
-                    border-radius: 8px;
-                    padding: 8px 16px;
-                }
-                QPushButton:hover {
-                    background-color: #01579b;
-                }
-            """)
-            msg.exec()
-            return
-
-        db = DB()
-        try:
-            logging.debug(f"Checking if email {email} exists")
-            exists = db.query("SELECT id FROM patients WHERE email=%s", (email,))
-            if exists:
-                logging.warning(f"Registration failed: Email {email} already registered")
-                msg = QMessageBox()
-                msg.setWindowTitle("Error")
-                msg.setText("Email already registered.")
-                msg.setStyleSheet("""
-                    QMessageBox { 
-                        background-color: #ffffff; 
-                    } 
-                    QLabel { 
-                        color: #263238; 
-                    }
-                    QPushButton {
-                        background-color: #0288d1;
-                        color: white;
-                        border-radius: 8px;
-                        padding: 8px 16px;
-                    }
-                    QPushButton:hover {
-                        background-color: #01579b;
-                    }
-                """)
-                msg.exec()
-                return
-
-            logging.debug("Hashing password")
-            hashed_pw = hash_password(pw)
-            age_value = int(age) if age else None
-            logging.debug(f"Inserting patient: name={name}, age={age_value}, sex={sex}, email={email}")
-            db.query(
-                "INSERT INTO patients (name, age, sex, email, password) VALUES (%s, %s, %s, %s, %s)",
-                (name, age_value, sex, email, hashed_pw),
-                commit=True
-            )
-            logging.info("Registration successful")
-            msg = QMessageBox()
-            msg.setWindowTitle("Success")
-            msg.setText("Registration completed successfully.")
-            msg.setStyleSheet("""
-                QMessageBox { 
-                    background-color: #ffffff; 
-                } 
-                QLabel { 
-                    color: #263238; 
-                }
-                QPushButton {
-                    background-color: #0288d1;
-                    color: white;
-                    border-radius: 8px;
-                    padding: 8px 16px;
-                }
-                QPushButton:hover {
-                    background-color: #01579b;
-                }
-            """)
-            msg.exec()
-            self.show_success()
-        except Exception as e:
-            logging.error(f"Registration failed: {str(e)}", exc_info=True)
-            msg = QMessageBox()
-            msg.setWindowTitle("Error")
-            msg.setText(f"Registration failed: {str(e)}")
-            msg.setStyleSheet("""
-                QMessageBox { 
-                    background-color: #ffffff; 
-                } 
-                QLabel { 
-                    color: #263238; 
-                }
-                QPushButton {
-                    background-color: #0288d1;
-                    color: white;
-                    border-radius: 8px;
-                    padding: 8px 16px;
-                }
-                QPushButton:hover {
-                    background-color: #01579b;
-                }
-            """)
-            msg.exec()
-        finally:
-            db.close()
\ No newline at end of file
+# ------------------ LIBRARY IMPORTS ------------------
+from PyQt6.QtWidgets import (
+    QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout,
+    QFrame, QApplication, QMessageBox, QComboBox, QStackedWidget
+)
+from PyQt6.QtGui import QFont, QFontMetrics, QIntValidator, QPainter, QPixmap
+from PyQt6.QtCore import Qt, QRect
+from functools import lru_cache
+import logging
+
+from db import DB, ConnectionLost, is_duplicate_key, check_password, hash_password
+from ui.styles import SHADOW_QSS, cached_font
+from ui.workers import submit
+
+# Enum members used throughout setup_ui, resolved once instead of on every widget
+ALIGN_CENTER = Qt.AlignmentFlag.AlignCenter
+ALIGN_TOP_HCENTER = Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignHCenter
+FONT_BOLD = QFont.Weight.Bold
+ECHO_PASSWORD = QLineEdit.EchoMode.Password
+
+
+@lru_cache(maxsize=8)
+def _emoji_pixmap(text, size):
+    """Rasterise a colour-emoji glyph once; the label then just blits the pixmap on every repaint
+    instead of shaping and rendering the glyph at this point size each time."""
+    font = cached_font("Segoe UI Emoji", size)
+    metrics = QFontMetrics(font)
+    w, h = metrics.horizontalAdvance(text), metrics.height()
+    ratio = QApplication.primaryScreen().devicePixelRatio()
+    pix = QPixmap(round(w * ratio), round(h * ratio))
+    pix.setDevicePixelRatio(ratio)
+    pix.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pix)
+    painter.setFont(font)
+    painter.drawText(QRect(0, 0, w, h), ALIGN_CENTER, text)
+    painter.end()
+    return pix
+
+# The whole portal is styled by this one sheet, set once on the window, instead of a sheet per
+# widget. Widgets pick their rules through objectName / dynamic-property selectors; where two
+# rules of equal specificity overlap, the later one wins, so the combo box comes after the card.
+_PORTAL_QSS = """
+    * { background-color: #e6f0f5; }
+
+    QFrame#leftPanel, QFrame#leftPanel QFrame {
+        background-color: qlineargradient(
+            x1:0, y1:0, x1:0, y1:0,
+            stop:0 #0288d1, stop:1 #01579b
+        );
+        border-top-left-radius: 25px;
+        border-bottom-left-radius: 25px;
+    }
+    QLabel#brandLogo { color: white; margin-bottom: 15px; }
+    QLabel#brandName { color: white; }
+    QLabel#brandSub { color: rgba(255, 255, 255, 0.8); margin-top: -5px; }
+
+    QFrame#card, QFrame#card QFrame {
+        background-color: #ffffff;
+        border-radius: 20px;
+    }
+""" + SHADOW_QSS + """
+    QFrame#card[shadow] { border-radius: 28px; }
+
+    QLabel[role="title"] { color: #01579b; }
+    QLabel[role="subtitle"] { color: #37474f; }
+    QLabel#formLabel { color: #263238; margin-bottom: 5px; }
+
+    QLineEdit#formInput {
+        background-color: #ffffff;
+        border: 1px solid #bbdefb;
+        border-radius: 10px;
+        padding-left: 12px;
+        color: #263238;
+        font-size: 12pt;
+    }
+    QLineEdit#formInput:focus {
+        border: 2px solid #0288d1;
+        background-color: #e3f2fd;
+    }
+
+    QComboBox#sexCombo {
+        background-color: #ffffff;
+        border: 1px solid #bbdefb;
+        border-radius: 10px;
+        min-height: 40px;
+        padding-left: 12px;
+        color: #263238;
+        font-size: 12pt;
+    }
+    QComboBox#sexCombo QAbstractItemView {
+        background-color: black;
+        selection-background-color: #4fc3f7;
+        selection-color: #ffffff;
+        border: none;
+    }
+    QComboBox#sexCombo:focus, QComboBox#sexCombo::drop-down {
+        border: 2px solid #0288d1;
+        background-color: #e3f2fd;
+    }
+
+    QPushButton[variant] {
+        color: white;
+        font-weight: bold;
+        border-radius: 12px;
+        font-size: 14px;
+        min-height: 45px;
+    }
+    QPushButton[variant="primary"] { background-color: #0288d1; }
+    QPushButton[variant="primary"]:hover { background-color: #01579b; }
+    QPushButton[variant="primary"]:pressed { background-color: #01579b; }
+    QPushButton[variant="secondary"] { background-color: #4fc3f7; }
+    QPushButton[variant="secondary"]:hover { background-color: #0288d1; }
+    QPushButton[variant="secondary"]:pressed { background-color: #0288d1; }
+"""
+
+class ClinicPortal(QWidget):
+    # One sheet shared by every message box instead of a fresh copy per popup
+    _MSG_QSS = """
+        QMessageBox { background-color: #ffffff; }
+        QLabel { color: #263238; }
+        QPushButton {
+            background-color: #0288d1;
+            color: white;
+            border-radius: 8px;
+            padding: 8px 16px;
+        }
+        QPushButton:hover { background-color: #01579b; }
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("PureDent Clinic Portal")
+        self.setFixedSize(600, 680)
+        self._db_ready = True
+        self._db = None  # held between login clicks, see _with_db()
+        # Configured here rather than at import so app.log is only opened once the portal is built
+        if not logging.getLogger().handlers:
+            logging.basicConfig(level=logging.INFO, filename='app.log', format='%(asctime)s - %(levelname)s - %(message)s')
+        self.center_window()
+        self.setup_ui()
+
+    def center_window(self):
+        screen = QApplication.primaryScreen().availableGeometry()
+        size = self.geometry()
+        self.move(
+            (screen.width() - size.width()) // 2,
+            (screen.height() - size.height()) // 2
+        )
+
+    # ------------------------------------------------------
+    # Method: setup_ui()
+    def setup_ui(self):
+        self.setStyleSheet(_PORTAL_QSS)
+
+        self.main_layout = QHBoxLayout(self)
+        self.main_layout.setContentsMargins(0, 0, 0, 0)
+        self.main_layout.setSpacing(0)
+
+        # ---------------- LEFT PANEL ----------------
+        self.left_panel = QFrame()
+        self.left_panel.setObjectName("leftPanel")
+        self.left_panel.setFixedWidth(200)
+        # The branding never changes, so only newly exposed areas need painting
+        self.left_panel.setAttribute(Qt.WidgetAttribute.WA_StaticContents, True)
+
+        # Left side branding (logo and clinic name)
+        left_layout = QVBoxLayout(self.left_panel)
+        left_layout.setAlignment(ALIGN_TOP_HCENTER)
+        left_layout.setContentsMargins(20, 20, 20, 20)
+
+        logo = QLabel()
+        logo.setPixmap(_emoji_pixmap("🦷", 80))
+        logo.setAlignment(ALIGN_CENTER)
+        logo.setObjectName("brandLogo")
+        left_layout.addWidget(logo)
+
+        clinic_name = QLabel("PureDent")
+        clinic_name.setFont(cached_font("Segoe UI", 28, FONT_BOLD))
+        clinic_name.setObjectName("brandName")
+        clinic_name.setAlignment(ALIGN_CENTER)
+        left_layout.addWidget(clinic_name)
+
+        sub = QLabel("Clinic Portal")
+        sub.setFont(cached_font("Segoe UI", 16))
+        sub.setObjectName("brandSub")
+        sub.setAlignment(ALIGN_CENTER)
+        left_layout.addWidget(sub)
+
+        left_layout.addStretch()
+        self.main_layout.addWidget(self.left_panel)
+
+        # ---------------- RIGHT PANEL ----------------
+        self.right_panel = QFrame()
+        right_layout = QVBoxLayout(self.right_panel)
+        right_layout.setContentsMargins(50, 60, 50, 50)  # Increased margins
+        right_layout.setSpacing(20)
+        right_layout.setAlignment(ALIGN_CENTER)
+
+        # Only the login card is built up front; the registration and success cards are
+        # built by _card() the first time the user navigates to them
+        self.login_card = self.create_login_card()
+        self.register_step1 = None
+        self.register_step2 = None
+        self.success_card = None
+        # One page shows at a time; switching is a single index change instead of hide/show loops
+        self.stack = QStackedWidget()
+        self.stack.addWidget(self.login_card)
+        right_layout.addWidget(self.stack)
+        self.main_layout.addWidget(self.right_panel)
+
+    # LOGIN CARD
+    # Displays email/password fields and login buttons
+    # ------------------------------------------------------
+    def create_login_card(self):
+        card = self.create_card_frame()
+        layout = QVBoxLayout(card)
+        layout.setContentsMargins(30, 30, 30, 30)
+        layout.setSpacing(18)
+
+        title = QLabel("Welcome Back")
+        title.setFont(cached_font("Segoe UI", 22, FONT_BOLD))
+        title.setProperty("role", "title")  # Darker blue for title
+        title.setAlignment(ALIGN_CENTER)
+        layout.addWidget(title)
+
+        subtitle = QLabel("Sign in to access your account")
+        subtitle.setFont(cached_font("Segoe UI", 12))
+        subtitle.setProperty("role", "subtitle")  # Softer gray
+        subtitle.setAlignment(ALIGN_CENTER)
+        layout.addWidget(subtitle)
+
+        layout.addSpacing(10)
+
+        # --- Email Field ---
+        layout.addWidget(self.create_label("Email"))
+        self.login_email = self.create_input("Enter your email")
+        layout.addWidget(self.login_email)
+
+        # --- Password Field ---
+        layout.addWidget(self.create_label("Password"))
+        self.login_password = self.create_input("Enter your password", password=True)
+        layout.addWidget(self.login_password)
+
+        # --- Buttons ---
+        self.login_btn = QPushButton("Sign In")
+        self.login_btn.setMinimumHeight(45)
+        self.login_btn.setProperty("variant", "primary")
+        self.login_btn.clicked.connect(self.login_action)
+        layout.addWidget(self.login_btn)
+
+        self.goto_register_btn = QPushButton("Create Account")
+        self.goto_register_btn.setMinimumHeight(45)
+        self.goto_register_btn.setProperty("variant", "secondary")
+        self.goto_register_btn.clicked.connect(self.show_register_step1)
+        layout.addWidget(self.goto_register_btn)
+
+        return card
+
+    # REGISTRATION STEP 1
+    # Collects personal details (Name, Age, Sex, Email)
+    # ------------------------------------------------------
+    def create_register_step1(self):
+        card = self.create_card_frame()
+        layout = QVBoxLayout(card)
+        layout.setContentsMargins(30, 30, 30, 30)
+        layout.setSpacing(15)
+
+        title = QLabel("Create Account")
+        title.setFont(cached_font("Segoe UI", 22, FONT_BOLD))
+        title.setProperty("role", "title")
+        title.setAlignment(ALIGN_CENTER)
+        layout.addWidget(title)
+
+        subtitle = QLabel("Personal Details")
+        subtitle.setFont(cached_font("Segoe UI", 12))
+        subtitle.setProperty("role", "subtitle")
+        subtitle.setAlignment(ALIGN_CENTER)
+        layout.addWidget(subtitle)
+
+        # --- Full Name Field ---
+        layout.addWidget(self.create_label("Full Name"))
+        self.reg_name = self.create_input("Enter your full name")
+        layout.addWidget(self.reg_name)
+
+        # --- Age and Sex Fields (side by side) ---
+        row = QHBoxLayout()
+        row.setSpacing(15)
+
+        # AGE FIELD
+        age_layout = QVBoxLayout()
+        age_layout.addWidget(self.create_label("Age"))
+        self.reg_age = self.create_input("Enter age")
+        self.reg_age.setFixedWidth(120)
+        self.reg_age.setMaxLength(3)
+        self.reg_age.setAlignment(ALIGN_CENTER)
+        self.reg_age.setValidator(QIntValidator(1, 120))
+        age_layout.addWidget(self.reg_age)
+        row.addLayout(age_layout)
+
+        # SEX DROPDOWN
+        sex_layout = QVBoxLayout()
+        sex_layout.addWidget(self.create_label("Sex"))
+        self.reg_sex = QComboBox()
+        self.reg_sex.addItems(["Male", "Female", "Other"])
+        self.reg_sex.setFixedWidth(120)
+        self.reg_sex.setObjectName("sexCombo")
+        sex_layout.addWidget(self.reg_sex)
+        row.addLayout(sex_layout)
+        layout.addLayout(row)
+
+        # --- Email Field ---
+        layout.addWidget(self.create_label("Email"))
+        self.reg_email = self.create_input("Enter your email")
+        layout.addWidget(self.reg_email)
+
+        # --- Buttons ---
+        next_btn = QPushButton("Next Step")
+        next_btn.setProperty("variant", "secondary")
+        next_btn.setMinimumHeight(45)
+        next_btn.clicked.connect(self.show_register_step2)
+        layout.addWidget(next_btn)
+
+        back_btn = QPushButton("Back to Login")
+        back_btn.setProperty("variant", "primary")
+        back_btn.setMinimumHeight(45)
+        back_btn.clicked.connect(self.show_login)
+        layout.addWidget(back_btn)
+
+        return card
+
+    # REGISTRATION STEP 2
+    # Sets up user password and confirmation
+    # ------------------------------------------------------
+    def create_register_step2(self):
+        card = self.create_card_frame()
+        layout = QVBoxLayout(card)
+        layout.setContentsMargins(30, 30, 30, 30)
+        layout.setSpacing(15)
+
+        title = QLabel("Set Password")
+        title.setFont(cached_font("Segoe UI", 22, FONT_BOLD))
+        title.setProperty("role", "title")
+        title.setAlignment(ALIGN_CENTER)
+        layout.addWidget(title)
+
+        subtitle = QLabel("Account Security")
+        subtitle.setFont(cached_font("Segoe UI", 12))
+        subtitle.setProperty("role", "subtitle")
+        subtitle.setAlignment(ALIGN_CENTER)
+        layout.addWidget(subtitle)
+
+        # Password Fields
+        layout.addWidget(self.create_label("Password"))
+        self.reg_password = self.create_input("Enter password", password=True)
+        layout.addWidget(self.reg_password)
+
+        layout.addWidget(self.create_label("Confirm Password"))
+        self.reg_confirm = self.create_input("Confirm password", password=True)
+        layout.addWidget(self.reg_confirm)
+
+        # Buttons
+        self.reg_btn = QPushButton("Complete Registration")
+        self.reg_btn.setProperty("variant", "primary")
+        self.reg_btn.setMinimumHeight(45)
+        self.reg_btn.clicked.connect(self.register_action)
+        self.reg_btn.setEnabled(self._db_ready)
+        layout.addWidget(self.reg_btn)
+
+        back_btn = QPushButton("Back")
+        back_btn.setProperty("variant", "secondary")
+        back_btn.setMinimumHeight(45)
+        back_btn.clicked.connect(self.show_register_step1)
+        layout.addWidget(back_btn)
+
+        return card
+
+    def create_success_card(self):
+        card = self.create_card_frame()
+        layout = QVBoxLayout(card)
+        layout.setAlignment(ALIGN_CENTER)
+        layout.setContentsMargins(30, 30, 30, 30)
+        layout.setSpacing(20)
+
+        check_icon = QLabel()
+        check_icon.setPixmap(_emoji_pixmap("✅", 70))
+        check_icon.setAlignment(ALIGN_CENTER)
+        layout.addWidget(check_icon)
+
+        msg = QLabel("Registration Successful!")
+        msg.setFont(cached_font("Segoe UI", 16, FONT_BOLD))
+        msg.setProperty("role", "title")
+        msg.setAlignment(ALIGN_CENTER)
+        layout.addWidget(msg)
+
+        sub_msg = QLabel("You can now sign in to your account")
+        sub_msg.setFont(cached_font("Segoe UI", 12))
+        sub_msg.setProperty("role", "subtitle")
+        sub_msg.setAlignment(ALIGN_CENTER)
+        layout.addWidget(sub_msg)
+
+        back_btn = QPushButton("Back to Login")
+        back_btn.setProperty("variant", "secondary")
+        back_btn.setMinimumHeight(45)
+        back_btn.clicked.connect(self.show_login)
+        layout.addWidget(back_btn)
+
+        return card
+
+    # UI HELPER FUNCTIONS (Reusable elements)
+    # ------------------------------------------------------
+    def create_card_frame(self):
+        """Creates a white rounded card with shadow (used for all content panels)."""
+        card = QFrame()
+        card.setObjectName("card")
+        # The shadow is the shared 9-slice border image; 28px outer radius leaves the
+        # card's own 20px corners once the 8px shadow border is taken off
+        card.setProperty("shadow", "light")
+        return card
+
+    def create_label(self, text):
+        """Creates a label for form field titles."""
+        lbl = QLabel(text)
+        lbl.setFont(cached_font("Segoe UI", 11, FONT_BOLD))
+        lbl.setObjectName("formLabel")
+        return lbl
+
+    def create_input(self, placeholder="", password=False):
+        """Creates a styled input box for text or password."""
+        field = QLineEdit()
+        field.setPlaceholderText(placeholder)
+        field.setMinimumHeight(42)
+        field.setObjectName("formInput")
+        if password:
+            field.setEchoMode(ECHO_PASSWORD)
+        return field
+
+    def _show_message(self, title, text):
+        """Show a modal message box in the portal's style."""
+        msg = QMessageBox()
+        msg.setWindowTitle(title)
+        msg.setText(text)
+        msg.setStyleSheet(self._MSG_QSS)
+        msg.exec()
+
+    # CARD NAVIGATION (switch between screens)
+    # ------------------------------------------------------
+    def _card(self, attr, build):
+        """Return the card stored on `attr`, building it into the stack on first use."""
+        card = getattr(self, attr)
+        if card is None:
+            card = build()
+            self.stack.addWidget(card)
+            setattr(self, attr, card)
+        return card
+
+    def show_login(self):
+        self.stack.setCurrentWidget(self.login_card)
+
+    def show_register_step1(self):
+        self.stack.setCurrentWidget(self._card("register_step1", self.create_register_step1))
+
+    def show_register_step2(self):
+        if not all([self.reg_name.text(), self.reg_age.text(), self.reg_email.text()]):
+            self._show_message("Error", "Please fill all fields before proceeding.")
+            return
+        self.stack.setCurrentWidget(self._card("register_step2", self.create_register_step2))
+
+    def show_success(self):
+        """Display success confirmation card."""
+        self.stack.setCurrentWidget(self._card("success_card", self.create_success_card))
+
+    def set_db_ready(self, ready):
+        """Enable the buttons that hit the database once seeding has finished."""
+        self._db_ready = ready
+        self.login_btn.setEnabled(ready)
+        if self.register_step2 is not None:   # otherwise the flag is applied when it is built
+            self.reg_btn.setEnabled(ready)
+
+    # DATABASE CONNECTION
+    # One connection is held between clicks instead of opening one per action
+    # --------------------------------------------
+    def _with_db(self, job):
+        """Run `job(db)` on the held connection, reopening it once if the server dropped it
+        while the portal sat idle. Only used for reads, so the retry cannot repeat a write."""
+        if self._db is None:
+            self._db = DB()
+        try:
+            return job(self._db)
+        except ConnectionLost:
+            self._release_db()
+            self._db = DB()
+            return job(self._db)
+
+    def _release_db(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    _ACCOUNTS_SQL = (
+        "SELECT id, name, password, 'staff' AS role FROM staff WHERE email=%s "
+        "UNION ALL SELECT id, name, password, 'patient' AS role FROM patients WHERE email=%s "
+        "ORDER BY role = 'patient'"
+    )
+
+    @classmethod
+    def _fetch_accounts(cls, db, email):
+        return db.query_prepared(cls._ACCOUNTS_SQL, (email, email))
+
+    def closeEvent(self, ev):
+        self._release_db()
+        super().closeEvent(ev)
+
+    # LOGIN AND REGISTRATION LOGIC
+    # --------------------------------------------
+    def login_action(self):
+        """
+        Handles login for both staff and patients.
+        Validates credentials and redirects to the correct dashboard.
+        """
+        email = self.login_email.text().strip()
+        pw = self.login_password.text().strip()
+
+        if not email or not pw:
+            self._show_message("Login", "Enter email and password.")
+            return
+        # The email columns are ascii, so no stored account can have a non-ASCII address
+        if not email.isascii():
+            self._show_message("Login", "Invalid credentials.")
+            return
+
+        try:
+            # Staff and patient accounts come back from one round trip, staff first
+            accounts = self._with_db(lambda db: self._fetch_accounts(db, email))
+            for acct in accounts:
+                if not check_password(pw, acct["password"]):
+                    continue
+                self._release_db()   # the dashboard checks out its own connections
+                self.hide()
+                if acct["role"] == "staff":
+                    from ui.staff_dashboard import StaffDashboard
+                    self.staff_win = StaffDashboard(acct["id"], acct["name"])
+                    self.staff_win.show()
+                else:
+                    from ui.patient_dashboard import PatientDashboard
+                    self.patient_win = PatientDashboard(acct["id"], acct["name"])
+                    self.patient_win.show()
+                return
+
+            # --- Invalid credentials ---
+            self._show_message("Login", "Invalid credentials.")
+        except Exception as e:
+            logging.error("Login failed: %s", e, exc_info=True)
+            self._release_db()
+            self._show_message("Error", f"Login failed: {str(e)}")
+
+    def register_action(self):
+        """
+        Handles patient registration.
+        1. Validates inputs.
+        2. Hashes password and saves to database (a taken email is rejected by the insert).
+        """
+        name, age, email, pw, confirm = (
+            w.text().strip() for w in (self.reg_name, self.reg_age, self.reg_email, self.reg_password, self.reg_confirm)
+        )
+        sex = self.reg_sex.currentText()
+
+        # Input validation
+        if not (name and email and pw and confirm):
+            logging.warning("Registration failed: Missing required fields")
+            self._show_message("Error", "Please fill all required fields.")
+            return
+        if not email.isascii():
+            logging.warning("Registration failed: Non-ASCII email")
+            self._show_message("Error", "Email addresses may only contain ASCII characters.")
+            return
+        if pw != confirm:
+            logging.warning("Registration failed: Passwords do not match")
+            self._show_message("Error", "Passwords do not match.")
+            return
+        # The field's QIntValidator(1, 120) already knows the rule; it only lets intermediate
+        # text such as "", "0" or "150" stay in the box, which hasAcceptableInput() reports
+        if not self.reg_age.hasAcceptableInput():
+            logging.warning("Registration failed: Invalid age")
+            self._show_message("Error", "Please enter a valid age between 1 and 120.")
+            return
+
+        # The Argon2 hash takes a noticeable fraction of a second, so it runs on a worker
+        # together with the queries; the button stays disabled until the result comes back
+        age_value = int(age)
+        self.reg_btn.setEnabled(False)
+        submit(lambda db: self._register_patient(db, name, age_value, sex, email, pw),
+               self._on_registered, self._on_register_failed)
+
+    @staticmethod
+    def _register_patient(db, name, age_value, sex, email, pw):
+        """Worker thread: insert the patient unless the email is taken. Returns True on success.
+        The UNIQUE index on patients.email decides, so there is no separate look-up first and two
+        simultaneous sign-ups with one address cannot both get in."""
+        hashed_pw = hash_password(pw)
+        logging.debug("Inserting patient: name=%s, age=%s, sex=%s, email=%s", name, age_value, sex, email)
+        try:
+            db.query(
+                "INSERT INTO patients (name, age, sex, email, password) VALUES (%s, %s, %s, %s, %s)",
+                (name, age_value, sex, email, hashed_pw),
+                commit=True
+            )
+        except Exception as e:
+            if not is_duplicate_key(e):
+                raise
+            logging.warning("Registration failed: Email %s already registered", email)
+            return False
+        logging.info("Registration successful")
+        return True
+
+    def _on_registered(self, ok):
+        self.reg_btn.setEnabled(self._db_ready)
+        if not ok:
+            self._show_message("Error", "Email already registered.")
+            return
+        self._show_message("Success", "Registration completed successfully.")
+        self.show_success()
+
+    def _on_register_failed(self, err):
+        logging.error("Registration failed: %s", err)
+        self.reg_btn.setEnabled(self._db_ready)
+        self._show_message("Error", f"Registration failed: {err}")
\ No newline at end of file
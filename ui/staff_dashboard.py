@@ -1,1673 +1,2356 @@
-from PyQt6.QtWidgets import (
-    QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QFrame,
-    QTableWidget, QTableWidgetItem, QHeaderView, QLineEdit, QFormLayout,
-    QComboBox, QTextEdit, QMessageBox, QDialog, QDateEdit, QApplication,
-    QScrollArea,
-)
-from PyQt6.QtGui import QFont, QColor, QTextDocument
-from PyQt6.QtCore import Qt
-from PyQt6.QtPrintSupport import QPrinter, QPrintDialog
-from functools import partial
-from db import DB, hash_password
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import matplotlib
-matplotlib.use('Agg')  # Avoid backend issues
-from datetime import datetime
-import base64
-from io import BytesIO
-
-# ----------------------------------------------------------------------
-# Utility helpers
-# ----------------------------------------------------------------------
-def format_currency(amount):
-    """
-    Format a numeric amount as Philippine Peso string.
-    Example: 1200.5 -> "₱1,200.50"
-    """
-    try:
-        return f"₱{float(amount):,.2f}"
-    except Exception:
-        return str(amount)
-
-def safe_str(val):
-    """Return a safe string for display in table cells."""
-    if val is None:
-        return ""
-    return str(val)
-
-def format_time_12h(time_str):
-    """Format time from HH:MM(:SS) to 12-hour with AM/PM."""
-    try:
-        if time_str:
-            dt = datetime.strptime(time_str, "%H:%M:%S") if ':' in time_str and time_str.count(':') == 2 else datetime.strptime(time_str, "%H:%M")
-            return dt.strftime("%I:%M %p")
-        return ""
-    except Exception:
-        return safe_str(time_str)
-
-# ----------------------------------------------------------------------
-# Chart Helpers
-# ----------------------------------------------------------------------
-class ChartWidget(QWidget):
-    """
-    Wrapper for matplotlib chart as a QWidget.
-    """
-    def __init__(self, fig: Figure, parent=None):
-        super().__init__(parent)
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0,0,0,0)
-        canvas = FigureCanvas(fig)
-        layout.addWidget(canvas)
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-# ----------------------------------------------------------------------
-# Edit Patient Dialog
-# ----------------------------------------------------------------------
-class EditPatientDialog(QDialog):
-    """
-    Modal dialog to edit a patient's record.
-    - Allows changing name, age, sex, email, and optionally password.
-    - Uses db.DB to persist changes.
-    """
-    def __init__(self, patient, parent=None):
-        super().__init__(parent)
-        self.patient = patient
-        self.setWindowTitle("Edit Patient Record")
-        self.setFixedSize(420, 320)
-        layout = QFormLayout(self)
-
-        # Input fields
-        self.name_edit = QLineEdit(patient.get("name", ""))
-        self.age_edit = QLineEdit(str(patient.get("age") or ""))
-        self.sex_edit = QComboBox()
-        self.sex_edit.addItems(["Male", "Female", "Other"])
-        if patient.get("sex"):
-            try:
-                self.sex_edit.setCurrentText(patient["sex"])
-            except Exception:
-                pass
-        self.email_edit = QLineEdit(patient.get("email") or "")
-        self.pass_edit = QLineEdit()
-        self.pass_edit.setEchoMode(QLineEdit.EchoMode.Password)
-
-        # Layout rows
-        layout.addRow("Name:", self.name_edit)
-        layout.addRow("Age:", self.age_edit)
-        layout.addRow("Sex:", self.sex_edit)
-        layout.addRow("Email:", self.email_edit)
-        layout.addRow("New Password:", self.pass_edit)
-
-        save_btn = QPushButton("Save")
-        save_btn.setStyleSheet("background-color:#02afd2;color:white;padding:8px;border-radius:6px;")
-        save_btn.clicked.connect(self.save)
-        layout.addRow(save_btn)
-
-    def save(self):
-        """
-        Persist edited patient data to the database.
-        If a new password was provided, hash it before saving.
-        """
-        db = DB()
-        try:
-            new_pw = self.pass_edit.text().strip()
-            hashed = hash_password(new_pw) if new_pw else self.patient.get("password")
-            db.query(
-                "UPDATE patients SET name=%s, age=%s, sex=%s, email=%s, password=%s WHERE id=%s",
-                (
-                    self.name_edit.text(),
-                    self.age_edit.text() or None,
-                    self.sex_edit.currentText(),
-                    self.email_edit.text(),
-                    hashed,
-                    self.patient["id"],
-                ),
-                commit=True,
-            )
-            QMessageBox.information(self, "Saved", "Patient record updated.")
-            self.accept()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save patient: {e}")
-        finally:
-            db.close()
-
-# ----------------------------------------------------------------------
-# Edit Service Dialog
-# ----------------------------------------------------------------------
-class EditServiceDialog(QDialog):
-    """
-    Dialog for adding or editing a service.
-    - If `service` is None: it's an Add dialog.
-    - Otherwise: pre-fills fields and updates existing record.
-    """
-    def __init__(self, service=None, parent=None):
-        super().__init__(parent)
-        self.service = service
-        self.setWindowTitle("Edit Service" if service else "Add Service")
-        self.setFixedSize(420, 300)
-        layout = QFormLayout(self)
-
-        self.name_edit = QLineEdit(service["name"] if service else "")
-        self.desc_edit = QTextEdit(service["description"] if service else "")
-        self.price_edit = QLineEdit(str(service["price"]) if service else "")
-        layout.addRow("Name:", self.name_edit)
-        layout.addRow("Description:", self.desc_edit)
-        layout.addRow("Price:", self.price_edit)
-
-        save_btn = QPushButton("Save")
-        save_btn.setStyleSheet("background-color:#02afd2;color:white;padding:8px;border-radius:6px;")
-        save_btn.clicked.connect(self.save)
-        layout.addRow(save_btn)
-
-    def save(self):
-        """
-        Validate and insert/update the service record.
-        Generates a simple code for new services (based on name).
-        """
-        try:
-            price = float(self.price_edit.text())
-        except ValueError:
-            QMessageBox.warning(self, "Error", "Price must be numeric.")
-            return
-
-        db = DB()
-        try:
-            if self.service:
-                db.query(
-                    "UPDATE services SET name=%s, description=%s, price=%s WHERE id=%s",
-                    (
-                        self.name_edit.text(),
-                        self.desc_edit.toPlainText(),
-                        price,
-                        self.service["id"],
-                    ),
-                    commit=True,
-                )
-            else:
-                # generate a code, make uppercase and replace spaces
-                base_code = self.name_edit.text().strip().upper().replace(" ", "-")[:20]
-                # attempt to insert using generated code; if duplicate codes exist, let DB handle unique constraint
-                db.query(
-                    "INSERT INTO services (code, name, description, price) VALUES (%s,%s,%s,%s)",
-                    (base_code, self.name_edit.text(), self.desc_edit.toPlainText(), price),
-                    commit=True,
-                )
-            QMessageBox.information(self, "Saved", "Service saved successfully.")
-            self.accept()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save service: {e}")
-        finally:
-            db.close()
-
-# ----------------------------------------------------------------------
-# Edit Appointment Dialog
-# ----------------------------------------------------------------------
-class EditAppointmentDialog(QDialog):
-    """
-    Dialog for editing appointment status and notes.
-    When status is changed to 'Completed', a related transaction is auto-inserted
-    if it doesn't already exist for that patient/service pair.
-    """
-    def __init__(self, appointment, parent=None):
-        super().__init__(parent)
-        self.app = appointment
-        self.setWindowTitle("Edit Appointment")
-        self.setFixedSize(420, 320)
-        layout = QFormLayout(self)
-
-        self.status = QComboBox()
-        self.status.addItems(["Pending", "Confirmed", "Completed", "Cancelled"])
-        self.status.setCurrentText(self.app.get("status", "Pending"))
-        self.notes = QTextEdit(self.app.get("notes") or "")
-        layout.addRow("Status:", self.status)
-        layout.addRow("Notes:", self.notes)
-
-        save_btn = QPushButton("Save")
-        save_btn.setStyleSheet("background-color:#02afd2;color:white;padding:8px;border-radius:6px;")
-        save_btn.clicked.connect(self.save)
-        layout.addRow(save_btn)
-
-    def save(self):
-        db = DB()
-        try:
-            new_status = self.status.currentText()
-            db.query(
-                "UPDATE appointments SET status=%s, notes=%s WHERE id=%s",
-                (new_status, self.notes.toPlainText(), self.app["id"]),
-                commit=True,
-            )
-
-            # auto transaction insertion on completed
-            if new_status == "Completed":
-                # check whether transaction exists for that appointment's patient and service
-                existing = db.query(
-                    "SELECT id FROM transactions WHERE patient_id=%s AND service_id=%s",
-                    (self.app['patient_id'], self.app['service_id'])
-                )
-                if not existing:
-                    price_row = db.query("SELECT price FROM services WHERE id=%s", (self.app['service_id'],))
-                    price = price_row[0]['price'] if price_row else 0
-                    db.query(
-                        "INSERT INTO transactions (patient_id, service_id, amount) VALUES (%s, %s, %s)",
-                        (self.app['patient_id'], self.app['service_id'], price),
-                        commit=True
-                    )
-            QMessageBox.information(self, "Updated", "Appointment updated.")
-            self.accept()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to update appointment: {e}")
-        finally:
-            db.close()
-
-# ----------------------------------------------------------------------
-# Edit Profile Dialog
-# ----------------------------------------------------------------------
-class EditProfileDialog(QDialog):
-    def __init__(self, staff_id, staff_name, parent=None):
-        super().__init__(parent)
-        self.staff_id = staff_id
-        self.staff_name = staff_name
-        self.setWindowTitle("My Profile")
-        self.setFixedSize(520, 400)
-        layout = QFormLayout(self)
-        layout.setContentsMargins(16, 16, 16, 16)
-        layout.setSpacing(10)
-
-        db = DB()
-        try:
-            rows = db.query("SELECT * FROM staff WHERE id=%s", (self.staff_id,))
-            self.staff = rows[0] if rows else {}
-        finally:
-            db.close()
-
-        self.name_edit = QLineEdit(self.staff.get("name") or "")
-        self.email_edit = QLineEdit(self.staff.get("email") or "")
-        self.phone_edit = QLineEdit(self.staff.get("phone") or "")
-        self.pass_edit = QLineEdit()
-        self.pass_edit.setEchoMode(QLineEdit.EchoMode.Password)
-
-        layout.addRow("Full Name:", self.name_edit)
-        layout.addRow("Email:", self.email_edit)
-        layout.addRow("Phone:", self.phone_edit)
-        layout.addRow("New Password:", self.pass_edit)
-
-        save_btn = QPushButton("Save Changes")
-        save_btn.setStyleSheet("background-color:#02afd2;color:white;padding:10px;border-radius:6px;")
-        save_btn.clicked.connect(self.save_profile)
-        layout.addRow(save_btn)
-
-    def save_profile(self):
-        new_pw = self.pass_edit.text().strip()
-        hashed = hash_password(new_pw) if new_pw else self.staff.get("password")
-        db = DB()
-        try:
-            db.query(
-                "UPDATE staff SET name=%s, email=%s, phone=%s, password=%s WHERE id=%s",
-                (self.name_edit.text(), self.email_edit.text(), self.phone_edit.text(), hashed, self.staff_id),
-                commit=True,
-            )
-            QMessageBox.information(self, "Saved", "Profile updated successfully.")
-            self.staff_name = self.name_edit.text()
-            self.accept()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save profile: {e}")
-        finally:
-            db.close()
-
-# ----------------------------------------------------------------------
-# Staff Dashboard - Main Widget
-# ----------------------------------------------------------------------
-class StaffDashboard(QWidget):
-    """
-    Main staff dashboard window. Contains:
-    - Sidebar navigation
-    - Content area with sections: Home, Patients, Appointments, Services, Transactions, Reports, Profile
-    """
-    def __init__(self, staff_id, staff_name, portal_parent=None):
-        super().__init__()
-        self.staff_id = staff_id
-        self.staff_name = staff_name
-        self.portal_parent = portal_parent
-
-        # Window properties
-        self.setWindowTitle("🦷 PureDent Clinic — Staff Dashboard")
-        self.resize(1200, 700)
-        self.setMinimumSize(1000, 600)
-
-        # Styling
-        self.setStyleSheet("""
-            QWidget { background-color: #f7fdff; font-family: Arial, sans-serif; color: #222; }
-            QFrame#sidebar { background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #02afd2, stop:1 #0298b8); border-right: none; }
-            QLabel { background: transparent; }
-            QPushButton.nav { text-align:left; padding:10px 14px; border:none; color:white; background:transparent; }
-            QPushButton.nav:hover { background:#0298b8; }
-            QPushButton.nav:pressed { background:#02afd2; }
-            QPushButton.primary { background-color:#02afd2; color:white; padding:8px 12px; border-radius:6px; }
-            QTableWidget { 
-                background:white; 
-                border:1px solid #dfeafc; 
-                gridline-color:#eaf4ff; 
-                alternate-background-color: #f9fafb;
-            }
-            QHeaderView::section { background:#e9faff; padding:6px; font-weight:600; border:none; }
-            QLineEdit, QTextEdit, QComboBox { background:white; border:1px solid #dfeafc; padding:6px; border-radius:4px; }
-            QFrame.card { 
-                background:white; 
-                border:1px solid #e6eefc; 
-                border-radius:8px; 
-                box-shadow: 0 2px 6px rgba(0,0,0,0.15);
-            }
-            QLineEdit.search { max-width: 200px; }
-            QTableWidgetItem.status { padding: 4px 10px; border-radius: 4px; }
-            QTableWidget::item { padding: 4px; font-size: 10px; }
-            QFrame.notification { 
-                background:white; 
-                border:1px solid #e6eefc; 
-                border-radius:6px; 
-                padding:8px; 
-                margin-bottom:8px;
-            }
-            QFrame.notification:hover { 
-                background:#f0f9ff; 
-                border-color:#bfdbfe;
-            }
-            QLabel.status { 
-                padding:4px 8px; 
-                border-radius:4px; 
-                font-size:10px; 
-                color:#333; 
-            }
-        """)
-
-        # initialize UI and center window
-        self.init_ui()
-        self.center_window()
-
-    # --------------------------------------------
-    # Window utilities
-    # --------------------------------------------
-    def center_window(self):
-        """
-        Center the window on the primary screen.
-        """
-        try:
-            screen_geo = QApplication.primaryScreen().availableGeometry().center()
-            frame = self.frameGeometry()
-            frame.moveCenter(screen_geo)
-            self.move(frame.topLeft())
-        except Exception:
-            # fallback: do nothing if centering fails
-            pass
-
-    def print_content(self, section):
-        """
-        Generate printable HTML for the specified section and open print dialog.
-        """
-        printer = QPrinter(QPrinter.PrinterMode.HighResolution)
-        dialog = QPrintDialog(printer, self)
-        if dialog.exec() != QDialog.DialogCode.Accepted:
-            return
-
-        document = QTextDocument()
-        html = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; }}
-                h1 {{ color: #02afd2; }}
-                table {{ width: 100%; border-collapse: collapse; margin-top: 10px; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                th {{ background-color: #e9faff; }}
-                img {{ max-width: 100%; }}
-            </style>
-        </head>
-        <body>
-        """
-
-        db = DB()
-        try:
-            if section == "reports":
-                # Service popularity
-                pop_rows = db.query("""
-                    SELECT s.name, COUNT(*) AS count
-                    FROM appointments a JOIN services s ON a.service_id = s.id
-                    WHERE a.status = 'Completed'
-                    GROUP BY s.id
-                    ORDER BY count DESC
-                """)
-                # Revenue per service
-                rev_rows = db.query("""
-                    SELECT s.name, SUM(t.amount) AS revenue
-                    FROM transactions t JOIN services s ON t.service_id = s.id
-                    GROUP BY s.id
-                    ORDER BY revenue DESC
-                """)
-
-                # Generate pie chart image
-                fig1 = Figure(figsize=(6, 4.5))
-                ax1 = fig1.add_subplot(111)
-                color_palette = [
-                    "#0284c7", "#15803d", "#b45309", "#b91c1c",
-                    "#1e40af", "#7e22ce", "#0f766e", "#c2410c"
-                ]
-                pop_names = [r['name'] for r in pop_rows]
-                pop_counts = [r['count'] for r in pop_rows]
-                if pop_names:
-                    ax1.pie(
-                        pop_counts,
-                        colors=[color_palette[i % len(color_palette)] for i in range(len(pop_names))],
-                        startangle=120,
-                        autopct=lambda pct: f"{pct:.1f}%" if pct >= 5 else "",
-                        textprops={'fontsize': 7, 'color': 'white', 'weight': 'bold'},
-                    )
-                    ax1.set_aspect("equal")
-                else:
-                    ax1.text(0.5, 0.5, "No Data", ha="center", va="center", fontsize=9)
-                fig1.subplots_adjust(left=0.02, right=0.98, top=0.94, bottom=0.06)
-                pie_buffer = BytesIO()
-                fig1.savefig(pie_buffer, format='png')
-                pie_data = base64.b64encode(pie_buffer.getvalue()).decode('utf-8')
-                pie_buffer.close()
-
-                # Generate bar chart image
-                fig2 = Figure(figsize=(8, 4))
-                ax2 = fig2.add_subplot(111)
-                rev_names = [r['name'] for r in rev_rows]
-                rev_values = [float(r['revenue'] or 0) for r in rev_rows]
-                if rev_names:
-                    zipped = sorted(zip(rev_names, rev_values), key=lambda x: x[1], reverse=True)
-                    names_sorted, values_sorted = zip(*zipped)
-                    bars = ax2.bar(names_sorted, values_sorted, color="#02afd2", edgecolor="#17707c", width=0.55)
-                    ax2.set_title("Revenue per Service", fontsize=11, fontweight='bold')
-                    ax2.set_ylabel("Revenue (₱)", fontsize=7)
-                    ax2.set_xlabel("Service", fontsize=7)
-                    ax2.tick_params(axis="x", labelrotation=40, labelsize=6)
-                    ax2.tick_params(axis="y", labelsize=6)
-                    for bar in bars:
-                        h = bar.get_height()
-                        ax2.annotate(
-                            f"₱{h:,.0f}",
-                            xy=(bar.get_x() + bar.get_width() / 2, h),
-                            xytext=(0, 2),
-                            textcoords="offset points",
-                            ha="center", va="bottom",
-                            fontsize=6, color="#333"
-                        )
-                    fig2.subplots_adjust(bottom=0.32, left=0.12, right=0.96, top=0.9)
-                else:
-                    ax2.text(0.5, 0.5, "No Data", ha="center", va="center", fontsize=9)
-                bar_buffer = BytesIO()
-                fig2.savefig(bar_buffer, format='png')
-                bar_data = base64.b64encode(bar_buffer.getvalue()).decode('utf-8')
-                bar_buffer.close()
-
-                html += """
-                <h1>Reports</h1>
-                <h2>Service Popularity</h2>
-                <img src="data:image/png;base64,{}" alt="Service Popularity Pie Chart">
-                <table>
-                    <tr><th>Service</th><th>Appointments</th></tr>
-                """.format(pie_data)
-                for row in pop_rows:
-                    html += f"<tr><td>{safe_str(row['name'])}</td><td>{safe_str(row['count'])}</td></tr>"
-                html += """
-                </table>
-                <h2>Revenue per Service</h2>
-                <img src="data:image/png;base64,{}" alt="Revenue Bar Chart">
-                <table>
-                    <tr><th>Service</th><th>Revenue (₱)</th></tr>
-                """.format(bar_data)
-                for row in rev_rows:
-                    html += f"<tr><td>{safe_str(row['name'])}</td><td>{format_currency(row['revenue'])}</td></tr>"
-                html += "</table>"
-
-            elif section == "transactions":
-                rows = db.query("""
-                    SELECT t.id, t.paid_at, p.name AS patient, s.name AS service, t.amount
-                    FROM transactions t
-                    JOIN patients p ON t.patient_id=p.id
-                    JOIN services s ON t.service_id=s.id
-                    ORDER BY t.paid_at DESC
-                """)
-                total = sum(float(row.get("amount") or 0) for row in rows)
-                html += f"""
-                <h1>Transactions</h1>
-                <p><strong>Total Revenue:</strong> {format_currency(total)}</p>
-                <table>
-                    <tr><th>Date</th><th>Patient</th><th>Service</th><th>Amount</th></tr>
-                """
-                for row in rows:
-                    html += f"""
-                    <tr>
-                        <td>{safe_str(row.get('paid_at', ''))}</td>
-                        <td>{safe_str(row.get('patient', ''))}</td>
-                        <td>{safe_str(row.get('service', ''))}</td>
-                        <td>{format_currency(row.get('amount', 0))}</td>
-                    </tr>
-                    """
-                html += "</table>"
-
-        finally:
-            db.close()
-
-        html += "</body></html>"
-        document.setHtml(html)
-        document.print(printer)
-
-    # --------------------------------------------
-    # UI Initialization
-    # --------------------------------------------
-    def init_ui(self):
-        outer = QHBoxLayout(self)
-        outer.setContentsMargins(0, 0, 0, 0)
-        outer.setSpacing(0)
-
-        # Sidebar (left)
-        sidebar = QFrame()
-        sidebar.setObjectName("sidebar")
-        sidebar.setFixedWidth(260)
-        s_layout = QVBoxLayout(sidebar)
-        s_layout.setContentsMargins(18, 18, 18, 18)
-        s_layout.setSpacing(5)
-
-        # Brand label
-        brand = QLabel("🦷 PureDent\nClinic")
-        brand_font = QFont("Arial", 22, QFont.Weight.Bold)
-        brand.setFont(brand_font)
-        brand.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignHCenter)
-        brand.setStyleSheet("""
-            color: white;
-            background: transparent;
-            margin-top: 4px;
-            margin-bottom: 2px;
-        """)
-        s_layout.addWidget(brand, alignment=Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignHCenter)
-
-        # Sub-brand label
-        sub = QLabel("Staff Portal")
-        sub_font = QFont("Arial", 10, QFont.Weight.DemiBold)
-        sub.setFont(sub_font)
-        sub.setStyleSheet("""
-            color: rgba(255, 255, 255, 0.9);
-            background: transparent;
-            margin-top: 0px;
-        """)
-        s_layout.addWidget(sub, alignment=Qt.AlignmentFlag.AlignHCenter)
-
-        s_layout.addSpacing(8)
-
-        # Navigation buttons
-        self.nav_buttons = {}
-        nav_items = [
-            ("Home", "home"),
-            ("Patients", "patients"),
-            ("Appointments", "appointments"),
-            ("Services", "services"),
-            ("Transactions", "transactions"),
-            ("Reports", "reports"),
-            ("Profile", "profile"),
-            ("Logout", "logout"),
-        ]
-        for label, key in nav_items:
-            btn = QPushButton(label)
-            btn.setProperty("class", "nav")
-            btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            btn.setFont(QFont("Arial", 11))
-            btn.clicked.connect(partial(self.switch_section, key))
-            btn.setStyleSheet("QPushButton { text-align: left; padding: 10px 12px; border: none; color: white; background: transparent; }")
-            s_layout.addWidget(btn)
-            self.nav_buttons[key] = btn
-
-        s_layout.addStretch(1)
-        # Footer showing logged in staff
-        logged_label = QLabel(f"Logged in: {self.staff_name}")
-        logged_label.setFont(QFont("Arial", 10))
-        logged_label.setStyleSheet("color: rgba(255,255,255,0.95);")
-        s_layout.addWidget(logged_label)
-        s_layout.addSpacing(4)
-
-        outer.addWidget(sidebar)
-
-        # Main content wrapper (right)
-        content_wrapper = QFrame()
-        content_layout = QVBoxLayout(content_wrapper)
-        content_layout.setContentsMargins(20, 20, 20, 20)
-        content_layout.setSpacing(12)
-        self.content_layout = content_layout
-        outer.addWidget(content_wrapper, 1)
-
-        # Open default section
-        self.switch_section("home")
-
-    # --------------------------------------------
-    # Content management and navigation
-    # --------------------------------------------
-    def clear_content(self):
-        """
-        Remove all widgets/layouts from the content area cleanly.
-        """
-        while self.content_layout.count():
-            item = self.content_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-            else:
-                layout = item.layout()
-                if layout:
-                    while layout.count():
-                        sub = layout.takeAt(0)
-                        w = sub.widget()
-                        if w:
-                            w.deleteLater()
-
-    def switch_section(self, section):
-        """
-        Main navigation handler — switches content based on section key.
-        """
-        try:
-            # Style active nav button and reset others
-            for k, btn in self.nav_buttons.items():
-                if k == section:
-                    btn.setStyleSheet("background:#02afd2; color:white; text-align:left; padding:10px 12px;")
-                else:
-                    btn.setStyleSheet("QPushButton { text-align:left; padding:10px 12px; background:transparent; color: white; }")
-
-            # Clear content area and render selected section
-            self.clear_content()
-            match section:
-                case "home":
-                    self.render_home()
-                case "patients":
-                    self.render_patients()
-                case "appointments":
-                    self.render_appointments()
-                case "services":
-                    self.render_services()
-                case "transactions":
-                    self.render_transactions()
-                case "reports":
-                    self.render_reports()
-                case "profile":
-                    self.render_profile()
-                case "logout":
-                    self.logout()
-                case _:
-                    self.render_home()
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            QMessageBox.critical(self, "Error", f"Navigation error: {e}")
-
-    # --------------------------------------------
-    # Home (Dashboard) section
-    # --------------------------------------------
-    def render_home(self):
-        """
-        Dashboard home view.
-        Shows summary cards, upcoming appointments (left), and appointment status pie (right).
-        """
-        # Header row
-        top = QHBoxLayout()
-        title = QLabel("Dashboard")
-        title.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-        top.addWidget(title)
-        top.addStretch(1)
-        welcome = QLabel(f"Hi, Dr. {self.staff_name.split()[0]}")
-        welcome.setFont(QFont("Arial", 12))
-        top.addWidget(welcome)
-        self.content_layout.addLayout(top)
-
-        # Stats cards row
-        cards_row = QHBoxLayout()
-        cards_row.setSpacing(12)
-        stats = [
-            ("Total Patients", self.get_count("patients")),
-            ("Appointments", self.get_count("appointments")),
-            ("Services", self.get_count("services")),
-            ("Transactions", self.get_count("transactions")),
-        ]
-        gradient_colors = [
-            "qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 #02afd2, stop:1 #5ecbe0)",
-            "qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 #16a34a, stop:1 #86efac)",
-            "qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 #fbbf24, stop:1 #fde68a)",
-            "qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 #ef4444, stop:1 #fca5a5)",
-        ]
-        for i, (label, value) in enumerate(stats):
-            card = QFrame()
-            card.setProperty("class", "card")
-            card.setFixedHeight(120)
-            card.setStyleSheet(
-                f"QFrame {{ background: {gradient_colors[i]}; "
-                "color: white; border-radius:8px; }}"
-            )
-            c_layout = QVBoxLayout(card)
-            c_layout.setContentsMargins(12, 8, 12, 8)
-            lbl = QLabel(label)
-            lbl.setFont(QFont("Arial", 14))
-            c_layout.addWidget(lbl)
-            val_lbl = QLabel(str(value))
-            val_lbl.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-            c_layout.addStretch(1)
-            c_layout.addWidget(val_lbl, alignment=Qt.AlignmentFlag.AlignRight)
-            cards_row.addWidget(card)
-        self.content_layout.addLayout(cards_row)
-
-        # ---- Upcoming + Pie row ----
-        bottom = QHBoxLayout()
-        bottom.setSpacing(12)
-
-        # Upcoming appointments (left)
-        upcoming_frame = QFrame()
-        upcoming_frame.setProperty("class", "card")
-        upcoming_frame.setStyleSheet("QFrame.card { background:white; border:1px solid #e6eefc; border-radius:8px; box-shadow: 0 2px 6px rgba(0,0,0,0.15); }")
-        upcoming_layout = QVBoxLayout(upcoming_frame)
-        upcoming_layout.setContentsMargins(12, 12, 12, 12)
-        upcoming_title = QLabel("Upcoming Appointments")
-        upcoming_title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-        upcoming_layout.addWidget(upcoming_title)
-        self.populate_upcoming_notifications(upcoming_layout)
-        bottom.addWidget(upcoming_frame, 1)
-
-        # Appointment Status Overview (right)
-        status_frame = QFrame()
-        status_frame.setProperty("class", "card")
-        status_layout = QVBoxLayout(status_frame)
-        status_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        status_title = QLabel("Appointment Status Overview")
-        status_title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-        status_layout.addWidget(status_title, alignment=Qt.AlignmentFlag.AlignCenter)
-        self.render_appointment_status_pie(status_layout)
-        bottom.addWidget(status_frame, 1)
-
-        self.content_layout.addLayout(bottom)
-        self.content_layout.addStretch(1)
-
-    def render_appointment_status_pie(self, parent_layout):
-        """
-        Displays a solid, fully-colored pie chart (right)
-        with visible percentages and horizontal color bars (left).
-        """
-        db = DB()
-        try:
-            rows = db.query("""
-                            SELECT status, COUNT(*) as count
-                            FROM appointments
-                            GROUP BY status
-                            """)
-            statuses = [r['status'] for r in rows]
-            counts = [r['count'] for r in rows]
-        finally:
-            db.close()
-
-        # Define consistent order + darker color palette
-        order = ["Pending", "Confirmed", "Completed", "Cancelled"]
-        color_map = {
-            "Pending": "#ca8a04",  # darker yellow
-            "Confirmed": "#1e40af",  # darker blue
-            "Completed": "#15803d",  # darker green
-            "Cancelled": "#b91c1c"   # darker red
-        }
-
-        # Sort and filter
-        sorted_statuses, sorted_counts, sorted_colors = [], [], []
-        for k in order:
-            if k in statuses:
-                idx = statuses.index(k)
-                sorted_statuses.append(k)
-                sorted_counts.append(counts[idx])
-                sorted_colors.append(color_map[k])
-
-        chart_row = QHBoxLayout()
-        chart_row.setSpacing(20)
-        chart_row.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        # ---------------------- STATUS BARS ----------------------
-        left_layout = QVBoxLayout()
-        left_layout.setSpacing(8)
-        left_layout.setContentsMargins(6, 6, 6, 6)
-
-        if sorted_statuses:
-            for status, color in zip(sorted_statuses, sorted_colors):
-                bar_container = QHBoxLayout()
-                bar_container.setSpacing(6)
-
-                color_bar = QFrame()
-                color_bar.setFixedSize(28, 10)
-                color_bar.setStyleSheet(f"background-color: {color}; border-radius: 3px;")
-
-                label = QLabel(status)
-                label.setFont(QFont("Arial", 9, QFont.Weight.DemiBold))
-                label.setStyleSheet("color: #333;")
-
-                bar_container.addWidget(color_bar)
-                bar_container.addWidget(label)
-                bar_container.addStretch(1)
-                left_layout.addLayout(bar_container)
-        else:
-            lbl = QLabel("No data available")
-            lbl.setFont(QFont("Arial", 9))
-            left_layout.addWidget(lbl)
-
-        left_layout.addStretch(1)
-        chart_row.addLayout(left_layout, 1)
-
-        # ---------------------- PIE CHART ----------------------
-        pie_layout = QVBoxLayout()
-        pie_layout.setSpacing(6)
-        pie_layout.setContentsMargins(0, 0, 0, 0)
-        pie_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        fig = Figure(figsize=(8, 8))  # Increased size for larger chart
-        ax = fig.add_subplot(111)
-
-        if sorted_statuses:
-            wedges, texts, autotexts = ax.pie(
-                sorted_counts,
-                colors=sorted_colors,
-                startangle=120,
-                autopct=lambda pct: f"{pct:.1f}%" if pct >= 5 else "",
-                textprops={'fontsize': 10, 'color': 'white', 'weight': 'bold'},
-                radius=1.2,
-                wedgeprops=dict(edgecolor="white", linewidth=1.5)
-            )
-            ax.set_aspect("equal")
-        else:
-            ax.text(0.5, 0.5, "No Data",
-                    ha="center", va="center", fontsize=12, fontweight="bold")
-
-        fig.subplots_adjust(left=0.05, right=0.95, top=0.95, bottom=0.05)
-        pie_chart_widget = ChartWidget(fig)
-        pie_layout.addWidget(pie_chart_widget, alignment=Qt.AlignmentFlag.AlignCenter)
-
-        chart_row.addLayout(pie_layout, 2)
-
-        # Add to parent
-        parent_layout.addLayout(chart_row)
-
-    def populate_upcoming_notifications(self, parent_layout):
-        """
-        Displays upcoming appointments as notification-style cards.
-        Shows only Confirmed and Pending statuses with colored badges.
-        """
-        db = DB()
-        try:
-            rows_upcoming = db.query(
-                "SELECT a.id, p.name as patient, s.name as service, a.date, a.time, a.status "
-                "FROM appointments a JOIN patients p ON a.patient_id=p.id "
-                "JOIN services s ON a.service_id=s.id "
-                "WHERE a.date >= CURDATE() AND a.status IN ('Confirmed', 'Pending') "
-                "ORDER BY a.date ASC, a.time ASC LIMIT 10"
-            )
-        finally:
-            db.close()
-
-        # Scroll area for notifications
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll_content = QWidget()
-        scroll_layout = QVBoxLayout(scroll_content)
-        scroll_layout.setContentsMargins(0, 0, 0, 0)
-        scroll_layout.setSpacing(8)
-
-        # Define status colors (same as appointments table)
-        status_colors = {
-            "Pending": "#ca8a04",
-            "Confirmed": "#1e40af",
-            "Completed": "#15803d",
-            "Cancelled": "#b91c1c"
-        }
-
-        if rows_upcoming:
-            for r in rows_upcoming:
-                card = QFrame()
-                card.setProperty("class", "notification")
-                card_layout = QHBoxLayout(card)
-                card_layout.setContentsMargins(10, 10, 10, 10)
-                card_layout.setSpacing(12)
-
-                # Left: Details
-                details_layout = QVBoxLayout()
-                patient_label = QLabel(f"<b>Patient:</b> {safe_str(r.get('patient'))}")
-                patient_label.setFont(QFont("Arial", 10))
-                service_label = QLabel(f"<b>Service:</b> {safe_str(r.get('service'))}")
-                service_label.setFont(QFont("Arial", 10))
-                date_label = QLabel(f"<b>Date:</b> {safe_str(r.get('date'))} {format_time_12h(r.get('time'))}")
-                date_label.setFont(QFont("Arial", 10))
-                details_layout.addWidget(patient_label)
-                details_layout.addWidget(service_label)
-                details_layout.addWidget(date_label)
-                card_layout.addLayout(details_layout, 1)
-
-                # Right: Status
-                status_label = QLabel(safe_str(r.get("status")))
-                status_label.setProperty("class", "status")
-                status_label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
-                status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                status_color = status_colors.get(r.get("status"), "#ffffff")
-                status_label.setStyleSheet(f"QLabel.status {{ background-color: {status_color}; padding:4px 8px; border-radius:4px; color: #fff; }}")
-                card_layout.addWidget(status_label)
-
-                scroll_layout.addWidget(card)
-
-        else:
-            no_data = QLabel("No upcoming appointments")
-            no_data.setFont(QFont("Arial", 10))
-            scroll_layout.addWidget(no_data)
-
-        scroll_layout.addStretch(1)
-        scroll.setWidget(scroll_content)
-        parent_layout.addWidget(scroll)
-
-    # --------------------------------------------
-    # Reports section
-    # --------------------------------------------
-    def render_reports(self):
-        """
-        Reports section:
-        - Left: Legend with colored squares, service names, counts in a straight line
-        - Right: Clean full-color pie chart (no inside labels for small segments)
-        - Below: Revenue per Service bar chart
-        """
-        top = QHBoxLayout()
-        title = QLabel("Reports")
-        title.setFont(QFont("Arial", 20, QFont.Weight.Bold))
-        top.addWidget(title)
-        top.addStretch(1)
-        print_btn = QPushButton("Print")
-        print_btn.setStyleSheet("background-color:#02afd2;color:white;padding:8px;border-radius:6px;")
-        print_btn.clicked.connect(lambda: self.print_content("reports"))
-        top.addWidget(print_btn)
-        self.content_layout.addLayout(top)
-
-        db = DB()
-        try:
-            # Service popularity (completed appointments)
-            pop_rows = db.query("""
-                                SELECT s.name, COUNT(*) AS count
-                                FROM appointments a
-                                    JOIN services s
-                                ON a.service_id = s.id
-                                WHERE a.status = 'Completed'
-                                GROUP BY s.id
-                                ORDER BY count DESC
-                                """)
-            pop_names = [r['name'] for r in pop_rows]
-            pop_counts = [r['count'] for r in pop_rows]
-
-            # Revenue per service (from transactions)
-            rev_rows = db.query("""
-                                SELECT s.name, SUM(t.amount) AS revenue
-                                FROM transactions t
-                                         JOIN services s ON t.service_id = s.id
-                                GROUP BY s.id
-                                ORDER BY revenue DESC
-                                """)
-            rev_names = [r['name'] for r in rev_rows]
-            rev_values = [float(r['revenue'] or 0) for r in rev_rows]
-        finally:
-            db.close()
-
-        # Outer layout
-        report_layout = QVBoxLayout()
-        report_layout.setSpacing(18)
-
-        # ---------------- PIE CHART SECTION ----------------
-        pie_card = QFrame()
-        pie_card.setProperty("class", "card")
-        pie_layout = QHBoxLayout(pie_card)
-        pie_layout.setContentsMargins(10, 10, 10, 10)
-        pie_layout.setSpacing(14)
-
-        color_palette = [
-            "#0284c7", "#15803d", "#b45309", "#b91c1c",
-            "#1e40af", "#7e22ce", "#0f766e", "#c2410c"
-        ]
-
-        # Left legend
-        legend_box = QVBoxLayout()
-        legend_box.setSpacing(5)
-        legend_label = QLabel("Service Popularity")
-        legend_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-        legend_box.addWidget(legend_label)
-
-        if pop_names:
-            total = sum(pop_counts)
-            for i, (name, count) in enumerate(zip(pop_names, pop_counts)):
-                color = color_palette[i % len(color_palette)]
-
-                row = QHBoxLayout()
-                row.setSpacing(8)
-
-                # Color square
-                square = QFrame()
-                square.setFixedSize(14, 14)
-                square.setStyleSheet(f"background-color:{color}; border-radius:3px;")
-
-                # Name label
-                lbl_name = QLabel(name)
-                lbl_name.setFont(QFont("Arial", 9))
-
-                # Count label
-                lbl_value = QLabel(f"{count}")
-                lbl_value.setFont(QFont("Arial", 9))
-                lbl_value.setStyleSheet("color:#555;")
-
-                row.addWidget(square)
-                row.addWidget(lbl_name)
-                row.addStretch(1)
-                row.addWidget(lbl_value)
-                legend_box.addLayout(row)
-        else:
-            no_lbl = QLabel("No data available")
-            no_lbl.setFont(QFont("Arial", 9))
-            legend_box.addWidget(no_lbl)
-
-        legend_box.addStretch(1)
-        pie_layout.addLayout(legend_box, 1)
-
-        # Right pie chart
-        fig1 = Figure(figsize=(6, 4.5))
-        ax1 = fig1.add_subplot(111)
-
-        if pop_names:
-            ax1.pie(
-                pop_counts,
-                colors=[color_palette[i % len(color_palette)] for i in range(len(pop_names))],
-                startangle=120,
-                autopct=lambda pct: f"{pct:.1f}%" if pct >= 5 else "",
-                textprops={'fontsize': 7, 'color': 'white', 'weight': 'bold'},
-                wedgeprops=dict(edgecolor="white", width=1.0)
-            )
-            ax1.set_aspect("equal", adjustable="datalim")
-        else:
-            ax1.text(0.5, 0.5, "No Data", ha="center", va="center", fontsize=9)
-
-        fig1.subplots_adjust(left=0.02, right=0.98, top=0.94, bottom=0.06)
-        pie_layout.addWidget(ChartWidget(fig1), 2)
-        report_layout.addWidget(pie_card, 1)
-
-        # ---------------- BAR CHART SECTION ----------------
-        bar_card = QFrame()
-        bar_card.setProperty("class", "card")
-        bar_layout = QVBoxLayout(bar_card)
-        bar_layout.setContentsMargins(12, 12, 12, 12)
-        bar_layout.setSpacing(6)
-
-        fig2 = Figure(figsize=(8, 4))
-        ax2 = fig2.add_subplot(111)
-
-        if rev_names:
-            zipped = sorted(zip(rev_names, rev_values), key=lambda x: x[1], reverse=True)
-            names_sorted, values_sorted = zip(*zipped)
-            bars = ax2.bar(
-                names_sorted,
-                values_sorted,
-                color="#02afd2",
-                edgecolor="#17707c",
-                width=0.55
-            )
-
-            ax2.set_title("Revenue per Service", fontsize=11, fontweight='bold', pad=8)
-            ax2.set_ylabel("Revenue (₱)", fontsize=7)
-            ax2.set_xlabel("Service", fontsize=7)
-            ax2.tick_params(axis="x", labelrotation=40, labelsize=6)
-            ax2.tick_params(axis="y", labelsize=6)
-
-            # Labels above bars
-            for bar in bars:
-                h = bar.get_height()
-                ax2.annotate(
-                    f"₱{h:,.0f}",
-                    xy=(bar.get_x() + bar.get_width() / 2, h),
-                    xytext=(0, 2),
-                    textcoords="offset points",
-                    ha="center", va="bottom",
-                    fontsize=6, color="#333"
-                )
-
-            fig2.subplots_adjust(bottom=0.32, left=0.12, right=0.96, top=0.9)
-        else:
-            ax2.text(0.5, 0.5, "No Data", ha="center", va="center", fontsize=9)
-
-        fig2.tight_layout()
-        bar_layout.addWidget(ChartWidget(fig2))
-        report_layout.addWidget(bar_card, 2)
-
-        self.content_layout.addLayout(report_layout)
-        self.content_layout.addStretch(1)
-
-    # --------------------------------------------
-    # Patients section
-    # --------------------------------------------
-    def render_patients(self):
-        title = QLabel("Patients")
-        title.setFont(QFont("Arial", 20, QFont.Weight.Bold))
-        self.content_layout.addWidget(title)
-
-        # Search bar with add button, aligned to the right
-        search_layout = QHBoxLayout()
-        search_layout.addStretch(1)
-        self.patient_search = QLineEdit()
-        self.patient_search.setPlaceholderText("Search patients...")
-        self.patient_search.setProperty("class", "search")
-        self.patient_search.textChanged.connect(self.filter_patients)
-        search_layout.addWidget(QLabel("🔍"))
-        search_layout.addWidget(self.patient_search)
-        add_btn = QPushButton("Add Patient")
-        add_btn.setStyleSheet("background-color:#02afd2;color:white;padding:8px;border-radius:6px;")
-        search_layout.addWidget(add_btn)
-        self.content_layout.addLayout(search_layout)
-
-        table = QTableWidget(0, 6)
-        table.setHorizontalHeaderLabels(["ID", "Name", "Age", "Sex", "Email", "Actions"])
-        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.Fixed)
-        table.setColumnWidth(5, 60)
-        table.setColumnHidden(0, True)
-        table.setStyleSheet("QTableWidget { background:white; border:1px solid #dfeafc; }")
-        self.content_layout.addWidget(table)
-        self.table_patients_ref = table
-
-        def load():
-            db = DB()
-            try:
-                rows = db.query("SELECT * FROM patients ORDER BY id DESC")
-            finally:
-                db.close()
-            table.setRowCount(len(rows))
-            for i, r in enumerate(rows):
-                table.setItem(i, 0, QTableWidgetItem(safe_str(r.get("id", ""))))
-                table.setItem(i, 1, QTableWidgetItem(safe_str(r.get("name", ""))))
-                table.setItem(i, 2, QTableWidgetItem(safe_str(r.get("age") or "")))
-                table.setItem(i, 3, QTableWidgetItem(safe_str(r.get("sex") or "")))
-                table.setItem(i, 4, QTableWidgetItem(safe_str(r.get("email") or "")))
-
-                edit_btn = QPushButton("✏️")
-                edit_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-                edit_btn.clicked.connect(partial(self.open_edit_patient, r))
-                del_btn = QPushButton("🗑")
-                del_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-                del_btn.clicked.connect(partial(self.delete_patient, r.get("id")))
-                holder_layout = QHBoxLayout()
-                holder_layout.setContentsMargins(0, 0, 0, 0)
-                holder_layout.setSpacing(6)
-                holder_layout.addWidget(edit_btn)
-                holder_layout.addWidget(del_btn)
-                holder = QFrame()
-                holder.setLayout(holder_layout)
-                table.setCellWidget(i, 5, holder)
-
-        load()
-
-        def on_add():
-            dlg = QDialog(self)
-            dlg.setWindowTitle("Add Patient")
-            dlg.setFixedSize(420, 320)
-            form = QFormLayout(dlg)
-            n, a, s, e, p = QLineEdit(), QLineEdit(), QComboBox(), QLineEdit(), QLineEdit()
-            s.addItems(["Male", "Female", "Other"])
-            p.setEchoMode(QLineEdit.EchoMode.Password)
-            form.addRow("Name:", n)
-            form.addRow("Age:", a)
-            form.addRow("Sex:", s)
-            form.addRow("Email:", e)
-            form.addRow("Password:", p)
-            btn = QPushButton("Save")
-            btn.setStyleSheet("background-color:#02afd2;color:white;padding:8px;border-radius:6px;")
-            form.addRow(btn)
-
-            def save():
-                db = DB()
-                try:
-                    db.query(
-                        "INSERT INTO patients (name, age, sex, email, password) VALUES (%s,%s,%s,%s,%s)",
-                        (n.text(), a.text() or None, s.currentText(), e.text(), hash_password(p.text())),
-                        commit=True,
-                    )
-                    dlg.accept()
-                    load()
-                except Exception as ex:
-                    QMessageBox.critical(self, "Error", f"Failed to add patient: {ex}")
-                finally:
-                    db.close()
-
-            btn.clicked.connect(save)
-            dlg.exec()
-
-        add_btn.clicked.connect(on_add)
-
-    def filter_patients(self):
-        """
-        Filter visible rows in the patients table based on search query.
-        Excludes the actions column from search matching.
-        """
-        query = self.patient_search.text().lower()
-        table = getattr(self, "table_patients_ref", None)
-        if table is None:
-            return
-        for row in range(table.rowCount()):
-            match = False
-            for col in range(1, table.columnCount() - 1):
-                item = table.item(row, col)
-                if item and query in item.text().lower():
-                    match = True
-                    break
-            table.setRowHidden(row, not match)
-
-    def open_edit_patient(self, patient_row):
-        """
-        Open the EditPatientDialog. After dialog closes, refresh patients section.
-        """
-        dlg = EditPatientDialog(patient_row, self)
-        dlg.exec()
-        self.switch_section("patients")
-
-    def delete_patient(self, pid):
-        """
-        Delete a patient after confirmation.
-        """
-        if pid is None:
-            return
-        ok = QMessageBox.question(self, "Confirm", "Delete this patient?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-        if ok == QMessageBox.StandardButton.Yes:
-            db = DB()
-            try:
-                db.query("DELETE FROM patients WHERE id=%s", (pid,), commit=True)
-                QMessageBox.information(self, "Deleted", "Patient deleted.")
-                self.switch_section("patients")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to delete patient: {e}")
-            finally:
-                db.close()
-
-    # --------------------------------------------
-    # Appointments section
-    # --------------------------------------------
-    def render_appointments(self):
-        title = QLabel("Appointments")
-        title.setFont(QFont("Arial", 20, QFont.Weight.Bold))
-        self.content_layout.addWidget(title)
-
-        # Search bar with add button, aligned to the right
-        search_layout = QHBoxLayout()
-        search_layout.addStretch(1)
-        self.appointment_search = QLineEdit()
-        self.appointment_search.setPlaceholderText("Search appointments...")
-        self.appointment_search.setProperty("class", "search")
-        self.appointment_search.textChanged.connect(self.filter_appointments)
-        search_layout.addWidget(QLabel("🔍"))
-        search_layout.addWidget(self.appointment_search)
-        add_btn = QPushButton("Add Appointment")
-        add_btn.setStyleSheet("background-color:#02afd2;color:white;padding:8px;border-radius:6px;")
-        search_layout.addWidget(add_btn)
-        self.content_layout.addLayout(search_layout)
-
-        table = QTableWidget(0, 8)
-        table.setHorizontalHeaderLabels(["ID", "Patient", "Service", "Date", "Time", "Notes", "Status", "Actions"])
-        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        table.horizontalHeader().setSectionResizeMode(7, QHeaderView.ResizeMode.Fixed)
-        table.setColumnWidth(7, 60)
-        table.setColumnHidden(0, True)
-        table.setStyleSheet("QTableWidget { background:white; border:1px solid #dfeafc; }")
-        self.content_layout.addWidget(table)
-        self.table_appointments_ref = table
-
-        def load():
-            db = DB()
-            try:
-                rows = db.query(
-                    "SELECT a.*, p.name AS patient, s.name AS service FROM appointments a "
-                    "JOIN patients p ON a.patient_id=p.id JOIN services s ON a.service_id=s.id ORDER BY a.date DESC, a.time DESC"
-                )
-            finally:
-                db.close()
-            table.setRowCount(len(rows))
-
-            status_colors = {
-                "Pending": "#ca8a04",
-                "Confirmed": "#1e40af",
-                "Completed": "#15803d",
-                "Cancelled": "#b91c1c"
-            }
-
-            for i, r in enumerate(rows):
-                table.setItem(i, 0, QTableWidgetItem(safe_str(r.get("id", ""))))
-                table.setItem(i, 1, QTableWidgetItem(safe_str(r.get("patient") or "")))
-                table.setItem(i, 2, QTableWidgetItem(safe_str(r.get("service") or "")))
-                table.setItem(i, 3, QTableWidgetItem(safe_str(r.get("date") or "")))
-                time_item = QTableWidgetItem(format_time_12h(r.get("time")))
-                table.setItem(i, 4, time_item)
-                table.setItem(i, 5, QTableWidgetItem(safe_str(r.get("notes") or "")))
-                status_item = QTableWidgetItem(safe_str(r.get("status") or ""))
-                status_item.setFont(QFont("Arial", 9))
-                status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                status_color = status_colors.get(r.get("status"), "#ffffff")
-                status_item.setBackground(QColor(status_color))
-                table.setItem(i, 6, status_item)
-
-                edit_btn = QPushButton("✏️")
-                edit_btn.clicked.connect(partial(self.open_edit_appointment, r))
-                del_btn = QPushButton("🗑")
-                del_btn.clicked.connect(partial(self.delete_appointment, r.get("id")))
-                for b in (edit_btn, del_btn):
-                    b.setCursor(Qt.CursorShape.PointingHandCursor)
-                holder = QFrame()
-                holder_layout = QHBoxLayout(holder)
-                holder_layout.setContentsMargins(0, 0, 0, 0)
-                holder_layout.setSpacing(6)
-                holder_layout.addWidget(edit_btn)
-                holder_layout.addWidget(del_btn)
-                table.setCellWidget(i, 7, holder)
-
-        load()
-
-        def on_add():
-            dlg = QDialog(self)
-            dlg.setWindowTitle("Add Appointment")
-            dlg.setFixedSize(480, 360)
-            form = QFormLayout(dlg)
-            db = DB()
-            try:
-                patients = db.query("SELECT id, name FROM patients")
-                services = db.query("SELECT id, name FROM services")
-            finally:
-                db.close()
-            patient_cb = QComboBox()
-            service_cb = QComboBox()
-            for p in patients:
-                patient_cb.addItem(f"{p['name']} (#{p['id']})", p['id'])
-            for s in services:
-                service_cb.addItem(f"{s['name']} (#{s['id']})", s['id'])
-            date_edit = QDateEdit()
-            date_edit.setCalendarPopup(True)
-            time_edit = QLineEdit()
-            notes = QTextEdit()
-            form.addRow("Patient:", patient_cb)
-            form.addRow("Service:", service_cb)
-            form.addRow("Date:", date_edit)
-            form.addRow("Time (HH:MM):", time_edit)
-            form.addRow("Notes:", notes)
-            btn = QPushButton("Save")
-            btn.setStyleSheet("background-color:#02afd2;color:white;padding:8px;border-radius:6px;")
-            form.addRow(btn)
-
-            def save():
-                pid = patient_cb.currentData()
-                sid = service_cb.currentData()
-                dt = date_edit.date().toString("yyyy-MM-dd")
-                tm = time_edit.text().strip()
-                db = DB()
-                try:
-                    db.query(
-                        "INSERT INTO appointments (patient_id, service_id, date, time, notes) VALUES (%s,%s,%s,%s,%s)",
-                        (pid, sid, dt, tm, notes.toPlainText()), commit=True
-                    )
-                    dlg.accept()
-                    load()
-                except Exception as ex:
-                    QMessageBox.critical(self, "Error", f"Failed to add appointment: {ex}")
-                finally:
-                    db.close()
-
-            btn.clicked.connect(save)
-            dlg.exec()
-
-        add_btn.clicked.connect(on_add)
-
-    def filter_appointments(self):
-        """
-        Filter rows in the appointments table based on search query.
-        Excludes actions column from matching.
-        """
-        query = self.appointment_search.text().lower()
-        table = getattr(self, "table_appointments_ref", None)
-        if table is None:
-            return
-        for row in range(table.rowCount()):
-            match = False
-            for col in range(1, table.columnCount() - 1):
-                item = table.item(row, col)
-                if item and query in item.text().lower():
-                    match = True
-                    break
-            table.setRowHidden(row, not match)
-
-    def open_edit_appointment(self, appt_row):
-        """
-        Open the EditAppointmentDialog and refresh appointments
-        after the dialog is closed.
-        """
-        dlg = EditAppointmentDialog(appt_row, self)
-        dlg.exec()
-        self.switch_section("appointments")
-
-    def delete_appointment(self, aid):
-        """
-        Delete appointment after confirmation.
-        """
-        if aid is None:
-            return
-        ok = QMessageBox.question(self, "Confirm", "Delete this appointment?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-        if ok == QMessageBox.StandardButton.Yes:
-            db = DB()
-            try:
-                db.query("DELETE FROM appointments WHERE id=%s", (aid,), commit=True)
-                QMessageBox.information(self, "Deleted", "Appointment deleted.")
-                self.switch_section("appointments")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to delete appointment: {e}")
-            finally:
-                db.close()
-
-    # --------------------------------------------
-    # Services section
-    # --------------------------------------------
-    def render_services(self):
-        title = QLabel("Services")
-        title.setFont(QFont("Arial", 20, QFont.Weight.Bold))
-        self.content_layout.addWidget(title)
-
-        # Search bar with add button, aligned to the right
-        search_layout = QHBoxLayout()
-        search_layout.addStretch(1)
-        self.service_search = QLineEdit()
-        self.service_search.setPlaceholderText("Search services...")
-        self.service_search.setProperty("class", "search")
-        self.service_search.textChanged.connect(self.filter_services)
-        search_layout.addWidget(QLabel("🔍"))
-        search_layout.addWidget(self.service_search)
-        add_btn = QPushButton("Add Service")
-        add_btn.setStyleSheet("background-color:#02afd2;color:white;padding:8px;border-radius:6px;")
-        search_layout.addWidget(add_btn)
-        self.content_layout.addLayout(search_layout)
-
-        table = QTableWidget(0, 6)
-        table.setHorizontalHeaderLabels(["ID", "Code", "Name", "Description", "Price", "Actions"])
-        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.Fixed)
-        table.setColumnWidth(5, 60)
-        table.setColumnHidden(0, True)
-        table.setStyleSheet("QTableWidget { background:white; border:1px solid #dfeafc; }")
-        self.content_layout.addWidget(table)
-        self.table_services_ref = table
-
-        def load():
-            db = DB()
-            try:
-                rows = db.query("SELECT id, code, name, description, price FROM services ORDER BY id DESC")
-            finally:
-                db.close()
-            table.setRowCount(len(rows))
-            for i, r in enumerate(rows):
-                table.setItem(i, 0, QTableWidgetItem(safe_str(r.get("id", ""))))
-                table.setItem(i, 1, QTableWidgetItem(safe_str(r.get("code") or "")))
-                table.setItem(i, 2, QTableWidgetItem(safe_str(r.get("name") or "")))
-                table.setItem(i, 3, QTableWidgetItem(safe_str(r.get("description") or "")))
-                price_val = format_currency(r.get("price", 0))
-                table.setItem(i, 4, QTableWidgetItem(price_val))
-
-                edit_btn = QPushButton("✏️")
-                edit_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-                edit_btn.clicked.connect(partial(self.open_edit_service, r))
-                del_btn = QPushButton("🗑")
-                del_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-                del_btn.clicked.connect(partial(self.delete_service, r.get("id")))
-                holder_layout = QHBoxLayout()
-                holder_layout.setContentsMargins(0, 0, 0, 0)
-                holder_layout.setSpacing(6)
-                holder_layout.addWidget(edit_btn)
-                holder_layout.addWidget(del_btn)
-                holder = QFrame()
-                holder.setLayout(holder_layout)
-                table.setCellWidget(i, 5, holder)
-
-        load()
-
-        def on_add():
-            dlg = EditServiceDialog(parent=self)
-            dlg.exec()
-            load()
-
-        add_btn.clicked.connect(on_add)
-
-    def filter_services(self):
-        """
-        Filter rows in the services table based on search query.
-        Excludes actions column from matching.
-        """
-        query = self.service_search.text().lower()
-        table = getattr(self, "table_services_ref", None)
-        if table is None:
-            return
-        for row in range(table.rowCount()):
-            match = False
-            for col in range(1, table.columnCount() - 1):
-                item = table.item(row, col)
-                if item and query in item.text().lower():
-                    match = True
-                    break
-            table.setRowHidden(row, not match)
-
-    def open_edit_service(self, svc):
-        dlg = EditServiceDialog(svc, self)
-        dlg.exec()
-        self.switch_section("services")
-
-    def delete_service(self, sid):
-        if sid is None:
-            return
-        ok = QMessageBox.question(self, "Confirm", "Delete this service?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-        if ok == QMessageBox.StandardButton.Yes:
-            db = DB()
-            try:
-                db.query("DELETE FROM services WHERE id=%s", (sid,), commit=True)
-                QMessageBox.information(self, "Deleted", "Service deleted.")
-                self.switch_section("services")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to delete service: {e}")
-            finally:
-                db.close()
-
-    # --------------------------------------------
-    # Transactions section
-    # --------------------------------------------
-    def render_transactions(self):
-        top = QHBoxLayout()
-        title = QLabel("Transactions")
-        title.setFont(QFont("Arial", 20, QFont.Weight.Bold))
-        top.addWidget(title)
-        top.addStretch(1)
-        self.content_layout.addLayout(top)
-
-        db = DB()
-        try:
-            rows = db.query("""
-                SELECT t.id, t.paid_at, p.name AS patient, s.name AS service, t.amount
-                FROM transactions t
-                JOIN patients p ON t.patient_id=p.id
-                JOIN services s ON t.service_id=s.id
-                ORDER BY t.paid_at DESC
-            """)
-        finally:
-            db.close()
-
-        # Sub-top layout for total revenue and print button below title
-        sub_top = QHBoxLayout()
-        sub_top.addStretch(1)
-        total = 0.0
-        for r in rows:
-            amt = float(r.get("amount") or 0)
-            total += amt
-        total_lbl = QLabel(f"💰 Total Revenue: {format_currency(total)}")
-        total_lbl.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-        sub_top.addWidget(total_lbl)
-        print_btn = QPushButton("Print")
-        print_btn.setStyleSheet("background-color:#02afd2;color:white;padding:8px;border-radius:6px;")
-        print_btn.clicked.connect(lambda: self.print_content("transactions"))
-        sub_top.addWidget(print_btn)
-        self.content_layout.addLayout(sub_top)
-
-        table = QTableWidget(0, 5)
-        table.setHorizontalHeaderLabels(["ID", "Date", "Patient", "Service", "Amount"])
-        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        table.setColumnHidden(0, True)
-        table.setStyleSheet("QTableWidget { background:white; border:1px solid #dfeafc; }")
-        self.content_layout.addWidget(table)
-        self.table_transactions_ref = table
-
-        def load():
-            table.setRowCount(len(rows))
-            for i, r in enumerate(rows):
-                table.setItem(i, 0, QTableWidgetItem(safe_str(r.get("id", ""))))
-                table.setItem(i, 1, QTableWidgetItem(safe_str(r.get("paid_at", ""))))
-                table.setItem(i, 2, QTableWidgetItem(safe_str(r.get("patient", ""))))
-                table.setItem(i, 3, QTableWidgetItem(safe_str(r.get("service", ""))))
-                amt = float(r.get("amount") or 0)
-                table.setItem(i, 4, QTableWidgetItem(format_currency(amt)))
-
-        load()
-
-    def filter_transactions(self):
-        """
-        Filter rows in the transactions table based on search query.
-        """
-        query = getattr(self, "transaction_search", None)
-        if query is None:
-            return
-        query_text = query.text().lower()
-        table = getattr(self, "table_transactions_ref", None)
-        if table is None:
-            return
-        for row in range(table.rowCount()):
-            match = False
-            for col in range(1, table.columnCount()):
-                item = table.item(row, col)
-                if item and query_text in item.text().lower():
-                    match = True
-                    break
-            table.setRowHidden(row, not match)
-
-    # --------------------------------------------
-    # Profile section
-    # --------------------------------------------
-    def render_profile(self):
-        dlg = EditProfileDialog(self.staff_id, self.staff_name, self)
-        dlg.exec()
-
-    # --------------------------------------------
-    # Utilities
-    # --------------------------------------------
-    def get_count(self, table):
-        db = DB()
-        try:
-            res = db.query(f"SELECT COUNT(*) AS count FROM {table}")
-        finally:
-            db.close()
-        if res and isinstance(res, list) and len(res) > 0:
-            return res[0].get("count") or 0
-        return 0
-
-    def logout(self):
-        if self.portal_parent:
-            self.portal_parent.show()
+from PyQt6.QtWidgets import (
+    QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QFrame,
+    QTableView, QHeaderView, QLineEdit, QFormLayout, QStyledItemDelegate,
+    QComboBox, QTextEdit, QMessageBox, QDialog, QDateEdit, QApplication,
+    QStackedWidget, QProgressDialog, QSizePolicy, QListView, QStyle,
+)
+from PyQt6.QtGui import QFont, QFontMetrics, QColor, QPainter, QPen, QPixmap, QTextDocument
+from PyQt6.QtCore import (
+    Qt, QTimer, QAbstractTableModel, QAbstractListModel, QModelIndex, QSortFilterProxyModel, QAbstractProxyModel,
+    QRect, QRectF, QSize, QEvent, pyqtSignal,
+)
+from functools import lru_cache, partial
+from db import DB, hash_password
+from ui.styles import cached_font
+from ui.workers import run_task, submit
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, defaultdict
+from array import array
+from bisect import bisect_right
+import base64
+import math
+import re
+import sys
+import time
+from io import BytesIO
+
+# ----------------------------------------------------------------------
+# Utility helpers
+# ----------------------------------------------------------------------
+# Cell formatters run per visible cell on every repaint and per row when printing, over a
+# small set of distinct amounts and appointment slots, so their results are cached.
+@lru_cache(maxsize=4096)
+def format_currency(amount):
+    """
+    Format a numeric amount as Philippine Peso string.
+    Example: 1200.5 -> "₱1,200.50"
+    """
+    try:
+        return f"₱{float(amount):,.2f}"
+    except Exception:
+        return str(amount)
+
+def safe_str(val):
+    """Return a safe string for display in table cells."""
+    if val is None:
+        return ""
+    return str(val)
+
+def intern_names(rows, keys=("patient", "service")):
+    """Intern the name columns of `rows` in place, so a name repeated over many rows (the same
+    patient's visits, a popular service) is one string instead of a copy per row."""
+    for r in rows:
+        for key in keys:
+            val = r.get(key)
+            if isinstance(val, str):
+                r[key] = sys.intern(val)
+    return rows
+
+@lru_cache(maxsize=4096)
+def format_time_12h(time_str):
+    """Format time from HH:MM(:SS) to 12-hour with AM/PM."""
+    try:
+        if time_str:
+            dt = datetime.strptime(time_str, "%H:%M:%S") if ':' in time_str and time_str.count(':') == 2 else datetime.strptime(time_str, "%H:%M")
+            return dt.strftime("%I:%M %p")
+        return ""
+    except Exception:
+        return safe_str(time_str)
+
+def debounce(line_edit, fn, msec=150):
+    """Run fn() once typing in `line_edit` pauses for `msec`, instead of on every keystroke."""
+    timer = QTimer(line_edit)
+    timer.setSingleShot(True)
+    timer.setInterval(msec)
+    timer.timeout.connect(fn)
+    line_edit.textChanged.connect(lambda _: timer.start())
+
+@lru_cache(maxsize=32)
+def swatch_pixmap(color, w, h):
+    """Rounded legend swatch painted once per color/size; a QLabel shows it instead of a QFrame
+    carrying its own background stylesheet."""
+    ratio = QApplication.primaryScreen().devicePixelRatio()
+    pix = QPixmap(round(w * ratio), round(h * ratio))
+    pix.setDevicePixelRatio(ratio)
+    pix.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pix)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(QColor(color))
+    painter.drawRoundedRect(QRectF(0, 0, w, h), 3, 3)
+    painter.end()
+    return pix
+
+# Appointment status cell backgrounds, built once instead of per row
+STATUS_COLORS = {
+    "Pending": QColor("#ca8a04"),
+    "Confirmed": QColor("#1e40af"),
+    "Completed": QColor("#15803d"),
+    "Cancelled": QColor("#b91c1c"),
+}
+DEFAULT_STATUS_COLOR = QColor("#ffffff")
+
+# ----------------------------------------------------------------------
+# matplotlib is imported on the first chart, not when this module is imported
+# ----------------------------------------------------------------------
+_MPL = None
+
+def _mpl():
+    """Return (Figure, FigureCanvas), importing matplotlib on first use."""
+    global _MPL
+    if _MPL is None:
+        import matplotlib
+        matplotlib.use('Agg')  # Avoid backend issues
+        # static charts only: merge near-collinear path segments and draw long paths in chunks
+        matplotlib.rcParams.update({
+            'path.simplify': True,
+            'path.simplify_threshold': 1.0,
+            'agg.path.chunksize': 10000,
+        })
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        _MPL = (Figure, FigureCanvas)
+    return _MPL
+
+# ----------------------------------------------------------------------
+# Report cache
+# ----------------------------------------------------------------------
+# Printing the reports re-ran both GROUP BY queries and re-rendered both charts every time.
+# Results are kept for REPORT_TTL seconds, or until a save/delete here calls
+# bump_data_version(). The same version tells retained dashboard pages when to rebuild.
+# Rows can also be added from the patient portal, which doesn't bump this version, so the
+# home view's counts use a shorter DASHBOARD_TTL and the report rows (on screen and printed)
+# REPORT_PREFETCH_TTL.
+REPORT_TTL = 900
+DASHBOARD_TTL = 45
+REPORT_PREFETCH_TTL = 60  # report rows fetched in the background while the home view is open
+_REPORT_CACHE = {}
+_DATA_VERSION = 0
+
+def bump_data_version():
+    """Invalidate cached report data after a write that affects it."""
+    global _DATA_VERSION
+    _DATA_VERSION += 1
+    _REPORT_CACHE.clear()
+
+def memoize(key, fn, ttl=REPORT_TTL):
+    """Return fn()'s value cached under `key` for `ttl` seconds."""
+    now = time.monotonic()
+    hit = _REPORT_CACHE.get(key)
+    if hit is not None and now - hit[0] < ttl:
+        return hit[1]
+    value = fn()
+    _REPORT_CACHE[key] = (now, value)
+    return value
+
+# Service popularity (completed appointments) and revenue per service, already sorted by the
+# server; both go out in one round trip through db.query_many. They are answered from the
+# idx_appt_status_service and idx_tx_service_amount indexes (see db.create_tables).
+_REPORT_QUERIES = [
+    ("""
+        SELECT s.name, COUNT(*) AS count
+        FROM appointments a JOIN services s ON a.service_id = s.id
+        WHERE a.status = 'Completed'
+        GROUP BY s.id
+        ORDER BY count DESC
+    """, None),
+    ("""
+        SELECT s.name, COALESCE(SUM(t.amount), 0) AS revenue
+        FROM transactions t JOIN services s ON t.service_id = s.id
+        GROUP BY s.id
+        ORDER BY revenue DESC
+    """, None),
+]
+
+# Row queries for the appointments and services tables; a page appends its ORDER BY/LIMIT, a
+# single-row refresh its WHERE on the id
+APPOINTMENT_ROWS_SQL = (
+    "SELECT a.id, a.patient_id, a.service_id, a.date, a.time, a.notes, a.status, "
+    "p.name AS patient, s.name AS service FROM appointments a "
+    "JOIN patients p ON a.patient_id=p.id JOIN services s ON a.service_id=s.id "
+)
+SERVICE_ROWS_SQL = "SELECT id, code, name, description, price FROM services "
+
+
+def _like_escape(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+# A search made only of price characters ("2,500", "₱1,2") is matched against the price
+_PRICE_SEARCH_RE = re.compile(r"[₱\d.,]+")
+
+def service_search_where(query):
+    """
+    (where, params) for a server-side services search: the query may appear anywhere in the
+    code, name or description (LIKE '%query%'), the same substring match as the filter proxy.
+    A price search is matched against the price as the Price column shows it (format_currency:
+    "₱2,500.00"), the same text the filter proxy then checks, so the two never disagree.
+    """
+    if _PRICE_SEARCH_RE.fullmatch(query):
+        return "WHERE CONCAT('₱', FORMAT(price, 2, 'en_US')) LIKE %s", ("%" + _like_escape(query) + "%",)
+    like = "%" + _like_escape(query) + "%"
+    return "WHERE code LIKE %s OR name LIKE %s OR description LIKE %s", (like,) * 3
+
+# Upcoming appointments in (date, time, id) order, read along idx_appt_upcoming. The first page
+# starts today; later pages continue after the last row shown (keyset), so a "load more" never
+# re-reads the rows before it.
+_UPCOMING_SQL = (
+    "SELECT a.id, p.name as patient, s.name as service, a.date, a.time, a.status "
+    "FROM appointments a JOIN patients p ON a.patient_id=p.id "
+    "JOIN services s ON a.service_id=s.id "
+    "WHERE {after} AND a.status IN ('Confirmed', 'Pending') "
+    "ORDER BY a.date ASC, a.time ASC, a.id ASC LIMIT %s"
+)
+UPCOMING_PAGE = 10
+
+def upcoming_query(last=None, limit=UPCOMING_PAGE):
+    """(sql, params) for the page of upcoming appointments after row `last` (None: from today)."""
+    if last is None:
+        return _UPCOMING_SQL.format(after="a.date >= CURDATE()"), (limit,)
+    after = "(a.date > %s OR (a.date = %s AND (a.time > %s OR (a.time = %s AND a.id > %s))))"
+    d, t = last["date"], last["time"]
+    return _UPCOMING_SQL.format(after=after), (d, d, t, t, last["id"], limit)
+
+# Home view: the four table counts, the status breakdown (idx_appt_status_service) and the
+# first page of upcoming visits
+_DASHBOARD_QUERIES = [
+    ("""
+        SELECT (SELECT COUNT(*) FROM patients) AS patients,
+               (SELECT COUNT(*) FROM appointments) AS appointments,
+               (SELECT COUNT(*) FROM services) AS services,
+               (SELECT COUNT(*) FROM transactions) AS transactions
+    """, None),
+    ("""
+        SELECT status, COUNT(*) as count
+        FROM appointments
+        GROUP BY status
+    """, None),
+    upcoming_query(),
+]
+
+def _fetch_report_rows():
+    with DB() as db:
+        return _report_rows(db)
+
+def report_rows_cached():
+    """(pop_rows, rev_rows), shared with the prefetch the home view starts."""
+    return memoize(("report_rows", _DATA_VERSION), _fetch_report_rows, REPORT_PREFETCH_TTL)
+
+def _dashboard_payload():
+    with DB() as db:
+        count_rows, status_rows, upcoming = db.query_many(_DASHBOARD_QUERIES)
+    return {"counts": count_rows[0], "status_rows": status_rows, "upcoming": upcoming}
+
+def _report_rows(db):
+    """Return (pop_rows, rev_rows) for the reports section and its printout."""
+    pop_rows, rev_rows = db.query_many(_REPORT_QUERIES)
+    return pop_rows, rev_rows
+
+# The print charts are PNGs rendered at PRINT_DPI and placed at their figure size in inches
+# (CSS pixels, 96 per inch), so the printer gets PRINT_DPI detail instead of a screen-size
+# raster. Qt's SVG image plugin rasterises an <img> SVG at its default size before printing,
+# which came out blurry.
+PRINT_DPI = 200
+_PIE_SIZE = (6, 4.5)
+_BAR_SIZE = (8, 4)
+
+def _img_tag(data, size, alt):
+    """<img> for a base64 PNG chart at `size` inches, or a No Data line for an empty chart."""
+    if data is None:
+        return "<p>No Data</p>"
+    return '<img src="data:image/png;base64,{}" width="{}" height="{}" alt="{}">'.format(
+        data, round(size[0] * 96), round(size[1] * 96), alt)
+
+def _png_base64(fig):
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=PRINT_DPI)
+    return base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+def _pie_png(pop_rows):
+    """Service popularity pie for the printout, as a base64 PNG."""
+    Figure, _ = _mpl()
+    fig1 = Figure(figsize=_PIE_SIZE)
+    ax1 = fig1.add_subplot(111)
+    color_palette = [
+        "#0284c7", "#15803d", "#b45309", "#b91c1c",
+        "#1e40af", "#7e22ce", "#0f766e", "#c2410c"
+    ]
+    pop_names = [r['name'] for r in pop_rows]
+    pop_counts = [r['count'] for r in pop_rows]
+    if pop_names:
+        ax1.pie(
+            pop_counts,
+            colors=[color_palette[i % len(color_palette)] for i in range(len(pop_names))],
+            startangle=120,
+            autopct=lambda pct: f"{pct:.1f}%" if pct >= 5 else "",
+            textprops={'fontsize': 7, 'color': 'white', 'weight': 'bold'},
+        )
+        ax1.set_aspect("equal")
+    else:
+        ax1.text(0.5, 0.5, "No Data", ha="center", va="center", fontsize=9)
+    fig1.subplots_adjust(left=0.02, right=0.98, top=0.94, bottom=0.06)
+    return _png_base64(fig1)
+
+def _bar_png(rev_rows):
+    """Revenue per service bars for the printout, as a base64 PNG."""
+    Figure, _ = _mpl()
+    fig2 = Figure(figsize=_BAR_SIZE)
+    ax2 = fig2.add_subplot(111)
+    rev_names = [r['name'] for r in rev_rows]
+    rev_values = [float(r['revenue']) for r in rev_rows]
+    if rev_names:
+        # rows arrive ORDER BY revenue DESC
+        bars = ax2.bar(rev_names, rev_values, color="#02afd2", edgecolor="#17707c", width=0.55)
+        ax2.set_title("Revenue per Service", fontsize=11, fontweight='bold')
+        ax2.set_ylabel("Revenue (₱)", fontsize=7)
+        ax2.set_xlabel("Service", fontsize=7)
+        ax2.tick_params(axis="x", labelrotation=40, labelsize=6)
+        ax2.tick_params(axis="y", labelsize=6)
+        for bar in bars:
+            h = bar.get_height()
+            ax2.annotate(
+                f"₱{h:,.0f}",
+                xy=(bar.get_x() + bar.get_width() / 2, h),
+                xytext=(0, 2),
+                textcoords="offset points",
+                ha="center", va="bottom",
+                fontsize=6, color="#333"
+            )
+        fig2.subplots_adjust(bottom=0.32, left=0.12, right=0.96, top=0.9)
+    else:
+        ax2.text(0.5, 0.5, "No Data", ha="center", va="center", fontsize=9)
+    return _png_base64(fig2)
+
+def _report_print_data():
+    """
+    The report aggregates and both charts as base64 PNGs for the printout (None for a chart
+    with no rows, so an empty report never builds a Figure).
+    The rows come from report_rows_cached(), the same ones the reports page draws, so a
+    printout is never older than the charts on screen; the charts are redrawn only when those
+    rows have been fetched again. Returns (pop_rows, rev_rows, pie_data, bar_data).
+    """
+    rows = report_rows_cached()
+    charts = _REPORT_CACHE.get("print_charts")
+    if charts is None or charts[0] is not rows:
+        pop_rows, rev_rows = rows
+        # Both charts are drawn here, one after the other, on the _PRINT_POOL worker
+        charts = (
+            rows,
+            _pie_png(pop_rows) if pop_rows else None,
+            _bar_png(rev_rows) if rev_rows else None,
+        )
+        _REPORT_CACHE["print_charts"] = charts
+    return (*rows, charts[1], charts[2])
+
+# Builds the reports printout while the print dialog is still open
+_PRINT_POOL = ThreadPoolExecutor(max_workers=1)
+
+# ----------------------------------------------------------------------
+# Record tables
+# ----------------------------------------------------------------------
+class RecordsModel(QAbstractTableModel):
+    """
+    Read-only model over the dict rows returned by db.query.
+    Each column is (header, key, fmt); a cell's text is fmt(row[key]), worked out only when the
+    view paints that cell, so a reload is one model reset instead of an item object per cell.
+    Columns with key None (the actions column) are blank and painted by RowActionsDelegate.
+
+    With a `loader(offset, limit)` the model is paged like the patient dashboard's RowsModel:
+    set_rows gets a first page fetched with limit PAGE + 1 (the extra row only says whether more
+    exist) and the view pulls further pages through canFetchMore/fetchMore as it scrolls.
+
+    search_text(i) is what RecordsFilterProxy matches the search box against: row i's cell
+    texts (not the id) joined and case-folded, built the first time the row is filtered and
+    kept until the rows are replaced. search_matches() finds a query across all of them with
+    str.find over one packed string; once a table holds TRIGRAM_ROWS rows, searches of three or
+    more characters go through trigram_candidates() instead.
+    """
+    PAGE = 40
+    TRIGRAM_ROWS = 500
+
+    def __init__(self, columns, parent=None, loader=None):
+        super().__init__(parent)
+        self._cols = columns
+        self._loader = loader
+        self._rows = []
+        self._search = []
+        self._trigrams = defaultdict(set)  # trigram -> rows whose search_text contains it
+        self._indexed = 0  # rows [0, _indexed) are in _trigrams
+        self._reset_packed()
+        self._has_more = False
+        self.generation = 0  # bumped whenever the rows change; keys RecordsFilterProxy's cache
+
+    def _take(self, rows):
+        self._has_more = self._loader is not None and len(rows) > self.PAGE
+        self._rows = rows[:self.PAGE] if self._loader is not None else rows
+        self._search = [None] * len(self._rows)
+        self._trigrams = defaultdict(set)
+        self._indexed = 0
+        self._reset_packed()
+        self.generation += 1
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._take(rows)
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        try:
+            batch = self._loader(len(self._rows), self.PAGE + 1)
+        except Exception as e:
+            self._has_more = False
+            print(f"Error fetching more rows: {e}")
+            return
+        self._has_more = len(batch) > self.PAGE
+        batch = batch[:self.PAGE]
+        if batch:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(batch) - 1)
+            self._rows.extend(batch)
+            self._search.extend([None] * len(batch))
+            self.generation += 1
+            self.endInsertRows()
+
+    def row(self, i):
+        return self._rows[i]
+
+    def replace_id(self, rid, row):
+        """Swap in the re-fetched `row` for the loaded row with id `rid`; False if it isn't loaded."""
+        for i, r in enumerate(self._rows):
+            if r.get("id") == rid:
+                break
+        else:
+            return False
+        self._rows[i] = row
+        self._search[i] = None
+        # its search text may have changed: rebuild the trigram postings and packed string lazily
+        self._trigrams = defaultdict(set)
+        self._indexed = 0
+        self._reset_packed()
+        self.generation += 1
+        self.dataChanged.emit(self.index(i, 0), self.index(i, len(self._cols) - 1))
+        return True
+
+    def remove_id(self, rid):
+        """Drop the loaded row with id `rid` (after it was deleted); False if it isn't loaded."""
+        for i, r in enumerate(self._rows):
+            if r.get("id") == rid:
+                break
+        else:
+            return False
+        self.beginRemoveRows(QModelIndex(), i, i)
+        del self._rows[i]
+        del self._search[i]
+        # later rows shift up, so the trigram postings and the packed search string are rebuilt
+        # on the next search
+        self._trigrams = defaultdict(set)
+        self._indexed = 0
+        self._reset_packed()
+        self.generation += 1
+        self.endRemoveRows()
+        return True
+
+    def search_text(self, i):
+        text = self._search[i]
+        if text is None:
+            r = self._rows[i]
+            text = self._search[i] = "\x1f".join(
+                fmt(r.get(key)) for _, key, fmt in self._cols if key not in (None, "id")
+            ).casefold()
+        return text
+
+    def _reset_packed(self):
+        self._packed = ""  # "\0" + search_text(i) for every packed row, in row order
+        self._starts = array("l")  # offset of each packed row's "\0"
+
+    def search_matches(self, query):
+        """Rows whose search_text contains `query`, found with str.find over the packed search
+        strings: one C-level search per hit instead of an `in` test per row. Rows appended
+        since the last call are packed first."""
+        if len(self._starts) < len(self._rows):
+            offset = len(self._packed)
+            texts = [self.search_text(i) for i in range(len(self._starts), len(self._rows))]
+            for text in texts:
+                self._starts.append(offset)
+                offset += len(text) + 1
+            self._packed += "".join("\0" + text for text in texts)
+        if "\0" in query:
+            return []
+        packed, starts, hits = self._packed, self._starts, []
+        pos = packed.find(query)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            hits.append(i)
+            if i + 1 == len(starts):
+                break
+            pos = packed.find(query, starts[i + 1])  # resume at the next row
+        return hits
+
+    def trigram_candidates(self, query):
+        """Rows that contain every trigram of `query` (len >= 3): a superset of the rows whose
+        search_text contains it. Rows appended since the last call are indexed first."""
+        trigrams = self._trigrams
+        for i in range(self._indexed, len(self._rows)):
+            text = self.search_text(i)
+            for tri in {text[j:j + 3] for j in range(len(text) - 2)}:
+                trigrams[tri].add(i)
+        self._indexed = len(self._rows)
+        postings = []
+        for k in range(len(query) - 2):
+            rows = trigrams.get(query[k:k + 3])
+            if not rows:
+                return set()
+            postings.append(rows)
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._cols)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self._cols[section][0]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        _, key, fmt = self._cols[index.column()]
+        if key is None:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return fmt(self._rows[index.row()].get(key))
+        return None
+
+
+class AppointmentRecordsModel(RecordsModel):
+    """RecordsModel whose Status column is centred, small and coloured by STATUS_COLORS."""
+    STATUS_COL = 6
+
+    def __init__(self, columns, parent=None, loader=None):
+        super().__init__(columns, parent, loader)
+        self._status_font = cached_font("Arial", 9)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.column() == self.STATUS_COL:
+            if role == Qt.ItemDataRole.BackgroundRole:
+                return STATUS_COLORS.get(self._rows[index.row()].get("status"), DEFAULT_STATUS_COLOR)
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return Qt.AlignmentFlag.AlignCenter
+            if role == Qt.ItemDataRole.FontRole:
+                return self._status_font
+        return super().data(index, role)
+
+
+class RecordsFilterProxy(QSortFilterProxyModel):
+    """
+    Case-insensitive substring filter over a RecordsModel, one `in` test per row against
+    its cached search_text instead of a data() call per cell.
+    The matching rows of the last MATCH_CACHE queries are kept for the model's current
+    generation, so backspacing to an earlier query re-filters with set lookups only.
+    """
+    MATCH_CACHE = 64
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._query = ""
+        self._matches = OrderedDict()  # query -> frozenset of source rows
+        self._matches_gen = None
+        self._current = None  # (generation, query, rows) for the filter pass in progress
+
+    def _matching_rows(self):
+        model = self.sourceModel()
+        gen, query = model.generation, self._query
+        cur = self._current
+        if cur is not None and cur[0] == gen and cur[1] == query:
+            return cur[2]
+        if gen != self._matches_gen:
+            self._matches.clear()
+            self._matches_gen = gen
+        rows = self._matches.get(query)
+        if rows is None:
+            if len(query) >= 3 and model.rowCount() >= model.TRIGRAM_ROWS:
+                rows = frozenset(i for i in model.trigram_candidates(query) if query in model.search_text(i))
+            else:
+                rows = frozenset(model.search_matches(query))
+            self._matches[query] = rows
+            if len(self._matches) > self.MATCH_CACHE:
+                self._matches.popitem(last=False)
+        else:
+            self._matches.move_to_end(query)
+        self._current = (gen, query, rows)
+        return rows
+
+    def set_query(self, text):
+        query = text.casefold()
+        if query == self._query:
+            return  # e.g. a typo typed and erased within the debounce: every row keeps its state
+        self._query = query
+        self.invalidateRowsFilter()  # columns are never filtered; only re-test the rows
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        # an empty query (the usual state after clearing the box) accepts without a lookup
+        return not self._query or source_row in self._matching_rows()
+
+
+class FixedCellDelegate(QStyledItemDelegate):
+    """
+    Record-table cell typography without a stylesheet ::item rule: one prebuilt font and a
+    fixed size hint, so a model reset doesn't re-run style and text metrics for every cell.
+    """
+    SIZE = QSize(120, 22)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._font = QFont("Arial")
+        self._font.setPixelSize(10)
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        if index.data(Qt.ItemDataRole.FontRole) is None:
+            option.font = self._font
+
+    def sizeHint(self, option, index):
+        return self.SIZE
+
+
+class RowActionsDelegate(QStyledItemDelegate):
+    """
+    Paints the edit/delete pair in an actions cell and reports clicks by source row,
+    instead of a QFrame holding two QPushButtons for every row.
+    """
+    edit = pyqtSignal(int)
+    delete = pyqtSignal(int)
+
+    @staticmethod
+    def _halves(rect):
+        w = rect.width() // 2
+        return QRect(rect.x(), rect.y(), w, rect.height()), QRect(rect.x() + w, rect.y(), rect.width() - w, rect.height())
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        left, right = self._halves(option.rect)
+        painter.drawText(left, Qt.AlignmentFlag.AlignCenter, "✏️")
+        painter.drawText(right, Qt.AlignmentFlag.AlignCenter, "🗑")
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() != QEvent.Type.MouseButtonRelease or event.button() != Qt.MouseButton.LeftButton:
+            return False
+        row = model.mapToSource(index).row() if isinstance(model, QAbstractProxyModel) else index.row()
+        left, _ = self._halves(option.rect)
+        (self.edit if left.contains(event.position().toPoint()) else self.delete).emit(row)
+        return True
+
+# ----------------------------------------------------------------------
+# Chart Helpers
+# ----------------------------------------------------------------------
+class ChartWidget(QWidget):
+    """
+    Wrapper for matplotlib chart as a QWidget.
+    """
+    def __init__(self, fig, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0,0,0,0)
+        _, FigureCanvas = _mpl()
+        self.canvas = canvas = FigureCanvas(fig)
+        layout.addWidget(canvas)
+        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+class PieWidget(QWidget):
+    """
+    Pie of `counts` painted directly with QPainter, for the few-slice status overview where a
+    matplotlib Figure and canvas cost far more than the chart itself. Like
+    ax.pie(startangle=120) it starts at 120 degrees and runs counter-clockwise; slices of 5% or
+    more get a percent label.
+    """
+    START_ANGLE = 120
+
+    def __init__(self, counts, colors, parent=None):
+        super().__init__(parent)
+        self._slices, self._labels = self._summarize(counts, [QColor(c) for c in colors])
+        self._font = cached_font("Arial", 10, QFont.Weight.Bold)
+        self.setMinimumSize(220, 220)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+
+    def sizeHint(self):
+        return QSize(320, 320)
+
+    @classmethod
+    def _summarize(cls, counts, colors):
+        """Slice angles and percent labels, worked out once: they don't depend on the widget size.
+        Angles are in 1/16 degree; each edge is placed from the running total so no gaps appear."""
+        total = sum(counts)
+        slices, labels = [], []
+        if not total:
+            return slices, labels
+        done = 0
+        for count, color in zip(counts, colors):
+            start = cls.START_ANGLE * 16 + round(5760 * done / total)
+            done += count
+            span = cls.START_ANGLE * 16 + round(5760 * done / total) - start
+            slices.append((start, span, color))
+            pct = 100 * count / total
+            if pct >= 5:
+                labels.append((math.radians((start + span / 2) / 16), f"{pct:.1f}%"))
+        return slices, labels
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if not self._slices:
+            painter.setFont(cached_font("Arial", 12, QFont.Weight.Bold))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "No Data")
+            return
+        side = min(self.width(), self.height()) - 8
+        rect = QRectF((self.width() - side) / 2, (self.height() - side) / 2, side, side)
+
+        painter.setPen(QPen(QColor("white"), 1.5))
+        for start, span, color in self._slices:
+            painter.setBrush(color)
+            painter.drawPie(rect, start, span)
+
+        # percent labels sit at 0.6 of the radius, where ax.pie puts its autopct text
+        painter.setFont(self._font)
+        center, r = rect.center(), side * 0.3
+        for angle, text in self._labels:
+            x, y = center.x() + r * math.cos(angle), center.y() - r * math.sin(angle)
+            painter.drawText(QRectF(x - 40, y - 10, 80, 20), Qt.AlignmentFlag.AlignCenter, text)
+
+class UpcomingModel(QAbstractListModel):
+    """Upcoming appointment rows for the home view; UpcomingDelegate paints each as a card."""
+    def __init__(self, rows, parent=None):
+        super().__init__(parent)
+        self._rows = rows
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.UserRole:
+            return self._rows[index.row()]
+        return None
+
+
+class UpcomingDelegate(QStyledItemDelegate):
+    """
+    Paints an upcoming appointment as the notification card the home view used to build from a
+    QFrame, two layouts and four QLabels per row: patient/service/date lines on the left and a
+    status badge coloured like the appointments table on the right. The list view only paints
+    the cards in view.
+    """
+    GAP = 8  # space below each card
+    PAD = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._font = cached_font("Arial", 10)
+        self._bold = cached_font("Arial", 10, QFont.Weight.Bold)
+        self._fm = QFontMetrics(self._font)
+        self._bold_fm = QFontMetrics(self._bold)
+        self._line = max(self._fm.height(), self._bold_fm.height())
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), 3 * self._line + 2 * self.PAD + self.GAP)
+
+    def paint(self, painter, option, index):
+        r = index.data(Qt.ItemDataRole.UserRole)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        card = QRectF(option.rect).adjusted(0.5, 0.5, -0.5, -0.5 - self.GAP)
+        hover = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        painter.setPen(QColor("#bfdbfe" if hover else "#e6eefc"))
+        painter.setBrush(QColor("#f0f9ff" if hover else "white"))
+        painter.drawRoundedRect(card, 6, 6)
+
+        # Right: status badge
+        status = safe_str(r.get("status"))
+        bw, bh = self._bold_fm.horizontalAdvance(status) + 16, self._bold_fm.height() + 8
+        badge = QRectF(card.right() - self.PAD - bw, card.center().y() - bh / 2, bw, bh)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(STATUS_COLORS.get(status, DEFAULT_STATUS_COLOR))
+        painter.drawRoundedRect(badge, 4, 4)
+        painter.setFont(self._bold)
+        painter.setPen(QColor("white"))
+        painter.drawText(badge, Qt.AlignmentFlag.AlignCenter, status)
+
+        # Left: details, a bold caption then the value on each line
+        left = card.left() + self.PAD
+        width = badge.left() - 12 - left
+        lines = (
+            ("Patient: ", safe_str(r.get("patient"))),
+            ("Service: ", safe_str(r.get("service"))),
+            ("Date: ", f"{safe_str(r.get('date'))} {format_time_12h(r.get('time'))}"),
+        )
+        painter.setPen(QColor("#222"))
+        y = card.top() + self.PAD
+        for caption, value in lines:
+            cw = self._bold_fm.horizontalAdvance(caption)
+            painter.setFont(self._bold)
+            painter.drawText(QRectF(left, y, cw, self._line), Qt.AlignmentFlag.AlignVCenter, caption)
+            painter.setFont(self._font)
+            value = self._fm.elidedText(value, Qt.TextElideMode.ElideRight, max(0, int(width - cw)))
+            painter.drawText(QRectF(left + cw, y, width - cw, self._line), Qt.AlignmentFlag.AlignVCenter, value)
+            y += self._line
+        painter.restore()
+
+# ----------------------------------------------------------------------
+# Edit Patient Dialog
+# ----------------------------------------------------------------------
+class EditPatientDialog(QDialog):
+    """
+    Modal dialog to edit a patient's record.
+    - Allows changing name, age, sex, email, and optionally password.
+    - Uses db.DB to persist changes.
+    """
+    def __init__(self, patient, parent=None):
+        super().__init__(parent)
+        self.patient = patient
+        self.setWindowTitle("Edit Patient Record")
+        self.setFixedSize(420, 320)
+        layout = QFormLayout(self)
+
+        # Input fields
+        self.name_edit = QLineEdit(patient.get("name", ""))
+        self.age_edit = QLineEdit(str(patient.get("age") or ""))
+        self.sex_edit = QComboBox()
+        self.sex_edit.addItems(["Male", "Female", "Other"])
+        if patient.get("sex"):
+            try:
+                self.sex_edit.setCurrentText(patient["sex"])
+            except Exception:
+                pass
+        self.email_edit = QLineEdit(patient.get("email") or "")
+        self.pass_edit = QLineEdit()
+        self.pass_edit.setEchoMode(QLineEdit.EchoMode.Password)
+
+        # Layout rows
+        layout.addRow("Name:", self.name_edit)
+        layout.addRow("Age:", self.age_edit)
+        layout.addRow("Sex:", self.sex_edit)
+        layout.addRow("Email:", self.email_edit)
+        layout.addRow("New Password:", self.pass_edit)
+
+        save_btn = QPushButton("Save")
+        save_btn.setProperty("class", "primary")
+        save_btn.clicked.connect(self.save)
+        layout.addRow(save_btn)
+
+    def save(self):
+        """
+        Persist edited patient data to the database.
+        If a new password was provided, hash it before saving; otherwise the stored
+        password is left as it is.
+        """
+        new_pw = self.pass_edit.text().strip()
+        sql = "UPDATE patients SET name=%s, age=%s, sex=%s, email=%s"
+        params = [
+            self.name_edit.text(),
+            self.age_edit.text() or None,
+            self.sex_edit.currentText(),
+            self.email_edit.text(),
+        ]
+        if new_pw:
+            sql += ", password=%s"
+            params.append(hash_password(new_pw))
+        try:
+            with DB() as db:
+                db.query(sql + " WHERE id=%s", (*params, self.patient["id"]), commit=True)
+            bump_data_version()
+            QMessageBox.information(self, "Saved", "Patient record updated.")
+            self.accept()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save patient: {e}")
+
+# ----------------------------------------------------------------------
+# Edit Service Dialog
+# ----------------------------------------------------------------------
+class EditServiceDialog(QDialog):
+    """
+    Dialog for adding or editing a service.
+    - If `service` is None: it's an Add dialog.
+    - Otherwise: pre-fills fields and updates existing record.
+    """
+    def __init__(self, service=None, parent=None):
+        super().__init__(parent)
+        self.service = service
+        self.setWindowTitle("Edit Service" if service else "Add Service")
+        self.setFixedSize(420, 300)
+        layout = QFormLayout(self)
+
+        self.name_edit = QLineEdit()
+        self.desc_edit = QTextEdit()
+        self.price_edit = QLineEdit()
+        layout.addRow("Name:", self.name_edit)
+        layout.addRow("Description:", self.desc_edit)
+        layout.addRow("Price:", self.price_edit)
+
+        save_btn = QPushButton("Save")
+        save_btn.setProperty("class", "primary")
+        save_btn.clicked.connect(self.save)
+        layout.addRow(save_btn)
+        self.reload_from(service)
+
+    def reload_from(self, service):
+        """Fill the fields from `service`, so a kept dialog can be shown again for fresh data."""
+        self.service = service
+        self.name_edit.setText(service["name"] if service else "")
+        self.desc_edit.setPlainText(service["description"] if service else "")
+        self.price_edit.setText(str(service["price"]) if service else "")
+
+    def save(self):
+        """
+        Validate and insert/update the service record.
+        Generates a simple code for new services (based on name).
+        """
+        try:
+            price = float(self.price_edit.text())
+        except ValueError:
+            QMessageBox.warning(self, "Error", "Price must be numeric.")
+            return
+
+        try:
+            with DB() as db:
+                if self.service:
+                    db.query(
+                        "UPDATE services SET name=%s, description=%s, price=%s WHERE id=%s",
+                        (
+                            self.name_edit.text(),
+                            self.desc_edit.toPlainText(),
+                            price,
+                            self.service["id"],
+                        ),
+                        commit=True,
+                    )
+                else:
+                    # generate a code, make uppercase and replace spaces
+                    base_code = self.name_edit.text().strip().upper().replace(" ", "-")[:20]
+                    # attempt to insert using generated code; if duplicate codes exist, let DB handle unique constraint
+                    db.query(
+                        "INSERT INTO services (code, name, description, price) VALUES (%s,%s,%s,%s)",
+                        (base_code, self.name_edit.text(), self.desc_edit.toPlainText(), price),
+                        commit=True,
+                    )
+            bump_data_version()
+            QMessageBox.information(self, "Saved", "Service saved successfully.")
+            self.accept()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save service: {e}")
+
+# ----------------------------------------------------------------------
+# Edit Appointment Dialog
+# ----------------------------------------------------------------------
+class EditAppointmentDialog(QDialog):
+    """
+    Dialog for editing appointment status and notes.
+    When status is changed to 'Completed', a related transaction is auto-inserted
+    if it doesn't already exist for that patient/service pair.
+    """
+    def __init__(self, appointment, parent=None):
+        super().__init__(parent)
+        self.app = appointment
+        self.setWindowTitle("Edit Appointment")
+        self.setFixedSize(420, 320)
+        layout = QFormLayout(self)
+
+        self.status = QComboBox()
+        self.status.addItems(["Pending", "Confirmed", "Completed", "Cancelled"])
+        self.notes = QTextEdit()
+        layout.addRow("Status:", self.status)
+        layout.addRow("Notes:", self.notes)
+
+        save_btn = QPushButton("Save")
+        save_btn.setProperty("class", "primary")
+        save_btn.clicked.connect(self.save)
+        layout.addRow(save_btn)
+        self.reload_from(appointment)
+
+    def reload_from(self, appointment):
+        """Fill the fields from `appointment`, so a kept dialog can be shown again for fresh data."""
+        self.app = appointment
+        self.status.setCurrentText(self.app.get("status", "Pending"))
+        self.notes.setPlainText(self.app.get("notes") or "")
+
+    def save(self):
+        try:
+            with DB() as db:
+                new_status = self.status.currentText()
+                db.query(
+                    "UPDATE appointments SET status=%s, notes=%s WHERE id=%s",
+                    (new_status, self.notes.toPlainText(), self.app["id"]),
+                    commit=True,
+                )
+
+                # auto transaction insertion on completed: priced from the service and skipped when
+                # this patient already has a transaction for it, all in one server-side statement
+                if new_status == "Completed":
+                    pid, sid = self.app['patient_id'], self.app['service_id']
+                    db.query(
+                        "INSERT INTO transactions (patient_id, service_id, amount) "
+                        "SELECT %s, id, price FROM services WHERE id=%s "
+                        "AND NOT EXISTS (SELECT 1 FROM transactions WHERE patient_id=%s AND service_id=%s)",
+                        (pid, sid, pid, sid),
+                        commit=True
+                    )
+            bump_data_version()
+            QMessageBox.information(self, "Updated", "Appointment updated.")
+            self.accept()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to update appointment: {e}")
+
+# ----------------------------------------------------------------------
+# Edit Profile Dialog
+# ----------------------------------------------------------------------
+class EditProfileDialog(QDialog):
+    def __init__(self, staff_id, staff_name, parent=None):
+        super().__init__(parent)
+        self.staff_id = staff_id
+        self.staff_name = staff_name
+        self.setWindowTitle("My Profile")
+        self.setFixedSize(520, 400)
+        layout = QFormLayout(self)
+        layout.setContentsMargins(16, 16, 16, 16)
+        layout.setSpacing(10)
+
+        with DB() as db:
+            rows = db.query("SELECT * FROM staff WHERE id=%s", (self.staff_id,), fetch=True)
+            self.staff = rows[0] if rows else {}
+
+        self.name_edit = QLineEdit(self.staff.get("name") or "")
+        self.email_edit = QLineEdit(self.staff.get("email") or "")
+        self.phone_edit = QLineEdit(self.staff.get("phone") or "")
+        self.pass_edit = QLineEdit()
+        self.pass_edit.setEchoMode(QLineEdit.EchoMode.Password)
+
+        layout.addRow("Full Name:", self.name_edit)
+        layout.addRow("Email:", self.email_edit)
+        layout.addRow("Phone:", self.phone_edit)
+        layout.addRow("New Password:", self.pass_edit)
+
+        save_btn = QPushButton("Save Changes")
+        save_btn.setStyleSheet("background-color:#02afd2;color:white;padding:10px;border-radius:6px;")
+        save_btn.clicked.connect(self.save_profile)
+        layout.addRow(save_btn)
+
+    def save_profile(self):
+        new_pw = self.pass_edit.text().strip()
+        hashed = hash_password(new_pw) if new_pw else self.staff.get("password")
+        try:
+            with DB() as db:
+                db.query(
+                    "UPDATE staff SET name=%s, email=%s, phone=%s, password=%s WHERE id=%s",
+                    (self.name_edit.text(), self.email_edit.text(), self.phone_edit.text(), hashed, self.staff_id),
+                    commit=True,
+                )
+            QMessageBox.information(self, "Saved", "Profile updated successfully.")
+            self.staff_name = self.name_edit.text()
+            self.accept()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save profile: {e}")
+
+# ----------------------------------------------------------------------
+# Staff Dashboard - Main Widget
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# Dashboard stylesheet, scoped to the dashboard window so it never leaks into the portal
+# ----------------------------------------------------------------------
+_STYLESHEET = """
+    QWidget { background-color: #f7fdff; font-family: Arial, sans-serif; color: #222; }
+    QFrame#sidebar { background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #02afd2, stop:1 #0298b8); border-right: none; }
+    QLabel { background: transparent; }
+    QPushButton.nav { text-align:left; padding:10px 14px; border:none; color:white; background:transparent; }
+    QPushButton.nav:hover { background:#0298b8; }
+    QPushButton.nav:pressed { background:#02afd2; }
+    QPushButton.primary { background-color:#02afd2; color:white; padding:8px; border-radius:6px; }
+    QTableView { 
+        background:white; 
+        border:1px solid #dfeafc; 
+        gridline-color:#eaf4ff; 
+        alternate-background-color: #f9fafb;
+    }
+    QHeaderView::section { background:#e9faff; padding:6px; font-weight:600; border:none; }
+    QLineEdit, QTextEdit, QComboBox { background:white; border:1px solid #dfeafc; padding:6px; border-radius:4px; }
+    QFrame.card { 
+        background:white; 
+        border:1px solid #e6eefc; 
+        border-radius:8px; 
+        box-shadow: 0 2px 6px rgba(0,0,0,0.15);
+    }
+    QLineEdit.search { max-width: 200px; }
+    QTableWidgetItem.status { padding: 4px 10px; border-radius: 4px; }
+    QFrame.notification { 
+        background:white; 
+        border:1px solid #e6eefc; 
+        border-radius:6px; 
+        padding:8px; 
+        margin-bottom:8px;
+    }
+    QFrame.notification:hover { 
+        background:#f0f9ff; 
+        border-color:#bfdbfe;
+    }
+    QLabel.status { 
+        padding:4px 8px; 
+        border-radius:4px; 
+        font-size:10px; 
+        color:#333; 
+    }
+    /* Home stat cards, picked by their statCard property */
+    QFrame[statCard] { color: white; border-radius:8px; }
+    QFrame[statCard] QLabel { color: white; }
+    QFrame[statCard="0"] { background: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 #02afd2, stop:1 #5ecbe0); }
+    QFrame[statCard="1"] { background: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 #16a34a, stop:1 #86efac); }
+    QFrame[statCard="2"] { background: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 #fbbf24, stop:1 #fde68a); }
+    QFrame[statCard="3"] { background: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 #ef4444, stop:1 #fca5a5); }
+"""
+
+class StaffDashboard(QWidget):
+    """
+    Main staff dashboard window. Contains:
+    - Sidebar navigation
+    - Content area with sections: Home, Patients, Appointments, Services, Transactions, Reports, Profile
+    """
+    _NAV_ACTIVE = "background:#02afd2; color:white; text-align:left; padding:10px 12px;"
+    _NAV_INACTIVE = "QPushButton { text-align:left; padding:10px 12px; background:transparent; color: white; }"
+
+    def __init__(self, staff_id, staff_name, portal_parent=None):
+        super().__init__()
+        self._active_section = None  # nav key currently styled active
+        self.staff_id = staff_id
+        self.staff_name = staff_name
+        self.portal_parent = portal_parent
+        self._detached = []  # widgets taken out of the content area, destroyed in one idle pass
+        self._pages = {}  # section key -> page kept in self.stack once built
+        self._refreshers = {}  # section key -> load() for pages that re-query in place
+        self._edit_dialogs = OrderedDict()  # (dialog class, row id) -> dialog closed without saving
+
+        # Window properties
+        self.setWindowTitle("🦷 PureDent Clinic — Staff Dashboard")
+        self.resize(1200, 700)
+        self.setMinimumSize(1000, 600)
+
+        # Styling
+        self.setStyleSheet(_STYLESHEET)
+
+        # initialize UI and center window
+        self.init_ui()
+        self.center_window()
+
+    # --------------------------------------------
+    # Window utilities
+    # --------------------------------------------
+    def center_window(self):
+        """
+        Center the window on the primary screen.
+        """
+        try:
+            screen_geo = QApplication.primaryScreen().availableGeometry().center()
+            frame = self.frameGeometry()
+            frame.moveCenter(screen_geo)
+            self.move(frame.topLeft())
+        except Exception:
+            # fallback: do nothing if centering fails
+            pass
+
+    def print_content(self, section):
+        """
+        Generate printable HTML for the specified section and open print dialog.
+        """
+        from PyQt6.QtPrintSupport import QPrinter, QPrintDialog  # loaded on first print only
+
+        if section == "reports":
+            # a cancelled dialog still leaves the rows and charts in the report cache
+            pending = _PRINT_POOL.submit(_report_print_data)
+
+        # Only the reports printout embeds chart images; the text-only transactions table
+        # doesn't need to be laid out at printer resolution
+        mode = QPrinter.PrinterMode.HighResolution if section == "reports" else QPrinter.PrinterMode.ScreenResolution
+        printer = QPrinter(mode)
+        dialog = QPrintDialog(printer, self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+
+        parts = ["""
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; }
+                h1 { color: #02afd2; }
+                table { width: 100%; border-collapse: collapse; margin-top: 10px; }
+                th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+                th { background-color: #e9faff; }
+                img { max-width: 100%; }
+            </style>
+        </head>
+        <body>
+        """]
+
+        if section == "reports":
+            pop_rows, rev_rows, pie_data, bar_data = pending.result()
+
+            parts.append("""
+            <h1>Reports</h1>
+            <h2>Service Popularity</h2>
+            {}
+            <table>
+                <tr><th>Service</th><th>Appointments</th></tr>
+            """.format(_img_tag(pie_data, _PIE_SIZE, "Service Popularity Pie Chart")))
+            parts.extend(
+                f"<tr><td>{safe_str(row['name'])}</td><td>{safe_str(row['count'])}</td></tr>"
+                for row in pop_rows
+            )
+            parts.append("""
+            </table>
+            <h2>Revenue per Service</h2>
+            {}
+            <table>
+                <tr><th>Service</th><th>Revenue (₱)</th></tr>
+            """.format(_img_tag(bar_data, _BAR_SIZE, "Revenue Bar Chart")))
+            parts.extend(
+                f"<tr><td>{safe_str(row['name'])}</td><td>{format_currency(row['revenue'])}</td></tr>"
+                for row in rev_rows
+            )
+            parts.append("</table>")
+
+        elif section == "transactions":
+            with DB() as db:
+                total = db.query("SELECT COALESCE(SUM(amount), 0) AS total FROM transactions", fetch=True)[0]["total"]
+                fmt_amount = "₱{:,.2f}".format
+                parts.append(f"""
+                <h1>Transactions</h1>
+                <p><strong>Total Revenue:</strong> {format_currency(total)}</p>
+                <table>
+                    <tr><th>Date</th><th>Patient</th><th>Service</th><th>Amount</th></tr>
+                """)
+                sql = """
+                    SELECT t.paid_at, p.name, s.name, t.amount
+                    FROM transactions t
+                    JOIN patients p ON t.patient_id=p.id
+                    JOIN services s ON t.service_id=s.id
+                    ORDER BY t.paid_at DESC
+                """
+                # rows are streamed off the cursor straight into the HTML parts
+                row_tmpl = "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>".format
+                parts.extend(
+                    row_tmpl(safe_str(paid_at), safe_str(patient), safe_str(service), fmt_amount(amount or 0))
+                    for paid_at, patient, service, amount in db.iter_rows(sql)
+                )
+                parts.append("</table>")
+
+        parts.append("</body></html>")
+        html = "".join(parts)
+
+        # Lay out and print on a pool thread so the window keeps repainting meanwhile
+        progress = QProgressDialog("Printing...", None, 0, 0, self)
+        progress.setWindowTitle("Print")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.show()
+
+        def job():
+            # unparented and used only on the worker thread
+            document = QTextDocument()
+            document.setHtml(html)
+            document.print(printer)
+
+        def failed(msg):
+            progress.close()
+            QMessageBox.critical(self, "Error", f"Printing failed: {msg}")
+
+        run_task(job, lambda _: progress.close(), failed)
+
+    # --------------------------------------------
+    # UI Initialization
+    # --------------------------------------------
+    def init_ui(self):
+        outer = QHBoxLayout(self)
+        outer.setContentsMargins(0, 0, 0, 0)
+        outer.setSpacing(0)
+
+        # Sidebar (left)
+        sidebar = QFrame()
+        sidebar.setObjectName("sidebar")
+        sidebar.setFixedWidth(260)
+        s_layout = QVBoxLayout(sidebar)
+        s_layout.setContentsMargins(18, 18, 18, 18)
+        s_layout.setSpacing(5)
+
+        # Brand label
+        brand = QLabel("🦷 PureDent\nClinic")
+        brand.setFont(cached_font("Arial", 22, QFont.Weight.Bold))
+        brand.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignHCenter)
+        brand.setStyleSheet("""
+            color: white;
+            background: transparent;
+            margin-top: 4px;
+            margin-bottom: 2px;
+        """)
+        s_layout.addWidget(brand, alignment=Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignHCenter)
+
+        # Sub-brand label
+        sub = QLabel("Staff Portal")
+        sub.setFont(cached_font("Arial", 10, QFont.Weight.DemiBold))
+        sub.setStyleSheet("""
+            color: rgba(255, 255, 255, 0.9);
+            background: transparent;
+            margin-top: 0px;
+        """)
+        s_layout.addWidget(sub, alignment=Qt.AlignmentFlag.AlignHCenter)
+
+        s_layout.addSpacing(8)
+
+        # Navigation buttons
+        self.nav_buttons = {}
+        nav_items = [
+            ("Home", "home"),
+            ("Patients", "patients"),
+            ("Appointments", "appointments"),
+            ("Services", "services"),
+            ("Transactions", "transactions"),
+            ("Reports", "reports"),
+            ("Profile", "profile"),
+            ("Logout", "logout"),
+        ]
+        for label, key in nav_items:
+            btn = QPushButton(label)
+            btn.setProperty("class", "nav")
+            btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn.setFont(cached_font("Arial", 11))
+            btn.clicked.connect(partial(self.switch_section, key))
+            btn.setStyleSheet(self._NAV_INACTIVE)
+            s_layout.addWidget(btn)
+            self.nav_buttons[key] = btn
+
+        s_layout.addStretch(1)
+        # Footer showing logged in staff
+        logged_label = QLabel(f"Logged in: {self.staff_name}")
+        logged_label.setFont(cached_font("Arial", 10))
+        logged_label.setStyleSheet("color: rgba(255,255,255,0.95);")
+        s_layout.addWidget(logged_label)
+        s_layout.addSpacing(4)
+
+        outer.addWidget(sidebar)
+
+        # Main content wrapper (right)
+        content_wrapper = QFrame()
+        wrapper_layout = QVBoxLayout(content_wrapper)
+        wrapper_layout.setContentsMargins(0, 0, 0, 0)
+        self.stack = QStackedWidget()
+        wrapper_layout.addWidget(self.stack)
+        outer.addWidget(content_wrapper, 1)
+
+        # Open default section
+        self.switch_section("home")
+
+    # --------------------------------------------
+    # Content management and navigation
+    # --------------------------------------------
+    def show_page(self, section):
+        """
+        Show the page for `section`, building it on the first visit. Pages are kept in the
+        stack afterwards: pages with a refresher (the record tables, and reports, which redraws
+        its charts in place) run it when revisited, while home is rebuilt only after
+        bump_data_version().
+        """
+        page = self._pages.get(section)
+        if page is not None:
+            if section in self._refreshers:
+                self._refreshers[section]()
+            elif page.property("data_version") != _DATA_VERSION:
+                self.stack.removeWidget(page)
+                self._detach(page)
+                page = None
+        if page is None:
+            page = self._build_page(section)
+            self._pages[section] = page
+            self.stack.addWidget(page)
+        self.stack.setCurrentWidget(page)
+
+    def _build_page(self, section):
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(12)
+        # render_* add their sections to self.content_layout
+        self.content_layout = layout
+        match section:
+            case "patients":
+                self.render_patients()
+            case "appointments":
+                self.render_appointments()
+            case "services":
+                self.render_services()
+            case "transactions":
+                self.render_transactions()
+            case "reports":
+                self.render_reports()
+            case _:
+                self.render_home()
+        page.setProperty("data_version", _DATA_VERSION)
+        return page
+
+    def _detach(self, widget):
+        widget.setParent(None)
+        if not self._detached:
+            QTimer.singleShot(0, self._release_detached)
+        self._detached.append(widget)
+
+    def _release_detached(self):
+        # Parentless widgets are owned by their Python references, so dropping the list destroys them
+        self._detached.clear()
+
+    def switch_section(self, section):
+        """
+        Main navigation handler — switches content based on section key.
+        """
+        try:
+            # Restyle only the buttons whose state changes: the previous active one and the new one
+            if section != self._active_section:
+                if self._active_section in self.nav_buttons:
+                    self.nav_buttons[self._active_section].setStyleSheet(self._NAV_INACTIVE)
+                if section in self.nav_buttons:
+                    self.nav_buttons[section].setStyleSheet(self._NAV_ACTIVE)
+                self._active_section = section
+
+            match section:
+                case "patients" | "appointments" | "services" | "transactions" | "reports":
+                    self.show_page(section)
+                case "profile":
+                    self.render_profile()
+                case "logout":
+                    self.logout()
+                case _:
+                    self.show_page("home")
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            QMessageBox.critical(self, "Error", f"Navigation error: {e}")
+
+    # --------------------------------------------
+    # Home (Dashboard) section
+    # --------------------------------------------
+    def render_home(self):
+        """
+        Dashboard home view.
+        Shows summary cards, upcoming appointments (left), and appointment status pie (right).
+        """
+        # Header row
+        top = QHBoxLayout()
+        title = QLabel("Dashboard")
+        title.setFont(cached_font("Arial", 24, QFont.Weight.Bold))
+        top.addWidget(title)
+        top.addStretch(1)
+        welcome = QLabel(f"Hi, Dr. {self.staff_name.split()[0]}")
+        welcome.setFont(cached_font("Arial", 12))
+        top.addWidget(welcome)
+        self.content_layout.addLayout(top)
+
+        # Stats cards row; values arrive in _populate_dashboard
+        cards_row = QHBoxLayout()
+        cards_row.setSpacing(12)
+        stats = [
+            ("Total Patients", "patients"),
+            ("Appointments", "appointments"),
+            ("Services", "services"),
+            ("Transactions", "transactions"),
+        ]
+        self._stat_labels = {}
+        for i, (label, key) in enumerate(stats):
+            card = QFrame()
+            card.setProperty("class", "card")
+            card.setProperty("statCard", str(i))  # gradient comes from _STYLESHEET
+            card.setFixedHeight(120)
+            c_layout = QVBoxLayout(card)
+            c_layout.setContentsMargins(12, 8, 12, 8)
+            lbl = QLabel(label)
+            lbl.setFont(cached_font("Arial", 14))
+            c_layout.addWidget(lbl)
+            val_lbl = QLabel("…")
+            val_lbl.setFont(cached_font("Arial", 24, QFont.Weight.Bold))
+            self._stat_labels[key] = val_lbl
+            c_layout.addStretch(1)
+            c_layout.addWidget(val_lbl, alignment=Qt.AlignmentFlag.AlignRight)
+            cards_row.addWidget(card)
+        self.content_layout.addLayout(cards_row)
+
+        # ---- Upcoming + Pie row ----
+        bottom = QHBoxLayout()
+        bottom.setSpacing(12)
+
+        # Upcoming appointments (left)
+        upcoming_frame = QFrame()
+        upcoming_frame.setProperty("class", "card")
+        upcoming_layout = QVBoxLayout(upcoming_frame)
+        upcoming_layout.setContentsMargins(12, 12, 12, 12)
+        upcoming_title = QLabel("Upcoming Appointments")
+        upcoming_title.setFont(cached_font("Arial", 14, QFont.Weight.Bold))
+        upcoming_layout.addWidget(upcoming_title)
+        self._upcoming_layout = upcoming_layout
+        bottom.addWidget(upcoming_frame, 1)
+
+        # Appointment Status Overview (right)
+        status_frame = QFrame()
+        status_frame.setProperty("class", "card")
+        status_layout = QVBoxLayout(status_frame)
+        status_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        status_title = QLabel("Appointment Status Overview")
+        status_title.setFont(cached_font("Arial", 14, QFont.Weight.Bold))
+        status_layout.addWidget(status_title, alignment=Qt.AlignmentFlag.AlignCenter)
+        self._status_layout = status_layout
+        bottom.addWidget(status_frame, 1)
+
+        self.content_layout.addLayout(bottom)
+        self.content_layout.addStretch(1)
+
+        # The page shows right away with placeholder values; the queries run on the pool
+        self._home_token = token = object()
+        run_task(lambda: (token, self.fetch_dashboard_payload()), self._populate_dashboard,
+                 lambda err: print(f"Error fetching dashboard data: {err}"))
+
+    def _populate_dashboard(self, result):
+        token, payload = result
+        if token is not self._home_token:
+            return  # the home page was rebuilt while this request was in flight
+        for key, lbl in self._stat_labels.items():
+            lbl.setText(str(payload["counts"][key]))
+        self.populate_upcoming_notifications(self._upcoming_layout, payload["upcoming"])
+        self.render_appointment_status_pie(self._status_layout, payload["status_rows"])
+        # Reports is the likely next stop; have its rows ready before it is opened
+        if "reports" not in self._pages:
+            run_task(report_rows_cached, lambda _: None,
+                     lambda err: print(f"Error prefetching reports: {err}"))
+
+    def fetch_dashboard_payload(self):
+        """
+        Everything the home view shows, from one connection and one round trip:
+        {"counts": {table: n}, "status_rows": [{status, count}], "upcoming": [appointment rows]}.
+        Reused for DASHBOARD_TTL seconds unless bump_data_version() runs in between.
+        """
+        return memoize(("dashboard", _DATA_VERSION), _dashboard_payload, DASHBOARD_TTL)
+
+    def render_appointment_status_pie(self, parent_layout, rows):
+        """
+        Displays a solid, fully-colored pie chart (right)
+        with visible percentages and horizontal color bars (left).
+        `rows` are the status/count rows from fetch_dashboard_payload.
+        """
+        counts_map = {r['status']: r['count'] for r in rows}
+
+        # Define consistent order + darker color palette
+        order = ["Pending", "Confirmed", "Completed", "Cancelled"]
+        color_map = {
+            "Pending": "#ca8a04",  # darker yellow
+            "Confirmed": "#1e40af",  # darker blue
+            "Completed": "#15803d",  # darker green
+            "Cancelled": "#b91c1c"   # darker red
+        }
+
+        # Sort and filter
+        sorted_statuses, sorted_counts, sorted_colors = [], [], []
+        for k in order:
+            if k in counts_map:
+                sorted_statuses.append(k)
+                sorted_counts.append(counts_map[k])
+                sorted_colors.append(color_map[k])
+
+        chart_row = QHBoxLayout()
+        chart_row.setSpacing(20)
+        chart_row.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # ---------------------- STATUS BARS ----------------------
+        left_layout = QVBoxLayout()
+        left_layout.setSpacing(8)
+        left_layout.setContentsMargins(6, 6, 6, 6)
+
+        if sorted_statuses:
+            for status, color in zip(sorted_statuses, sorted_colors):
+                bar_container = QHBoxLayout()
+                bar_container.setSpacing(6)
+
+                color_bar = QLabel()
+                color_bar.setPixmap(swatch_pixmap(color, 28, 10))
+
+                label = QLabel(status)
+                label.setFont(cached_font("Arial", 9, QFont.Weight.DemiBold))
+                label.setStyleSheet("color: #333;")
+
+                bar_container.addWidget(color_bar)
+                bar_container.addWidget(label)
+                bar_container.addStretch(1)
+                left_layout.addLayout(bar_container)
+        else:
+            lbl = QLabel("No data available")
+            lbl.setFont(cached_font("Arial", 9))
+            left_layout.addWidget(lbl)
+
+        left_layout.addStretch(1)
+        chart_row.addLayout(left_layout, 1)
+
+        # ---------------------- PIE CHART ----------------------
+        pie_layout = QVBoxLayout()
+        pie_layout.setSpacing(6)
+        pie_layout.setContentsMargins(0, 0, 0, 0)
+        pie_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        pie_layout.addWidget(PieWidget(sorted_counts, sorted_colors), alignment=Qt.AlignmentFlag.AlignCenter)
+
+        chart_row.addLayout(pie_layout, 2)
+
+        # Add to parent
+        parent_layout.addLayout(chart_row)
+
+    def populate_upcoming_notifications(self, parent_layout, rows_upcoming):
+        """
+        Displays upcoming appointments as notification-style cards.
+        Shows only Confirmed and Pending statuses with colored badges.
+        """
+
+        if not rows_upcoming:
+            no_data = QLabel("No upcoming appointments")
+            no_data.setFont(cached_font("Arial", 10))
+            parent_layout.addWidget(no_data)
+            parent_layout.addStretch(1)
+            return
+
+        view = QListView()
+        view.setModel(UpcomingModel(rows_upcoming, view))
+        view.setItemDelegate(UpcomingDelegate(view))
+        view.setUniformItemSizes(True)
+        view.setSelectionMode(QListView.SelectionMode.NoSelection)
+        view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        view.setFrameShape(QFrame.Shape.NoFrame)
+        view.setMouseTracking(True)  # hover highlight
+        parent_layout.addWidget(view)
+
+    # --------------------------------------------
+    # Reports section
+    # --------------------------------------------
+    def render_reports(self):
+        """
+        Reports section:
+        - Left: Legend with colored squares, service names, counts in a straight line
+        - Right: Clean full-color pie chart (no inside labels for small segments)
+        - Below: Revenue per Service bar chart
+        """
+        top = QHBoxLayout()
+        title = QLabel("Reports")
+        title.setFont(cached_font("Arial", 20, QFont.Weight.Bold))
+        top.addWidget(title)
+        top.addStretch(1)
+        print_btn = QPushButton("Print")
+        print_btn.setProperty("class", "primary")
+        print_btn.clicked.connect(lambda: self.print_content("reports"))
+        top.addWidget(print_btn)
+        self.content_layout.addLayout(top)
+
+        # Outer layout
+        report_layout = QVBoxLayout()
+        report_layout.setSpacing(18)
+
+        # ---------------- PIE CHART SECTION ----------------
+        pie_card = QFrame()
+        pie_card.setProperty("class", "card")
+        pie_layout = QHBoxLayout(pie_card)
+        pie_layout.setContentsMargins(10, 10, 10, 10)
+        pie_layout.setSpacing(14)
+        self._reports_pie_layout = pie_layout
+
+        # Left legend, replaced on every redraw
+        self._reports_legend = QFrame()
+        pie_layout.addWidget(self._reports_legend, 1)
+
+        # The Figures are built once; _draw_reports clears and redraws their axes in place
+        Figure, _ = _mpl()
+        fig1 = Figure(figsize=(6, 4.5))
+        self._reports_ax1 = fig1.add_subplot(111)
+        self._reports_chart1 = ChartWidget(fig1)
+        pie_layout.addWidget(self._reports_chart1, 2)
+        report_layout.addWidget(pie_card, 1)
+
+        # ---------------- BAR CHART SECTION ----------------
+        bar_card = QFrame()
+        bar_card.setProperty("class", "card")
+        bar_layout = QVBoxLayout(bar_card)
+        bar_layout.setContentsMargins(12, 12, 12, 12)
+        bar_layout.setSpacing(6)
+
+        fig2 = Figure(figsize=(8, 4))
+        self._reports_ax2 = fig2.add_subplot(111)
+        self._reports_chart2 = ChartWidget(fig2)
+        bar_layout.addWidget(self._reports_chart2)
+        report_layout.addWidget(bar_card, 2)
+
+        self.content_layout.addLayout(report_layout)
+        self.content_layout.addStretch(1)
+
+        self._draw_reports()
+        self._refreshers["reports"] = self._refresh_reports
+
+    def _refresh_reports(self):
+        if self._reports_version != _DATA_VERSION:
+            self._draw_reports()
+
+    def _draw_reports(self):
+        """Query the report aggregates and redraw the legend and both charts on the kept Figures."""
+        self._reports_version = _DATA_VERSION
+        pop_rows, rev_rows = report_rows_cached()
+        pop_names = [r['name'] for r in pop_rows]
+        pop_counts = [r['count'] for r in pop_rows]
+        rev_names = [r['name'] for r in rev_rows]
+        rev_values = [float(r['revenue']) for r in rev_rows]
+
+        color_palette = [
+            "#0284c7", "#15803d", "#b45309", "#b91c1c",
+            "#1e40af", "#7e22ce", "#0f766e", "#c2410c"
+        ]
+
+        # Left legend
+        legend = QFrame()
+        legend.setStyleSheet("QFrame { background: transparent; }")
+        legend_box = QVBoxLayout(legend)
+        legend_box.setContentsMargins(0, 0, 0, 0)
+        legend_box.setSpacing(5)
+        legend_label = QLabel("Service Popularity")
+        legend_label.setFont(cached_font("Arial", 12, QFont.Weight.Bold))
+        legend_box.addWidget(legend_label)
+
+        if pop_names:
+            for i, (name, count) in enumerate(zip(pop_names, pop_counts)):
+                color = color_palette[i % len(color_palette)]
+
+                row = QHBoxLayout()
+                row.setSpacing(8)
+
+                # Color square
+                square = QLabel()
+                square.setPixmap(swatch_pixmap(color, 14, 14))
+
+                # Name label
+                lbl_name = QLabel(name)
+                lbl_name.setFont(cached_font("Arial", 9))
+
+                # Count label
+                lbl_value = QLabel(f"{count}")
+                lbl_value.setFont(cached_font("Arial", 9))
+                lbl_value.setStyleSheet("color:#555;")
+
+                row.addWidget(square)
+                row.addWidget(lbl_name)
+                row.addStretch(1)
+                row.addWidget(lbl_value)
+                legend_box.addLayout(row)
+        else:
+            no_lbl = QLabel("No data available")
+            no_lbl.setFont(cached_font("Arial", 9))
+            legend_box.addWidget(no_lbl)
+
+        legend_box.addStretch(1)
+        self._reports_pie_layout.replaceWidget(self._reports_legend, legend)
+        self._detach(self._reports_legend)
+        self._reports_legend = legend
+
+        # Right pie chart
+        ax1 = self._reports_ax1
+        ax1.clear()
+        if pop_names:
+            ax1.pie(
+                pop_counts,
+                colors=[color_palette[i % len(color_palette)] for i in range(len(pop_names))],
+                startangle=120,
+                autopct=lambda pct: f"{pct:.1f}%" if pct >= 5 else "",
+                textprops={'fontsize': 7, 'color': 'white', 'weight': 'bold'},
+                wedgeprops=dict(edgecolor="white", width=1.0)
+            )
+            ax1.set_aspect("equal", adjustable="datalim")
+        else:
+            ax1.text(0.5, 0.5, "No Data", ha="center", va="center", fontsize=9)
+        ax1.figure.subplots_adjust(left=0.02, right=0.98, top=0.94, bottom=0.06)
+        self._reports_chart1.canvas.draw_idle()
+
+        # Revenue per service bars
+        ax2 = self._reports_ax2
+        ax2.clear()
+        if rev_names:
+            bars = ax2.bar(
+                rev_names,
+                rev_values,
+                color="#02afd2",
+                edgecolor="#17707c",
+                width=0.55
+            )
+
+            ax2.set_title("Revenue per Service", fontsize=11, fontweight='bold', pad=8)
+            ax2.set_ylabel("Revenue (₱)", fontsize=7)
+            ax2.set_xlabel("Service", fontsize=7)
+            ax2.tick_params(axis="x", labelrotation=40, labelsize=6)
+            ax2.tick_params(axis="y", labelsize=6)
+
+            # Labels above bars
+            for bar in bars:
+                h = bar.get_height()
+                ax2.annotate(
+                    f"₱{h:,.0f}",
+                    xy=(bar.get_x() + bar.get_width() / 2, h),
+                    xytext=(0, 2),
+                    textcoords="offset points",
+                    ha="center", va="bottom",
+                    fontsize=6, color="#333"
+                )
+        else:
+            ax2.text(0.5, 0.5, "No Data", ha="center", va="center", fontsize=9)
+        ax2.figure.subplots_adjust(bottom=0.32, left=0.12, right=0.96, top=0.9)
+        self._reports_chart2.canvas.draw_idle()
+
+    # --------------------------------------------
+    # Record tables
+    # --------------------------------------------
+    EDIT_DIALOG_CACHE = 4
+
+    def _exec_edit_dialog(self, cls, row):
+        """
+        Run an edit dialog for `row`, reusing the one last closed unsaved for the same row.
+        The last EDIT_DIALOG_CACHE unsaved ones are kept; a saved one is built afresh next time.
+        Returns whether the dialog was accepted.
+        """
+        key = (cls, row.get("id"))
+        dlg = self._edit_dialogs.pop(key, None)
+        if dlg is None:
+            dlg = cls(row, self)
+        else:
+            dlg.reload_from(row)
+        accepted = dlg.exec() == QDialog.DialogCode.Accepted
+        if accepted:
+            dlg.deleteLater()
+        else:
+            self._edit_dialogs[key] = dlg
+            if len(self._edit_dialogs) > self.EDIT_DIALOG_CACHE:
+                self._edit_dialogs.popitem(last=False)[1].deleteLater()
+        return accepted
+
+    def _refresh_record(self, section, sql, rid):
+        """Re-fetch one edited row (`sql` selects it by id) and update it in `section`'s table;
+        reload the page only if the row isn't among the loaded ones."""
+        table = getattr(self, f"table_{section}_ref", None)
+        if table is not None:
+            with DB() as db:
+                rows = db.query(sql, (rid,), fetch=True)
+            if rows and table.model().sourceModel().replace_id(rid, rows[0]):
+                return
+        self.switch_section(section)
+
+    def _remove_record(self, section, rid):
+        """Take a deleted row out of `section`'s table in place; reload the page only if the
+        row isn't among the loaded ones."""
+        table = getattr(self, f"table_{section}_ref", None)
+        if table is None or not table.model().sourceModel().remove_id(rid):
+            self.switch_section(section)
+
+    def _records_view(self, model, on_edit=None, on_delete=None):
+        """
+        QTableView over `model` behind a case-insensitive filter proxy, which the filter_*
+        handlers drive. The ID column is hidden; with on_edit/on_delete the last column gets
+        the edit (row dict) / delete (row id) actions.
+        """
+        view = QTableView()
+        proxy = RecordsFilterProxy(view)
+        model.setParent(proxy)
+        proxy.setSourceModel(model)
+        view.setModel(proxy)
+        header = view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        view.setColumnHidden(0, True)
+        view.setItemDelegate(FixedCellDelegate(view))
+        if on_edit is not None:
+            last = model.columnCount() - 1
+            header.setSectionResizeMode(last, QHeaderView.ResizeMode.Fixed)
+            view.setColumnWidth(last, 60)
+            delegate = RowActionsDelegate(view)
+            delegate.edit.connect(lambda r: on_edit(model.row(r)))
+            delegate.delete.connect(lambda r: on_delete(model.row(r).get("id")))
+            view.setItemDelegateForColumn(last, delegate)
+        return view
+
+    # --------------------------------------------
+    # Patients section
+    # --------------------------------------------
+    def render_patients(self):
+        title = QLabel("Patients")
+        title.setFont(cached_font("Arial", 20, QFont.Weight.Bold))
+        self.content_layout.addWidget(title)
+
+        # Search bar with add button, aligned to the right
+        search_layout = QHBoxLayout()
+        search_layout.addStretch(1)
+        self.patient_search = QLineEdit()
+        self.patient_search.setPlaceholderText("Search patients...")
+        self.patient_search.setProperty("class", "search")
+        debounce(self.patient_search, self.filter_patients)
+        search_layout.addWidget(QLabel("🔍"))
+        search_layout.addWidget(self.patient_search)
+        add_btn = QPushButton("Add Patient")
+        add_btn.setProperty("class", "primary")
+        search_layout.addWidget(add_btn)
+        self.content_layout.addLayout(search_layout)
+
+        cols = "id, name, age, sex, email"  # no password hash; EditPatientDialog only needs these
+
+        def fetch_page(offset, limit):
+            # keyset paging: continue below the last loaded id instead of counting an OFFSET
+            with DB() as db:
+                if offset:
+                    return db.query(f"SELECT {cols} FROM patients WHERE id < %s ORDER BY id DESC LIMIT %s",
+                                    (model.row(offset - 1)["id"], limit), fetch=True)
+                return db.query(f"SELECT {cols} FROM patients ORDER BY id DESC LIMIT %s", (limit,), fetch=True)
+
+        model = RecordsModel([
+            ("ID", "id", safe_str),
+            ("Name", "name", safe_str),
+            ("Age", "age", safe_str),
+            ("Sex", "sex", safe_str),
+            ("Email", "email", safe_str),
+            ("Actions", None, None),
+        ], loader=fetch_page)
+        table = self._records_view(model, self.open_edit_patient, self.delete_patient)
+        self.content_layout.addWidget(table)
+        self.table_patients_ref = table
+
+        def load():
+            model.set_rows(fetch_page(0, model.PAGE + 1))
+
+        load()
+        self._refreshers["patients"] = load
+
+        def on_add():
+            dlg = QDialog(self)
+            dlg.setWindowTitle("Add Patient")
+            dlg.setFixedSize(420, 320)
+            form = QFormLayout(dlg)
+            n, a, s, e, p = QLineEdit(), QLineEdit(), QComboBox(), QLineEdit(), QLineEdit()
+            s.addItems(["Male", "Female", "Other"])
+            p.setEchoMode(QLineEdit.EchoMode.Password)
+            form.addRow("Name:", n)
+            form.addRow("Age:", a)
+            form.addRow("Sex:", s)
+            form.addRow("Email:", e)
+            form.addRow("Password:", p)
+            btn = QPushButton("Save")
+            btn.setProperty("class", "primary")
+            form.addRow(btn)
+
+            def save():
+                try:
+                    with DB() as db:
+                        db.query(
+                            "INSERT INTO patients (name, age, sex, email, password) VALUES (%s,%s,%s,%s,%s)",
+                            (n.text(), a.text() or None, s.currentText(), e.text(), hash_password(p.text())),
+                            commit=True,
+                        )
+                    bump_data_version()
+                    dlg.accept()
+                    load()
+                except Exception as ex:
+                    QMessageBox.critical(self, "Error", f"Failed to add patient: {ex}")
+
+            btn.clicked.connect(save)
+            dlg.exec()
+
+        add_btn.clicked.connect(on_add)
+
+    def filter_patients(self):
+        """
+        Filter visible rows in the patients table based on search query.
+        Excludes the actions column from search matching.
+        """
+        query = self.patient_search.text()
+        table = getattr(self, "table_patients_ref", None)
+        if table is None:
+            return
+        table.model().set_query(query)
+
+    def open_edit_patient(self, patient_row):
+        """
+        Open the EditPatientDialog. After dialog closes, refresh patients section.
+        """
+        dlg = EditPatientDialog(patient_row, self)
+        dlg.exec()
+        self.switch_section("patients")
+
+    def delete_patient(self, pid):
+        """
+        Delete a patient after confirmation.
+        """
+        if pid is None:
+            return
+        ok = QMessageBox.question(self, "Confirm", "Delete this patient?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if ok == QMessageBox.StandardButton.Yes:
+            try:
+                with DB() as db:
+                    db.query("DELETE FROM patients WHERE id=%s", (pid,), commit=True)
+                bump_data_version()
+                self._remove_record("patients", pid)
+                QMessageBox.information(self, "Deleted", "Patient deleted.")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to delete patient: {e}")
+
+    # --------------------------------------------
+    # Appointments section
+    # --------------------------------------------
+    def render_appointments(self):
+        title = QLabel("Appointments")
+        title.setFont(cached_font("Arial", 20, QFont.Weight.Bold))
+        self.content_layout.addWidget(title)
+
+        # Search bar with add button, aligned to the right
+        search_layout = QHBoxLayout()
+        search_layout.addStretch(1)
+        self.appointment_search = QLineEdit()
+        self.appointment_search.setPlaceholderText("Search appointments...")
+        self.appointment_search.setProperty("class", "search")
+        debounce(self.appointment_search, self.filter_appointments)
+        search_layout.addWidget(QLabel("🔍"))
+        search_layout.addWidget(self.appointment_search)
+        add_btn = QPushButton("Add Appointment")
+        add_btn.setProperty("class", "primary")
+        search_layout.addWidget(add_btn)
+        self.content_layout.addLayout(search_layout)
+
+        def fetch_page(offset, limit):
+            with DB() as db:
+                return db.query(
+                    APPOINTMENT_ROWS_SQL +
+                    "ORDER BY a.date DESC, a.time DESC, a.id DESC LIMIT %s OFFSET %s",
+                    (limit, offset), fetch=True,
+                )
+
+        model = AppointmentRecordsModel([
+            ("ID", "id", safe_str),
+            ("Patient", "patient", safe_str),
+            ("Service", "service", safe_str),
+            ("Date", "date", safe_str),
+            ("Time", "time", format_time_12h),
+            ("Notes", "notes", safe_str),
+            ("Status", "status", safe_str),
+            ("Actions", None, None),
+        ], loader=fetch_page)
+        table = self._records_view(model, self.open_edit_appointment, self.delete_appointment)
+        self.content_layout.addWidget(table)
+        self.table_appointments_ref = table
+
+        def load():
+            model.set_rows(fetch_page(0, model.PAGE + 1))
+
+        load()
+        self._refreshers["appointments"] = load
+
+        def on_add():
+            dlg = QDialog(self)
+            dlg.setWindowTitle("Add Appointment")
+            dlg.setFixedSize(480, 360)
+            form = QFormLayout(dlg)
+            with DB() as db:
+                patients, services = db.query_many([
+                    ("SELECT id, name FROM patients", None),
+                    ("SELECT id, name FROM services", None),
+                ])
+            patient_cb = QComboBox()
+            service_cb = QComboBox()
+            for p in patients:
+                patient_cb.addItem(f"{p['name']} (#{p['id']})", p['id'])
+            for s in services:
+                service_cb.addItem(f"{s['name']} (#{s['id']})", s['id'])
+            date_edit = QDateEdit()
+            date_edit.setCalendarPopup(True)
+            time_edit = QLineEdit()
+            notes = QTextEdit()
+            form.addRow("Patient:", patient_cb)
+            form.addRow("Service:", service_cb)
+            form.addRow("Date:", date_edit)
+            form.addRow("Time (HH:MM):", time_edit)
+            form.addRow("Notes:", notes)
+            btn = QPushButton("Save")
+            btn.setProperty("class", "primary")
+            form.addRow(btn)
+
+            def save():
+                pid = patient_cb.currentData()
+                sid = service_cb.currentData()
+                dt = date_edit.date().toString("yyyy-MM-dd")
+                tm = time_edit.text().strip()
+                try:
+                    with DB() as db:
+                        db.query(
+                            "INSERT INTO appointments (patient_id, service_id, date, time, notes) VALUES (%s,%s,%s,%s,%s)",
+                            (pid, sid, dt, tm, notes.toPlainText()), commit=True
+                        )
+                    bump_data_version()
+                    dlg.accept()
+                    load()
+                except Exception as ex:
+                    QMessageBox.critical(self, "Error", f"Failed to add appointment: {ex}")
+
+            btn.clicked.connect(save)
+            dlg.exec()
+
+        add_btn.clicked.connect(on_add)
+
+    def filter_appointments(self):
+        """
+        Filter rows in the appointments table based on search query.
+        Excludes actions column from matching.
+        """
+        query = self.appointment_search.text()
+        table = getattr(self, "table_appointments_ref", None)
+        if table is None:
+            return
+        table.model().set_query(query)
+
+    def open_edit_appointment(self, appt_row):
+        """
+        Open the EditAppointmentDialog and, once it saves, refresh that appointment's row.
+        """
+        if self._exec_edit_dialog(EditAppointmentDialog, appt_row):
+            self._refresh_record("appointments", APPOINTMENT_ROWS_SQL + "WHERE a.id=%s", appt_row["id"])
+
+    def delete_appointment(self, aid):
+        """
+        Delete appointment after confirmation.
+        """
+        if aid is None:
+            return
+        ok = QMessageBox.question(self, "Confirm", "Delete this appointment?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if ok == QMessageBox.StandardButton.Yes:
+            try:
+                with DB() as db:
+                    db.query("DELETE FROM appointments WHERE id=%s", (aid,), commit=True)
+                bump_data_version()
+                self._remove_record("appointments", aid)
+                QMessageBox.information(self, "Deleted", "Appointment deleted.")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to delete appointment: {e}")
+
+    # --------------------------------------------
+    # Services section
+    # --------------------------------------------
+    SERVER_SEARCH_MIN = 2
+
+    def render_services(self):
+        title = QLabel("Services")
+        title.setFont(cached_font("Arial", 20, QFont.Weight.Bold))
+        self.content_layout.addWidget(title)
+
+        # Search bar with add button, aligned to the right
+        search_layout = QHBoxLayout()
+        search_layout.addStretch(1)
+        self.service_search = QLineEdit()
+        self.service_search.setPlaceholderText("Search services...")
+        self.service_search.setProperty("class", "search")
+        debounce(self.service_search, self.filter_services)
+        search_layout.addWidget(QLabel("🔍"))
+        search_layout.addWidget(self.service_search)
+        add_btn = QPushButton("Add Service")
+        add_btn.setProperty("class", "primary")
+        search_layout.addWidget(add_btn)
+        self.content_layout.addLayout(search_layout)
+
+        # Searches longer than SERVER_SEARCH_MIN characters are filtered by the server (see
+        # service_search_where) and paged like the other record tables; shorter ones only
+        # narrow the rows already loaded
+        server_query = ""
+
+        def fetch_page(offset, limit):
+            where, params = service_search_where(server_query) if server_query else ("", ())
+            with DB() as db:
+                return db.query(
+                    SERVICE_ROWS_SQL + where +
+                    " ORDER BY id DESC LIMIT %s OFFSET %s",
+                    (*params, limit, offset), fetch=True,
+                )
+
+        model = RecordsModel([
+            ("ID", "id", safe_str),
+            ("Code", "code", safe_str),
+            ("Name", "name", safe_str),
+            ("Description", "description", safe_str),
+            ("Price", "price", lambda v: format_currency(v or 0)),
+            ("Actions", None, None),
+        ], loader=fetch_page)
+        table = self._records_view(model, self.open_edit_service, self.delete_service)
+        self.content_layout.addWidget(table)
+        self.table_services_ref = table
+
+        latest = None
+
+        def load(query=None):
+            # reload the first page; with `query`, first switch the server-side search to it
+            # (nothing to do when that leaves the search unchanged)
+            nonlocal latest, server_query
+            if query is not None:
+                query = query.strip()
+                query = query if len(query) > self.SERVER_SEARCH_MIN else ""
+                if query == server_query:
+                    return
+                server_query = query
+            # queried on the pool; only the newest reload's rows are shown
+            latest = token = object()
+
+            def done(rows):
+                if token is latest:
+                    model.set_rows(rows)
+
+            run_task(lambda: fetch_page(0, model.PAGE + 1), done,
+                     lambda err: print(f"Error loading services: {err}"))
+
+        load()
+        self._refreshers["services"] = load
+        self._load_services = load
+
+        def on_add():
+            dlg = EditServiceDialog(parent=self)
+            dlg.exec()
+            load()
+
+        add_btn.clicked.connect(on_add)
+
+    def filter_services(self):
+        """
+        Filter rows in the services table based on search query.
+        Excludes actions column from matching.
+        """
+        query = self.service_search.text()
+        table = getattr(self, "table_services_ref", None)
+        if table is None:
+            return
+        self._load_services(query)
+        table.model().set_query(query)
+
+    def open_edit_service(self, svc):
+        if self._exec_edit_dialog(EditServiceDialog, svc):
+            self._refresh_record("services", SERVICE_ROWS_SQL + "WHERE id=%s", svc["id"])
+
+    def delete_service(self, sid):
+        if sid is None:
+            return
+        ok = QMessageBox.question(self, "Confirm", "Delete this service?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if ok == QMessageBox.StandardButton.Yes:
+            try:
+                with DB() as db:
+                    db.query("DELETE FROM services WHERE id=%s", (sid,), commit=True)
+                bump_data_version()
+                self._remove_record("services", sid)
+                QMessageBox.information(self, "Deleted", "Service deleted.")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to delete service: {e}")
+
+    # --------------------------------------------
+    # Transactions section
+    # --------------------------------------------
+    def render_transactions(self):
+        top = QHBoxLayout()
+        title = QLabel("Transactions")
+        title.setFont(cached_font("Arial", 20, QFont.Weight.Bold))
+        top.addWidget(title)
+        top.addStretch(1)
+        self.content_layout.addLayout(top)
+
+        # Sub-top layout for total revenue and print button below title
+        sub_top = QHBoxLayout()
+        sub_top.addStretch(1)
+        total_lbl = QLabel()
+        total_lbl.setFont(cached_font("Arial", 14, QFont.Weight.Bold))
+        sub_top.addWidget(total_lbl)
+        print_btn = QPushButton("Print")
+        print_btn.setProperty("class", "primary")
+        print_btn.clicked.connect(lambda: self.print_content("transactions"))
+        sub_top.addWidget(print_btn)
+        self.content_layout.addLayout(sub_top)
+
+        model = RecordsModel([
+            ("ID", "id", safe_str),
+            ("Date", "paid_at", safe_str),
+            ("Patient", "patient", safe_str),
+            ("Service", "service", safe_str),
+            ("Amount", "amount", lambda v: format_currency(v or 0)),
+        ])
+        table = self._records_view(model)
+        self.content_layout.addWidget(table)
+        self.table_transactions_ref = table
+
+        latest = None
+
+        def load():
+            # the join runs on the pool; only the newest reload's rows are shown
+            nonlocal latest
+            latest = token = object()
+            if not model.rowCount():
+                total_lbl.setText("💰 Total Revenue: …")
+
+            def done(result):
+                if token is not latest:
+                    return
+                rows, total_rows = result
+                total_lbl.setText(f"💰 Total Revenue: {format_currency(total_rows[0]['total'])}")
+                model.set_rows(rows)
+
+            def job(db):
+                # the total is summed by the server, in the same round trip as the rows
+                rows, total_rows = db.query_many([
+                    ("""
+                        SELECT t.id, t.paid_at, p.name AS patient, s.name AS service, t.amount
+                        FROM transactions t
+                        JOIN patients p ON t.patient_id=p.id
+                        JOIN services s ON t.service_id=s.id
+                        ORDER BY t.paid_at DESC
+                    """, None),
+                    ("SELECT COALESCE(SUM(amount), 0) AS total FROM transactions", None),
+                ])
+                return intern_names(rows), total_rows
+
+            submit(job, done, lambda err: print(f"Error loading transactions: {err}"))
+
+        load()
+        self._refreshers["transactions"] = load
+
+    def filter_transactions(self):
+        """
+        Filter rows in the transactions table based on search query.
+        """
+        query = getattr(self, "transaction_search", None)
+        if query is None:
+            return
+        query_text = query.text()
+        table = getattr(self, "table_transactions_ref", None)
+        if table is None:
+            return
+        table.model().set_query(query_text)
+
+    # --------------------------------------------
+    # Profile section
+    # --------------------------------------------
+    def render_profile(self):
+        dlg = EditProfileDialog(self.staff_id, self.staff_name, self)
+        dlg.exec()
+
+    # --------------------------------------------
+    # Utilities
+    # --------------------------------------------
+    def logout(self):
+        if self.portal_parent:
+            self.portal_parent.show()
         self.close()
\ No newline at end of file
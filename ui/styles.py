@@ -0,0 +1,25 @@
+# ui/styles.py
+# Stylesheet pieces shared by the portal and the dashboards.
+
+import os
+from functools import lru_cache
+
+from PyQt6.QtGui import QFont
+
+IMG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "img").replace(os.sep, "/")
+
+# Soft card shadows are a pre-rendered 9-slice image drawn in the border area, instead of a
+# QGraphicsDropShadowEffect that re-renders and blurs the whole card offscreen on every repaint.
+# The image centre is transparent so the card background (clipped to the padding box) shows through.
+# Append to a sheet and give the frame a shadow="light"/"dark" property.
+SHADOW_QSS = f"""
+    QFrame[shadow] {{ border: 8px solid transparent; border-radius: 18px; background-clip: padding; }}
+    QFrame[shadow="light"] {{ border-image: url({IMG_DIR}/shadow_card.png) 8 8 8 8 stretch; }}
+    QFrame[shadow="dark"] {{ border-image: url({IMG_DIR}/shadow_card_dark.png) 8 8 8 8 stretch; }}
+"""
+
+
+# --- Font cache: setFont copies the QFont, so one interned instance per spec can be shared ---
+@lru_cache(maxsize=64)
+def cached_font(family, size, weight=QFont.Weight.Normal):
+    return QFont(family, size, weight)
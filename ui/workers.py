@@ -0,0 +1,70 @@
+# ui/workers.py
+# Background work for the dashboards: queries (and other slow jobs) run on QThreadPool
+# threads and their results come back to the GUI thread as Qt signals.
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from db import DB
+
+
+class WorkerSignals(QObject):
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+
+class DBWorker(QRunnable):
+    """Run `job(db)` against a pooled connection off the GUI thread and emit its return value."""
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            with DB() as db:
+                res = self.job(db)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.result.emit(res)
+
+
+class TaskWorker(QRunnable):
+    """Like DBWorker for work that needs no connection (file output, rendering): emits `job()`."""
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            res = self.job()
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.result.emit(res)
+
+
+def run_task(job, on_result, on_error=None):
+    """Queue `job()` on the global pool; `on_result`/`on_error` are called on the GUI thread."""
+    worker = TaskWorker(job)
+    worker.signals.result.connect(on_result)
+    if on_error is not None:
+        worker.signals.error.connect(on_error)
+    QThreadPool.globalInstance().start(worker)
+    return worker
+
+
+def submit(job, on_result, on_error=None):
+    """Queue `job(db)` on the global pool; `on_result`/`on_error` are called on the GUI thread."""
+    worker = DBWorker(job)
+    worker.signals.result.connect(on_result)
+    if on_error is not None:
+        worker.signals.error.connect(on_error)
+    QThreadPool.globalInstance().start(worker)
+    return worker
+
+
+def fetch(sql, params, on_result, on_error=None):
+    """Shorthand for a single SELECT whose dict rows are handed to `on_result`."""
+    return submit(lambda db: db.query(sql, params, fetch=True), on_result, on_error)